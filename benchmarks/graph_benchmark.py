@@ -0,0 +1,73 @@
+"""
+Benchmark of Graph scheduling overhead on a large synthetic DAG with a stub runner.
+
+Usage:
+    python benchmarks/graph_benchmark.py --nodes 10000 --width 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from upsonic.client.graph import Graph, TaskNode
+from upsonic.client.tasks.tasks import Task
+
+
+class StubRunner:
+    """Answers every task at once, so only the graph's own bookkeeping is measured."""
+
+    def do(self, task):
+        return task.description
+
+    async def do_async(self, task):
+        return task.description
+
+
+def build_graph(nodes: int, width: int, parallel: bool) -> Graph:
+    """Layers of `width` nodes, each fed by the node above it and the one above and to the left."""
+    graph = Graph(default_agent=StubRunner(), parallel_execution=parallel, max_parallel_tasks=width, show_progress=False)
+    layers = [
+        [TaskNode(task=Task(f"task {index}")) for index in range(first, min(first + width, nodes))]
+        for first in range(0, nodes, width)
+    ]
+    for first in layers[0]:
+        graph.add(first)
+    for above, layer in zip(layers, layers[1:]):
+        for position, current in enumerate(layer):
+            sources = [above[position - 1]]
+            if position < len(above) and above[position] is not sources[0]:
+                sources.append(above[position])
+            for source in sources:
+                graph.add(source >> current)
+    return graph
+
+
+def bench(label: str, nodes: int, width: int, parallel: bool):
+    start = time.perf_counter()
+    graph = build_graph(nodes, width, parallel)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    state = graph.run(verbose=False, show_progress=False)
+    run_time = time.perf_counter() - start
+
+    assert len(state.task_outputs) == nodes
+    print(f"{label:<12} build {build_time:>7.2f}s   run {run_time:>7.2f}s   {nodes / run_time:>10.0f} nodes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--width", type=int, default=16, help="Nodes per layer, and the parallel task limit")
+    args = parser.parse_args()
+
+    print(f"{args.nodes} nodes in layers of {args.width}")
+    bench("sequential", args.nodes, args.width, parallel=False)
+    bench("parallel", args.nodes, args.width, parallel=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark of ConfigManager get/set throughput under concurrent threads.
+
+Usage:
+    python benchmarks/storage_benchmark.py --threads 8 --operations 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from upsonic.storage.configuration import ConfigManager
+
+
+def run_threads(threads: int, target) -> float:
+    workers = [threading.Thread(target=target, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def bench(label: str, db_path: str, threads: int, operations: int, commit_interval: float = 0.0, bulk: bool = False):
+    config = ConfigManager(db_name=db_path, commit_interval=commit_interval)
+
+    def writer(index):
+        if bulk:
+            config.set_many({f"key-{index}-{i}": f"value-{i}" for i in range(operations)})
+        else:
+            for i in range(operations):
+                config.set(f"key-{index}-{i}", f"value-{i}")
+
+    def reader(index):
+        for i in range(operations):
+            config.get(f"key-{index}-{i}")
+
+    write_time = run_threads(threads, writer)
+    config.flush()
+    read_time = run_threads(threads, reader)
+    config.close_all_connections()
+
+    total = threads * operations
+    print(f"{label:<28} set {total / write_time:>10.0f} ops/s   get {total / read_time:>10.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=2000, help="Operations per thread")
+    parser.add_argument("--commit-interval", type=float, default=0.05, help="Group commit window in seconds")
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.operations} operations")
+    scenarios = [
+        ("commit per write", {}),
+        (f"group commit {args.commit_interval}s", {"commit_interval": args.commit_interval}),
+        ("set_many", {"bulk": True}),
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        for index, (label, options) in enumerate(scenarios):
+            bench(label, os.path.join(folder, f"bench_{index}.sqlite"), args.threads, args.operations, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -75,36 +75,24 @@ def get_or_create_client(debug: bool = False):
     return the_client
 
 
+def get_agent_client(agent_config, debug: bool = False):
+    """Return the agent's own client, or the shared one when it has none."""
+    if hasattr(agent_config, 'client') and agent_config.client is not None:
+        return agent_config.client
+    return get_or_create_client(debug=debug)
+
+
 def execute_task(agent_config, task: Task, debug: bool = False):
     """Execute a task with the given agent configuration."""
-    import asyncio
-    
-    try:
-        # Check if there's a running event loop
-        loop = asyncio.get_running_loop()
-        if loop.is_running():
-            # If there's a running loop, run the coroutine in that loop
-            return asyncio.run_coroutine_threadsafe(
-                execute_task_async(agent_config, task, debug), 
-                loop
-            ).result()
-    except RuntimeError:
-        # No running event loop
-        pass
-    
-    # If no running loop or exception occurred, create a new one
-    return asyncio.run(execute_task_async(agent_config, task, debug))
+    the_client = get_agent_client(agent_config, debug)
+    return the_client.run_sync(execute_task_async(agent_config, task, debug))
 
 async def execute_task_async(agent_config, task: Task, debug: bool = False):
     """Execute a task with the given agent configuration asynchronously using true async methods."""
     global latest_upsonic_client
     
-    # If agent has a custom client, use it
-    if hasattr(agent_config, 'client') and agent_config.client is not None:
-        the_client = agent_config.client
-    else:
-        # Get or create client using existing process
-        the_client = get_or_create_client(debug=debug)
+    # Use the agent's custom client, or get or create one using the existing process
+    the_client = get_agent_client(agent_config, debug)
     
     # If task has no tools defined but agent has tools, use the agent's tools
     if not task.tools and hasattr(agent_config, 'tools') and agent_config.tools:
@@ -144,6 +132,8 @@ class AgentConfiguration(BaseModel):
     cache_expiry: int = 60 * 60
     knowledge_base: Optional[KnowledgeBase] = None
     context_compress: bool = False
+    parallel_tool_calls: bool = False
+    memory_budget: Optional[int] = None
 
     def __init__(
         self, 
@@ -167,6 +157,8 @@ class AgentConfiguration(BaseModel):
         context_compress: bool = False,
         agent_id_: Optional[str] = None,
         retry: int = 3,
+        parallel_tool_calls: bool = False,
+        memory_budget: Optional[int] = None,
         **data
     ):
         if job_title is not None:
@@ -195,7 +187,9 @@ class AgentConfiguration(BaseModel):
             "caching": caching,
             "cache_expiry": cache_expiry,
             "knowledge_base": knowledge_base,
-            "context_compress": context_compress
+            "context_compress": context_compress,
+            "parallel_tool_calls": parallel_tool_calls,
+            "memory_budget": memory_budget
         })
 
         super().__init__(**data)
@@ -232,47 +226,14 @@ class AgentConfiguration(BaseModel):
         return self.agent_id_
     
     def do(self, task: Task):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.do_async(task), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.do_async(task))
+        return get_agent_client(self, self.debug).run_sync(self.do_async(task))
     
     async def do_async(self, task: Task):
         """Asynchronous version of the do method."""
         return await execute_task_async(self, task, self.debug)
     
     def print_do(self, task: Task):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                result = asyncio.run_coroutine_threadsafe(
-                    self.print_do_async(task), 
-                    loop
-                ).result()
-                return result
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.print_do_async(task))
+        return get_agent_client(self, self.debug).run_sync(self.print_do_async(task))
         
     async def print_do_async(self, task: Task):
         """Asynchronous version of the print_do method."""
@@ -280,6 +241,23 @@ class AgentConfiguration(BaseModel):
         print(result)
         return result
     
+    async def stream_async(self, task: Task):
+        """Execute a task, yielding the events of the run as they arrive.
+        
+        Args:
+            task: The Task object to execute
+            
+        Yields:
+            Event dicts with a "type" of "text_delta", "tool_call", "tool_result"
+            and, last, "result" once the task's response is set
+        """
+        the_client = get_agent_client(self, self.debug)
+        if not task.tools and self.tools:
+            task.tools = self.tools
+        the_client = register_tools(the_client, task.tools)
+        async for event in the_client.agent_stream_async(self, task):
+            yield event
+    
     def parallel_do(self, tasks: List[Task]):
         """Execute multiple tasks in parallel and return their results.
         
@@ -289,23 +267,7 @@ class AgentConfiguration(BaseModel):
         Returns:
             A list of task responses in the same order as the input tasks
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.parallel_do_async(tasks), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.parallel_do_async(tasks))
+        return get_agent_client(self, self.debug).run_sync(self.parallel_do_async(tasks))
     
     async def parallel_do_async(self, tasks: List[Task]):
         """Asynchronous version of the parallel_do method.
@@ -322,6 +284,59 @@ class AgentConfiguration(BaseModel):
         # Execute all tasks in parallel and return their results
         return await asyncio.gather(*coroutines)
     
+    def _batch_client(self, tasks: List[Task]):
+        """Return the client for a batch with the agent's tools, or else every task's tools, registered."""
+        tools = self.tools
+        if not tools:
+            tools = []
+            for task in tasks:
+                for tool in task.tools or []:
+                    if not any(tool is each for each in tools):
+                        tools.append(tool)
+        return register_tools(get_agent_client(self, self.debug), tools)
+
+    def batch_do(self, tasks: List[Task], max_concurrency: int = 8):
+        """Execute many tasks in one batch request and return their results.
+        
+        Args:
+            tasks: A list of Task objects to execute
+            max_concurrency: Maximum number of tasks the server runs at once
+            
+        Returns:
+            A list of task responses in the same order as the input tasks
+        """
+        return get_agent_client(self, self.debug).run_sync(self.batch_do_async(tasks, max_concurrency))
+
+    async def batch_do_async(self, tasks: List[Task], max_concurrency: int = 8):
+        """Asynchronous version of the batch_do method.
+        
+        Unlike parallel_do_async, the tasks share one request, one characterization
+        and one model and tool set on the server.
+        
+        Args:
+            tasks: A list of Task objects to execute
+            max_concurrency: Maximum number of tasks the server runs at once
+            
+        Returns:
+            A list of task responses in the same order as the input tasks
+        """
+        the_client = self._batch_client(tasks)
+        return await the_client.agent_batch_list_async(self, tasks, max_concurrency=max_concurrency)
+
+    async def batch_iter_async(self, tasks: List[Task], max_concurrency: int = 8):
+        """Execute many tasks in one batch request, yielding each task as it completes.
+        
+        Args:
+            tasks: A list of Task objects to execute
+            max_concurrency: Maximum number of tasks the server runs at once
+            
+        Yields:
+            Each task, with its response set, in completion order
+        """
+        the_client = self._batch_client(tasks)
+        async for task in the_client.agent_batch_async(self, tasks, max_concurrency=max_concurrency):
+            yield task
+
     def parallel_print_do(self, tasks: List[Task]):
         """Execute multiple tasks in parallel, print their results, and return them.
         
@@ -331,23 +346,7 @@ class AgentConfiguration(BaseModel):
         Returns:
             A list of task responses in the same order as the input tasks
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.parallel_print_do_async(tasks), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.parallel_print_do_async(tasks))
+        return get_agent_client(self, self.debug).run_sync(self.parallel_print_do_async(tasks))
     
     async def parallel_print_do_async(self, tasks: List[Task]):
         """Asynchronous version of the parallel_print_do method.
@@ -1,10 +1,12 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Any
+from typing import AsyncIterator, Dict, Any, Any
 import httpx
 import time
 import asyncio
-import concurrent.futures
+import atexit
+import json
 import threading
+import weakref
 
 
 from .level_one.call import Call
@@ -16,51 +18,76 @@ from .tools.tools import Tools
 from .markdown.markdown import Markdown
 from .others.others import Others
 from ..exception import ServerStatusException, TimeoutException
+from ..framing import dumps_frames, loads_frames, FRAMES_CONTENT_TYPE, TRANSPORT_JSON, TRANSPORT_FRAMES
 
 from .printing import connected_to_server
+from .loop_runner import LoopRunner, run_coroutine_in_new_thread
 
 
 from .latest_upsonic_client import latest_upsonic_client
 
 
-# Helper function to run a coroutine in a new thread with a new event loop
-def run_coroutine_in_new_thread(coro):
-    """
-    Run a coroutine in a new thread with a new event loop.
-    This is useful when we're in an async context but need a synchronous result.
-    
-    Args:
-        coro: The coroutine to run
-        
-    Returns:
-        The result of the coroutine
-    """
-    def run_coro_in_thread(coro):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-        return executor.submit(run_coro_in_thread, coro).result()
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _close_client_at_exit(client_ref):
+    client = client_ref()
+    if client is not None:
+        client.close()
 
 
 # Create a base class with url
 class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
 
-    def __init__(self, url: str, debug: bool = False, **kwargs):
+    def __init__(
+        self,
+        url: str,
+        debug: bool = False,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 600.0,
+        transport: str = "auto",
+        **kwargs
+    ):
         """Initialize the Upsonic client.
         
         Args:
             url: The server URL to connect to
             debug: Whether to enable debug mode
+            max_connections: Maximum number of concurrent connections to the server
+            max_keepalive_connections: Maximum number of idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept before it is closed
+            http2: Whether to use HTTP/2 when the h2 package is installed
+            timeout: Request timeout in seconds
+            transport: "json", "frames", or "auto" to use binary frames when the server supports them
             **kwargs: Configuration options that match ClientConfig fields
         """
         start_time = time.time()
         self.debug = debug
 
+        # Connection pool settings shared by every request this client sends
+        self._http_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._http_timeout = timeout
+        # httpx.AsyncClient is bound to the loop it was created on, so keep one per loop
+        self._async_http_clients = weakref.WeakKeyDictionary()
+        self._http_clients_lock = threading.Lock()
+        self._loop_runner = LoopRunner(name="upsonic-client-loop")
+        self._closed = False
+        self.transport = transport
+        self._server_transports = [TRANSPORT_JSON]
+        atexit.register(_close_client_at_exit, weakref.ref(self))
+
         # Set server type and URL first
         if "0.0.0.0" in url:
             self.server_type = "Local(Docker)"
@@ -82,7 +109,6 @@ class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
             else:
                 run_dev_server(redirect_output=True)
 
-            import atexit
             def exit_handler():
                 if is_tools_server_running() or is_main_server_running():
                     stop_dev_server()
@@ -92,22 +118,10 @@ class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
         self.url = url
         self.default_llm_model = "openai/gpt-4o"
 
-        # Check if we're in an async context
-        try:
-            loop = asyncio.get_running_loop()
-            in_async_context = True
-        except RuntimeError:
-            in_async_context = False
-
         # Check server status before proceeding
-        if in_async_context:
-            # We're in an async context, but __init__ can't be async
-            # We need to run the async method in a new thread
-            status_ok = run_coroutine_in_new_thread(self.status_async())
-        else:
-            # We're not in an async context, use asyncio.run
-            status_ok = asyncio.run(self.status_async())
-            
+        status_ok = self.status()
+
+
         if not status_ok:
             total_time = time.time() - start_time
             connected_to_server(self.server_type, "Failed", total_time)
@@ -124,45 +138,113 @@ class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
         
         # Bulk set the configurations if there are any
         if config_dict:
-            if in_async_context:
-                # We're in an async context, but __init__ can't be async
-                # We need to run the async method in a new thread
-                run_coroutine_in_new_thread(self.bulk_set_config_async(config_dict))
-            else:
-                # We're not in an async context, use asyncio.run
-                asyncio.run(self.bulk_set_config_async(config_dict))
+            self.run_sync(self.bulk_set_config_async(config_dict))
 
         global latest_upsonic_client
         latest_upsonic_client = self
         total_time = time.time() - start_time
         connected_to_server(self.server_type, "Established", total_time)
 
+    def run_sync(self, coro, timeout: float = None) -> Any:
+        """
+        Run a coroutine on the client's background event loop and wait for it.
+
+        Every sync entry point goes through here, so loops, connection pools
+        and caches are created once and survive between calls.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Optional number of seconds to wait for the result
+
+        Returns:
+            The result of the coroutine
+        """
+        return self._loop_runner.run(coro, timeout)
+
+    def _get_async_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._async_http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self._http_limits,
+                    http2=self._http2,
+                    timeout=self._http_timeout,
+                )
+                self._async_http_clients[loop] = client
+            return client
+
+    async def aclose(self):
+        """Close the pooled HTTP client that belongs to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._async_http_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        """Close every pooled connection and stop the background event loop."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._loop_runner.is_running() and not self._loop_runner.in_runner_thread():
+            try:
+                self.run_sync(self.aclose(), timeout=5.0)
+            except Exception:
+                pass
+        self._loop_runner.stop()
+        with self._http_clients_lock:
+            self._async_http_clients.clear()
+
+    def __deepcopy__(self, memo):
+        # A client is a handle on shared connections and a running loop, so
+        # configurations that get deep copied keep pointing at the same one.
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
     def status(self) -> bool:
         """Check the server status."""
         try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    return run_coroutine_in_new_thread(self.status_async())
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.status_async())
+            return self.run_sync(self.status_async())
         except httpx.RequestError:
             return False
 
     async def status_async(self) -> bool:
         """Check the server status asynchronously."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.url + "/status")
-                return response.status_code == 200
+            client = self._get_async_http_client()
+            response = await client.get(self.url + "/status")
+            if response.status_code != 200:
+                return False
+            try:
+                # Older servers don't advertise transports and only speak JSON
+                self._server_transports = response.json().get("transports", [TRANSPORT_JSON])
+            except ValueError:
+                self._server_transports = [TRANSPORT_JSON]
+            return True
         except httpx.RequestError:
             return False
 
-    def send_request(self, endpoint: str, data: Dict[str, Any], files: Dict[str, Any] = None, method: str = "POST", return_raw: bool = False) -> Any:
+    @property
+    def binary_transport(self) -> bool:
+        """Whether pickled payloads are sent as binary frames instead of base64 in JSON."""
+        if self.transport == TRANSPORT_JSON:
+            return False
+        return TRANSPORT_FRAMES in self._server_transports
+
+    def send_request(self, endpoint: str, data: Dict[str, Any], files: Dict[str, Any] = None, method: str = "POST", return_raw: bool = False, framed: bool = False) -> Any:
         """
         General method to send an API request.
 
@@ -172,27 +254,14 @@ class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
             files: Optional files to upload.
             method: HTTP method to use (GET or POST)
             return_raw: Whether to return the raw response content instead of JSON
+            framed: Whether to send the data as a binary frame to the endpoint's /frames variant
 
         Returns:
             The response from the API, either as JSON or raw content.
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    return run_coroutine_in_new_thread(
-                        self.send_request_async(endpoint, data, files, method, return_raw)
-                    )
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.send_request_async(endpoint, data, files, method, return_raw))
-        except httpx.RequestError as e:
-            raise e
-
-    async def send_request_async(self, endpoint: str, data: Dict[str, Any], files: Dict[str, Any] = None, method: str = "POST", return_raw: bool = False) -> Any:
+        return self.run_sync(self.send_request_async(endpoint, data, files, method, return_raw, framed))
+
+    async def send_request_async(self, endpoint: str, data: Dict[str, Any], files: Dict[str, Any] = None, method: str = "POST", return_raw: bool = False, framed: bool = False) -> Any:
         """
         Asynchronous version of send_request.
         General method to send an API request asynchronously.
@@ -203,44 +272,88 @@ class UpsonicClient(Call, Storage, Tools, Agent, Markdown, Others):
             files: Optional files to upload.
             method: HTTP method to use (GET or POST)
             return_raw: Whether to return the raw response content instead of JSON
+            framed: Whether to send the data as a binary frame to the endpoint's /frames variant
 
         Returns:
             The response from the API, either as JSON or raw content.
         """
-        async with httpx.AsyncClient() as client:
-            if method.upper() == "GET":
-                response = await client.get(self.url + endpoint, params=data, timeout=600.0)
+        client = self._get_async_http_client()
+        if framed:
+            response = await client.post(
+                self.url + endpoint + "/frames",
+                content=dumps_frames(data),
+                headers={"Content-Type": FRAMES_CONTENT_TYPE},
+            )
+        elif method.upper() == "GET":
+            response = await client.get(self.url + endpoint, params=data)
+        else:
+            if files:
+                response = await client.post(self.url + endpoint, data=data, files=files)
             else:
-                if files:
-                    response = await client.post(self.url + endpoint, data=data, files=files, timeout=600.0)
-                else:
-                    response = await client.post(self.url + endpoint, json=data, timeout=600.0)
-                
+                response = await client.post(self.url + endpoint, json=data)
+
+        if response.status_code == 408:
+            raise TimeoutException("Request timed out")
+        response.raise_for_status()
+
+        if return_raw:
+            return response.content
+        if response.headers.get("content-type", "").startswith(FRAMES_CONTENT_TYPE):
+            return loads_frames(response.content)
+        return response.json()
+
+    async def stream_request_async(self, endpoint: str, data: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Send a POST request and yield each line of a newline delimited JSON response.
+
+        Args:
+            endpoint: The API endpoint to send the request to.
+            data: The data to send in the request.
+
+        Yields:
+            Each decoded JSON line as soon as it arrives.
+        """
+        client = self._get_async_http_client()
+        async with client.stream("POST", self.url + endpoint, json=data) as response:
             if response.status_code == 408:
                 raise TimeoutException("Request timed out")
             response.raise_for_status()
-            
-            return response.content if return_raw else response.json()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+    async def stream_events_async(self, endpoint: str, data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send a POST request and yield each event of a server-sent event response.
+
+        Args:
+            endpoint: The API endpoint to send the request to.
+            data: The data to send in the request.
+
+        Yields:
+            The decoded JSON data of each event as soon as it arrives.
+        """
+        client = self._get_async_http_client()
+        async with client.stream("POST", self.url + endpoint, json=data) as response:
+            if response.status_code == 408:
+                raise TimeoutException("Request timed out")
+            response.raise_for_status()
+            data_lines = []
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].strip())
+                elif not line.strip() and data_lines:
+                    # A blank line ends the event
+                    yield json.loads("\n".join(data_lines))
+                    data_lines = []
+            if data_lines:
+                yield json.loads("\n".join(data_lines))
 
     def run(self, *args, **kwargs):
         """
         Run method that delegates to the appropriate async implementation.
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    return run_coroutine_in_new_thread(
-                        self.run_async(*args, **kwargs)
-                    )
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.run_async(*args, **kwargs))
-        except Exception as e:
-            raise e
+        return self.run_sync(self.run_async(*args, **kwargs))
 
     async def run_async(self, *args, **kwargs):
         """
@@ -24,23 +24,8 @@ class DirectStatic:
         Returns:
             The response from the LLM
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    DirectStatic.do_async(task, model, client, debug, retry), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(DirectStatic.do_async(task, model, client, debug, retry))
+        the_client = client if client is not None else get_or_create_client(debug=debug)
+        return the_client.run_sync(DirectStatic.do_async(task, model, the_client, debug, retry))
 
     @staticmethod
     async def do_async(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
@@ -73,6 +58,28 @@ class DirectStatic:
         await the_client.call_async(task, model, retry=retry)
         return task.response
 
+    @staticmethod
+    async def stream_async(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
+        """
+        Execute a direct LLM call, yielding its events as they arrive.
+        
+        Args:
+            task: The task to execute
+            model: The LLM model to use (default: "openai/gpt-4")
+            client: Optional custom client to use instead of creating a new one
+            debug: Whether to enable debug mode
+            retry: Number of retries before the first event arrives (default: 3)
+            
+        Yields:
+            Event dicts with a "type" of "text_delta", "tool_call", "tool_result"
+            and, last, "result" once the task's response is set
+        """
+        the_client = client if client is not None else get_or_create_client(debug=debug)
+        the_client = register_tools(the_client, task.tools)
+
+        async for event in the_client.call_stream_async(task, model, retry=retry):
+            yield event
+
     @staticmethod
     def print_do(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
         """
@@ -88,23 +95,8 @@ class DirectStatic:
         Returns:
             The response from the LLM
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    DirectStatic.print_do_async(task, model, client, debug, retry), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(DirectStatic.print_do_async(task, model, client, debug, retry))
+        the_client = client if client is not None else get_or_create_client(debug=debug)
+        return the_client.run_sync(DirectStatic.print_do_async(task, model, the_client, debug, retry))
 
     @staticmethod
     async def print_do_async(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
@@ -158,23 +150,10 @@ class DirectInstance:
         Returns:
             The response from the LLM
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.do_async(task, model, client, debug, retry), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.do_async(task, model, client, debug, retry))
+        the_client = client if client is not None else self.client
+        if the_client is None:
+            the_client = get_or_create_client(debug=debug or self.debug)
+        return the_client.run_sync(self.do_async(task, model, the_client, debug, retry))
 
     async def do_async(self, task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int | None = None):
         """
@@ -199,6 +178,29 @@ class DirectInstance:
         # Call the static method with the resolved parameters
         return await DirectStatic.do_async(task, actual_model, actual_client, actual_debug, actual_retry)
         
+    async def stream_async(self, task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int | None = None):
+        """
+        Execute a direct LLM call using instance defaults or overrides, yielding its events as they arrive.
+        
+        Args:
+            task: The task to execute
+            model: The LLM model to use (overrides instance default if provided)
+            client: Optional custom client (overrides instance default if provided)
+            debug: Whether to enable debug mode (overrides instance default if provided)
+            retry: Number of retries before the first event arrives (overrides instance default if provided)
+            
+        Yields:
+            Event dicts with a "type" of "text_delta", "tool_call", "tool_result"
+            and, last, "result" once the task's response is set
+        """
+        actual_model = model if model is not None else self.model
+        actual_client = client if client is not None else self.client
+        actual_debug = debug if debug is not False else self.debug
+        actual_retry = retry if retry is not None else self.retry
+
+        async for event in DirectStatic.stream_async(task, actual_model, actual_client, actual_debug, actual_retry):
+            yield event
+
     def print_do(self, task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int | None = None):
         """
         Execute a direct LLM call and print the result.
@@ -213,23 +215,10 @@ class DirectInstance:
         Returns:
             The response from the LLM
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.print_do_async(task, model, client, debug, retry), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.print_do_async(task, model, client, debug, retry))
+        the_client = client if client is not None else self.client
+        if the_client is None:
+            the_client = get_or_create_client(debug=debug or self.debug)
+        return the_client.run_sync(self.print_do_async(task, model, the_client, debug, retry))
 
     async def print_do_async(self, task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int | None = None):
         """
@@ -287,6 +276,10 @@ class Direct:
     async def print_do_async(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
         return await DirectStatic.print_do_async(task, model, client, debug, retry)
     
+    @staticmethod
+    def stream_async(task: Task, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
+        return DirectStatic.stream_async(task, model, client, debug, retry)
+    
     def __new__(cls, *args, model: ModelNames | None = None, client: Any = None, debug: bool = False, retry: int = 3):
         """
         Factory method that returns a DirectInstance object when initialized.
@@ -1,24 +1,79 @@
 from typing import List, Dict, Any, Optional, Union, Callable, Set
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.markup import escape
 from rich.progress import Progress, TextColumn, BarColumn, SpinnerColumn, TimeElapsedColumn, TimeRemainingColumn
+import asyncio
+import hashlib
+import json
 import uuid
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 
 from .printing import console, spacing, escape_rich_markup
 from .tasks.tasks import Task
 from .tasks.task_response import ObjectResponse
 from .agent_configuration.agent_configuration import AgentConfiguration
+from .loop_runner import run_coroutine_in_new_thread
+from .graph_checkpoint import GraphCheckpoint, node_key
+from .level_utilized.utility import _definition_hash
+from ..storage.caching import get_from_cache_with_expiry, save_to_cache_with_expiry
+from ..model_registry import get_estimated_cost
+
+# Output tokens assumed for a speculative task when estimating the cost of discarding it
+SPECULATIVE_OUTPUT_TOKENS = 512
 
 # Define DecisionResponse at module level
 class DecisionResponse(ObjectResponse):
     """Response type for LLM-based decisions that returns a boolean result."""
     result: bool
 
+def _fingerprint(value: Any) -> str:
+    """
+    Describes a value for a cache key, the same way each time the same value is built.
+    
+    Args:
+        value: A task input or output, e.g. a string, a response object or a list of them
+        
+    Returns:
+        A string that only changes when the value does
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return json.dumps(value)
+    if isinstance(value, Task):
+        # A task given as context passes on its description and its answer
+        return f"Task:{json.dumps(value.description)}:{_fingerprint(value._response)}"
+    if isinstance(value, type) or hasattr(value, "__code__"):
+        return _definition_hash(value)
+    if isinstance(value, BaseModel):
+        try:
+            return f"{type(value).__qualname__}:{value.model_dump_json()}"
+        except Exception:
+            return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint(each) for each in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{_fingerprint(key)}:{_fingerprint(each)}" for key, each in sorted(value.items(), key=lambda item: str(item[0]))) + "}"
+    return repr(value)
+
+
+def _tool_fingerprint(tool: Any) -> str:
+    """
+    Describes a tool for a cache key: functions and classes by their definition, instances by their class and attributes.
+    
+    Args:
+        tool: A tool given to a task or an agent
+        
+    Returns:
+        A string that only changes when the tool does
+    """
+    if isinstance(tool, type) or hasattr(tool, "__code__"):
+        return _definition_hash(tool)
+    return f"{_definition_hash(type(tool))}:{_fingerprint(getattr(tool, '__dict__', None))}"
+
+
 # Import Direct for type checking
 try:
     from .direct_llm.direct import Direct
@@ -478,7 +533,37 @@ class State(BaseModel):
             return None
         
         # Return the most recently added output
-        return list(self.task_outputs.values())[-1]
+        return next(reversed(self.task_outputs.values()))
+
+
+class _ParallelRun:
+    """Bookkeeping of one parallel graph run, shared by the schedulers of its decision branches."""
+    
+    def __init__(self, max_parallel_tasks: int, verbose: bool, on_node_done: Optional[Callable[[], None]] = None):
+        self.semaphore = asyncio.Semaphore(max(1, max_parallel_tasks))
+        self.verbose = verbose
+        self.on_node_done = on_node_done
+        self.scheduled: Set[str] = set()
+        # Depth of each node from the start, and its position in the graph, for a deterministic order
+        self.levels: Dict[str, int] = {}
+        self.positions: Dict[str, int] = {}
+        # What each decision passes on: its input, then the last output of its branch
+        self.decision_outputs: Dict[str, Any] = {}
+        self.branch_ids: Set[str] = set()
+        # What the scheduler waits for, in both directions, and how many of them are still running
+        self.predecessors: Dict[str, List[str]] = {}
+        self.successors: Dict[str, List[str]] = {}
+        self.waiting: Dict[str, int] = {}
+        # Estimated cost and number of speculative tasks whose branch wasn't taken
+        self.wasted_cost = 0.0
+        self.wasted_tasks = 0
+    
+    def rank(self, node_id: str):
+        return (self.levels.get(node_id, 0), self.positions.get(node_id, len(self.positions)), node_id)
+    
+    def node_done(self):
+        if self.on_node_done is not None:
+            self.on_node_done()
 
 
 class Graph(BaseModel):
@@ -490,18 +575,44 @@ class Graph(BaseModel):
         parallel_execution: Whether to execute independent tasks in parallel
         max_parallel_tasks: Maximum number of tasks to execute in parallel
         show_progress: Whether to display a progress bar during execution
+        checkpoint_id: Name to checkpoint every completed node under, so run(resume=True) can pick up after a failure
+        caching: Whether to reuse task outputs of earlier runs whose task and inputs are unchanged
+        cache_expiry: Number of seconds cached task outputs are kept
+        speculative_decisions: Whether a parallel run starts the first task of both branches of an LLM decision while it is being made
+        speculation_budget: Estimated cost in dollars of discarded speculative tasks a run may spend, None for no limit
     """
     # Accept either AgentConfiguration or Direct as the default_agent
     default_agent: Optional[Any] = None
     parallel_execution: bool = False
     max_parallel_tasks: int = 4
     show_progress: bool = True
+    checkpoint_id: Optional[str] = None
+    caching: bool = False
+    cache_expiry: int = 60 * 60
+    speculative_decisions: bool = False
+    speculation_budget: Optional[float] = None
     
     # Private attributes (not part of the model schema)
     nodes: List[Union[TaskNode, DecisionFunc, DecisionLLM]] = Field(default_factory=list)
     edges: Dict[str, List[str]] = Field(default_factory=dict)
     state: State = Field(default_factory=State)
     
+    # Order a chain implies around decision nodes without an edge, see _link_in_order
+    _implicit_predecessors: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _tail: Any = PrivateAttr(default=None)
+    
+    # Compiled form of nodes and edges, see _compile
+    _nodes_by_id: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _successor_ids: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _predecessor_ids: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _decision_branches: Dict[str, Set[str]] = PrivateAttr(default_factory=dict)
+    _branch_owners: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _node_keys: Dict[str, str] = PrivateAttr(default_factory=dict)
+    
+    # Checkpoint of the current run and the records restored from it
+    _checkpoint: Any = PrivateAttr(default=None)
+    _restored: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+    
     class Config:
         arbitrary_types_allowed = True
     
@@ -530,22 +641,28 @@ class Graph(BaseModel):
         
         if isinstance(tasks_chain, TaskNode):
             self.nodes.append(tasks_chain)
+            self._index([tasks_chain])
+            self._tail = self._link_in_order([tasks_chain], self._tail)
         elif isinstance(tasks_chain, (DecisionFunc, DecisionLLM)):
+            added = [tasks_chain]
+            edge_sources = []
             self.nodes.append(tasks_chain)
             
             # Handle decision branches
             if tasks_chain.true_branch:
                 if isinstance(tasks_chain.true_branch, TaskNode):
-                    if tasks_chain.true_branch not in self.nodes:
+                    if tasks_chain.true_branch.id not in self._nodes_by_id:
                         self.nodes.append(tasks_chain.true_branch)
+                        added.append(tasks_chain.true_branch)
                     if tasks_chain.id not in self.edges:
                         self.edges[tasks_chain.id] = []
                     self.edges[tasks_chain.id].append(tasks_chain.true_branch.id)
                 elif isinstance(tasks_chain.true_branch, TaskChain):
                     # Add all nodes and edges from the true branch chain
                     for node in tasks_chain.true_branch.nodes:
-                        if node not in self.nodes:
+                        if node.id not in self._nodes_by_id:
                             self.nodes.append(node)
+                            added.append(node)
                     
                     # Add the connection from decision to first node of true branch
                     if tasks_chain.true_branch.nodes:
@@ -559,20 +676,23 @@ class Graph(BaseModel):
                         if src not in self.edges:
                             self.edges[src] = []
                         self.edges[src].extend(targets)
+                        edge_sources.append(src)
             
             # Handle false branch
             if tasks_chain.false_branch:
                 if isinstance(tasks_chain.false_branch, TaskNode):
-                    if tasks_chain.false_branch not in self.nodes:
+                    if tasks_chain.false_branch.id not in self._nodes_by_id:
                         self.nodes.append(tasks_chain.false_branch)
+                        added.append(tasks_chain.false_branch)
                     if tasks_chain.id not in self.edges:
                         self.edges[tasks_chain.id] = []
                     self.edges[tasks_chain.id].append(tasks_chain.false_branch.id)
                 elif isinstance(tasks_chain.false_branch, TaskChain):
                     # Add all nodes and edges from the false branch chain
                     for node in tasks_chain.false_branch.nodes:
-                        if node not in self.nodes:
+                        if node.id not in self._nodes_by_id:
                             self.nodes.append(node)
+                            added.append(node)
                     
                     # Add the connection from decision to first node of false branch
                     if tasks_chain.false_branch.nodes:
@@ -586,13 +706,251 @@ class Graph(BaseModel):
                         if src not in self.edges:
                             self.edges[src] = []
                         self.edges[src].extend(targets)
+                        edge_sources.append(src)
+            
+            self._index(added, edge_sources)
+            self._tail = self._link_in_order([tasks_chain], self._tail)
                     
         elif isinstance(tasks_chain, TaskChain):
-            self.nodes.extend(tasks_chain.nodes)
-            self.edges.update(tasks_chain.edges)
+            # Chains sharing nodes, like a fan out and its fan in, add each node and edge once
+            added = []
+            for chain_node in tasks_chain.nodes:
+                if chain_node.id not in self._nodes_by_id and chain_node not in added:
+                    added.append(chain_node)
+            self.nodes.extend(added)
+            for src, targets in tasks_chain.edges.items():
+                existing = self.edges.setdefault(src, [])
+                existing.extend(target for target in targets if target not in existing)
+            self._index(added, list(tasks_chain.edges))
+            self._tail = self._link_in_order(tasks_chain.nodes, self._tail)
             
         return self
     
+    def _compile(self):
+        """
+        Rebuilds the compiled form of the graph from its nodes and edges.
+        
+        The compiled form maps IDs to nodes and keeps the successors and
+        predecessors of every node, so finding them doesn't scan the whole
+        graph. add() keeps it up to date; run() rebuilds it once in case the
+        nodes, edges or decision branches were changed directly.
+        """
+        self._nodes_by_id = {}
+        self._successor_ids = {}
+        self._predecessor_ids = {}
+        self._decision_branches = {}
+        self._branch_owners = {}
+        self._index(self.nodes, list(self.edges))
+        
+        self._node_keys = {}
+        for position, each in enumerate(self.nodes):
+            description = each.task.description if isinstance(each, TaskNode) else each.description
+            self._node_keys.setdefault(each.id, node_key(position, description))
+    
+    def _start_checkpoint(self, resume: bool = False):
+        """
+        Opens the checkpoint of a run, keeping its records when resuming and dropping them otherwise.
+        
+        Args:
+            resume: Whether to restore the nodes completed by an earlier run
+        """
+        self._restored = {}
+        if self.checkpoint_id is None:
+            self._checkpoint = None
+            return
+        self._checkpoint = GraphCheckpoint(self.checkpoint_id)
+        if resume:
+            self._restored = self._checkpoint.load()
+        else:
+            self._checkpoint.clear()
+    
+    def _restored_record(self, node: Union[TaskNode, DecisionFunc, DecisionLLM], kind: str) -> Optional[Dict[str, Any]]:
+        """Gets the checkpoint record of a node completed by the run being resumed."""
+        record = self._restored.get(self._node_keys.get(node.id))
+        if record is not None and record["kind"] == kind:
+            return record
+        return None
+    
+    def _restore_task(self, node: TaskNode, record: Dict[str, Any], verbose: bool = False) -> Any:
+        """Gives a task its checkpointed output instead of running it again."""
+        output = record["output"]
+        node.task._response = output
+        if verbose:
+            console.print(f"[dim]Restored the output of task '{escape_rich_markup(node.task.description)}' from checkpoint {escape_rich_markup(self.checkpoint_id)}[/dim]")
+        return output
+    
+    def _checkpoint_task(self, node: TaskNode, output: Any):
+        if self._checkpoint is not None:
+            self._checkpoint.record_task(self._node_keys[node.id], output)
+    
+    def _checkpoint_decision(self, decision_node: Union[DecisionFunc, DecisionLLM], result: bool):
+        if self._checkpoint is not None:
+            self._checkpoint.record_decision(self._node_keys[decision_node.id], result)
+    
+    def _task_cache_key(self, task: Task, runner: Any) -> str:
+        """
+        Builds the cache key of a task's output, once its context is set.
+        
+        The key covers everything that goes into the request: the description,
+        the response format's schema, the task's and the agent's tools, the
+        agent, its model and characterization, and the context, which holds the
+        outputs of the task's predecessors. When an upstream output changes,
+        every task downstream of it misses. It is built before the task runs,
+        since agents add their characterization and knowledge to the context.
+        
+        A knowledge base is keyed by its sources, not by their contents, and a
+        tool instance by its class and attributes.
+        
+        Args:
+            task: The task about to run
+            runner: The agent that runs it
+            
+        Returns:
+            The cache key
+        """
+        response_format = task.response_format
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            try:
+                response_format = json.dumps(response_format.model_json_schema(), sort_keys=True)
+            except Exception:
+                # Fields without a JSON schema, described by the class definition instead
+                pass
+        model = getattr(runner, "model", None)
+        parts = [
+            task.description,
+            _fingerprint(response_format),
+            _fingerprint([_tool_fingerprint(tool) for tool in task.tools]),
+            _fingerprint([_tool_fingerprint(tool) for tool in getattr(runner, "tools", None) or []]),
+            type(runner).__qualname__,
+            _fingerprint(model if isinstance(model, str) else None),
+            _fingerprint(getattr(runner, "system_prompt", None)),
+            _fingerprint([getattr(runner, field, None) for field in ("job_title", "company_url", "company_objective", "reflection")]),
+            _fingerprint(getattr(runner, "knowledge_base", None)),
+            _fingerprint(task.images),
+            _fingerprint(task.response_lang),
+            _fingerprint(task.context),
+        ]
+        return f"graph_task_{hashlib.sha256(chr(0).join(parts).encode('utf-8')).hexdigest()}"
+    
+    def _cached_output(self, node: TaskNode, key: Optional[str], verbose: bool = False) -> Optional[Any]:
+        """Gets the output an earlier run cached under a task's key, if caching is on."""
+        if key is None:
+            return None
+        output = get_from_cache_with_expiry(key)
+        if output is not None:
+            node.task._response = output
+            if verbose:
+                console.print(f"[dim]Using the cached output of task '{escape_rich_markup(node.task.description)}'[/dim]")
+        return output
+    
+    def _cache_output(self, key: Optional[str], output: Any):
+        if key is not None and output is not None:
+            save_to_cache_with_expiry(output, key, self.cache_expiry)
+    
+    def _index(self, nodes: List[Union[TaskNode, DecisionFunc, DecisionLLM]], edge_sources: List[str] = ()):
+        """
+        Adds nodes and their outgoing edges to the compiled form of the graph.
+        
+        Args:
+            nodes: The nodes just added to the graph
+            edge_sources: IDs of other nodes whose edges changed
+        """
+        new_nodes = []
+        for each in nodes:
+            if each.id not in self._nodes_by_id:
+                self._nodes_by_id[each.id] = each
+                new_nodes.append(each)
+            self._successor_ids.setdefault(each.id, [])
+            self._predecessor_ids.setdefault(each.id, [])
+        for each in new_nodes:
+            if isinstance(each, (DecisionFunc, DecisionLLM)):
+                # Outer decisions come first, which _outer_decision_id relies on
+                for branch_id in self._branch_node_ids(each):
+                    self._branch_owners.setdefault(branch_id, []).append(each.id)
+        
+        sources = list(dict.fromkeys([each.id for each in nodes] + list(edge_sources)))
+        for source_id in sources:
+            source = self._nodes_by_id.get(source_id)
+            if source is None:
+                continue
+            targets = list(self.edges.get(source_id, []))
+            if isinstance(source, TaskNode):
+                targets.extend(next_node.id for next_node in source.next_nodes)
+            targets = list(dict.fromkeys(targets))
+            
+            previous = self._successor_ids.get(source_id, [])
+            for target_id in previous:
+                if target_id not in targets:
+                    self._predecessor_ids[target_id].remove(source_id)
+            for target_id in targets:
+                if target_id not in previous:
+                    self._predecessor_ids.setdefault(target_id, []).append(source_id)
+            self._successor_ids[source_id] = targets
+    
+    def _branch_node_ids(self, decision_node: Union[DecisionFunc, DecisionLLM]) -> Set[str]:
+        """
+        Gets the IDs of every node in the branches of a decision, nested ones included.
+        
+        Args:
+            decision_node: The decision node
+            
+        Returns:
+            The set of node IDs
+        """
+        if decision_node.id in self._decision_branches:
+            return self._decision_branches[decision_node.id]
+        ids = set()
+        for branch in (decision_node.true_branch, decision_node.false_branch):
+            if isinstance(branch, TaskNode):
+                ids.add(branch.id)
+            elif isinstance(branch, TaskChain):
+                for branch_node in branch.nodes:
+                    ids.add(branch_node.id)
+                    if isinstance(branch_node, (DecisionFunc, DecisionLLM)):
+                        ids |= self._branch_node_ids(branch_node)
+            elif isinstance(branch, (DecisionFunc, DecisionLLM)):
+                ids.add(branch.id)
+                ids |= self._branch_node_ids(branch)
+        self._decision_branches[decision_node.id] = ids
+        return ids
+    
+    def _link_in_order(self, nodes: List[Union[TaskNode, DecisionFunc, DecisionLLM]], previous: Any = None) -> Any:
+        """
+        Records the order a chain implies around decision nodes, which its edges don't.
+        
+        Neither `task >> decision` nor `decision >> task` adds an edge, and the
+        sequential runner relies on its queue order instead. The parallel
+        scheduler uses these links to evaluate the decision after the node
+        before it, and to run the node after it once its branch is done.
+        
+        Args:
+            nodes: The nodes being added, in chain order
+            previous: The node added before them
+            
+        Returns:
+            The last node added outside of a decision branch
+        """
+        branch_ids = set()
+        for each in nodes:
+            if isinstance(each, (DecisionFunc, DecisionLLM)):
+                branch_ids |= self._branch_node_ids(each)
+        
+        for each in nodes:
+            if each.id in branch_ids:
+                continue
+            is_decision = isinstance(each, (DecisionFunc, DecisionLLM))
+            if previous is not None and (is_decision or isinstance(previous, (DecisionFunc, DecisionLLM))):
+                if not self._get_predecessors(each):
+                    self._implicit_predecessors.setdefault(each.id, []).append(previous.id)
+            previous = each
+            
+            if is_decision:
+                # Chains inside the branches have their own order
+                for branch in (each.true_branch, each.false_branch):
+                    if isinstance(branch, TaskChain):
+                        self._link_in_order(branch.nodes)
+        return previous
+    
     def _get_available_agent(self) -> Any:
         """
         Finds an available agent either from the graph default or from any task node.
@@ -612,6 +970,66 @@ class Graph(BaseModel):
         # No agent found
         return None
 
+    def _get_runner(self, task: Task) -> Any:
+        """
+        Finds the agent that runs a task: its own, the graph default, or any available one.
+        
+        Args:
+            task: The task to run
+            
+        Returns:
+            The agent, an AgentConfiguration or Direct
+        """
+        runner = task.agent or self.default_agent
+        if runner is None:
+            # Try to find any agent from other task nodes
+            runner = self._get_available_agent()
+            if runner is None:
+                raise ValueError(f"No agent specified for task '{task.description}' and no default agent set")
+        return runner
+
+    def _print_task_start(self, task: Task, runner: Any):
+        """Prints the panel shown when a task starts in verbose mode."""
+        table = Table(show_header=False, expand=True, box=None)
+        table.add_row("[bold]Task:[/bold]", f"[cyan]{escape_rich_markup(task.description)}[/cyan]")
+        # Display runner type safely
+        runner_type = runner.__class__.__name__ if hasattr(runner, '__class__') else type(runner).__name__
+        table.add_row("[bold]Agent:[/bold]", f"[yellow]{escape_rich_markup(runner_type)}[/yellow]")
+        if task.tools:
+            tool_names = [escape_rich_markup(t.__class__.__name__ if hasattr(t, '__class__') else str(t)) for t in task.tools]
+            table.add_row("[bold]Tools:[/bold]", f"[green]{escape_rich_markup(', '.join(tool_names))}[/green]")
+        panel = Panel(
+            table,
+            title="[bold blue]Upsonic - Executing Task[/bold blue]",
+            border_style="blue",
+            expand=True,
+            width=70
+        )
+        console.print(panel)
+        spacing()
+
+    def _print_task_end(self, task: Task, output: Any, time_taken: float):
+        """Prints the panel shown when a task completes in verbose mode."""
+        table = Table(show_header=False, expand=True, box=None)
+        table.add_row("[bold]Task:[/bold]", f"[cyan]{escape_rich_markup(task.description)}[/cyan]")
+        
+        # Handle different output types for display
+        output_str = self._format_output_for_display(output)
+        
+        table.add_row("[bold]Output:[/bold]", f"[green]{output_str}[/green]")
+        table.add_row("[bold]Time Taken:[/bold]", f"{time_taken:.2f} seconds")
+        if task.total_cost:
+            table.add_row("[bold]Estimated Cost:[/bold]", f"${task.total_cost:.4f}")
+        panel = Panel(
+            table,
+            title="[bold green]✅ Task Completed[/bold green]",
+            border_style="green",
+            expand=True,
+            width=70
+        )
+        console.print(panel)
+        spacing()
+
     def _execute_task(self, node: TaskNode, state: State, verbose: bool = False) -> Any:
         """
         Executes a single task.
@@ -626,13 +1044,12 @@ class Graph(BaseModel):
         """
         task = node.task
         
+        record = self._restored_record(node, "task")
+        if record is not None:
+            return self._restore_task(node, record, verbose)
+        
         # Use the task's agent or try to find an available agent
-        runner = task.agent or self.default_agent
-        if runner is None:
-            # Try to find any agent from other task nodes
-            runner = self._get_available_agent()
-            if runner is None:
-                raise ValueError(f"No agent specified for task '{task.description}' and no default agent set")
+        runner = self._get_runner(task)
         
         try:
             # Start timing
@@ -640,24 +1057,7 @@ class Graph(BaseModel):
             task.start_time = start_time
             
             if verbose:
-                # Create and print a task execution panel
-                table = Table(show_header=False, expand=True, box=None)
-                table.add_row("[bold]Task:[/bold]", f"[cyan]{escape_rich_markup(task.description)}[/cyan]")
-                # Display runner type safely
-                runner_type = runner.__class__.__name__ if hasattr(runner, '__class__') else type(runner).__name__
-                table.add_row("[bold]Agent:[/bold]", f"[yellow]{escape_rich_markup(runner_type)}[/yellow]")
-                if task.tools:
-                    tool_names = [escape_rich_markup(t.__class__.__name__ if hasattr(t, '__class__') else str(t)) for t in task.tools]
-                    table.add_row("[bold]Tools:[/bold]", f"[green]{escape_rich_markup(', '.join(tool_names))}[/green]")
-                panel = Panel(
-                    table,
-                    title="[bold blue]Upsonic - Executing Task[/bold blue]",
-                    border_style="blue",
-                    expand=True,
-                    width=70
-                )
-                console.print(panel)
-                spacing()
+                self._print_task_start(task, runner)
             
             # Get previous outputs if available
             previous_outputs = [state.get_task_output(prev_node.id) for prev_node in self._get_predecessors(node)]
@@ -667,34 +1067,69 @@ class Graph(BaseModel):
                 task.context = previous_outputs
             
             # Execute the task - both AgentConfiguration and Direct have the do method
-            output = runner.do(task)
+            cache_key = self._task_cache_key(task, runner) if self.caching else None
+            output = self._cached_output(node, cache_key, verbose)
+            if output is None:
+                output = runner.do(task)
+                self._cache_output(cache_key, output)
+            self._checkpoint_task(node, output)
             
             # End timing
             end_time = time.time()
             task.end_time = end_time
             
             if verbose:
-                # Create and print a task completion panel
-                time_taken = end_time - start_time
-                table = Table(show_header=False, expand=True, box=None)
-                table.add_row("[bold]Task:[/bold]", f"[cyan]{escape_rich_markup(task.description)}[/cyan]")
-                
-                # Handle different output types for display
-                output_str = self._format_output_for_display(output)
-                
-                table.add_row("[bold]Output:[/bold]", f"[green]{output_str}[/green]")
-                table.add_row("[bold]Time Taken:[/bold]", f"{time_taken:.2f} seconds")
-                if task.total_cost:
-                    table.add_row("[bold]Estimated Cost:[/bold]", f"${task.total_cost:.4f}")
-                panel = Panel(
-                    table,
-                    title="[bold green]✅ Task Completed[/bold green]",
-                    border_style="green",
-                    expand=True,
-                    width=70
-                )
-                console.print(panel)
-                spacing()
+                self._print_task_end(task, output, end_time - start_time)
+            
+            return output
+            
+        except Exception as e:
+            if verbose:
+                console.print(f"[bold red]Task '{escape_rich_markup(task.description)}' failed: {escape_rich_markup(str(e))}[/bold red]")
+            raise
+
+    async def _execute_task_async(self, node: TaskNode, verbose: bool = False) -> Any:
+        """
+        Asynchronous version of _execute_task, for the parallel scheduler.
+        
+        The task's context is set by the scheduler beforehand. Agents without
+        a do_async method run in a worker thread.
+        
+        Args:
+            node: The TaskNode containing the task to execute
+            verbose: Whether to print detailed information
+            
+        Returns:
+            The output of the task
+        """
+        task = node.task
+        record = self._restored_record(node, "task")
+        if record is not None:
+            return self._restore_task(node, record, verbose)
+        runner = self._get_runner(task)
+        
+        try:
+            start_time = time.time()
+            task.start_time = start_time
+            
+            if verbose:
+                self._print_task_start(task, runner)
+            
+            cache_key = self._task_cache_key(task, runner) if self.caching else None
+            output = self._cached_output(node, cache_key, verbose)
+            if output is None:
+                if hasattr(runner, 'do_async'):
+                    output = await runner.do_async(task)
+                else:
+                    output = await asyncio.to_thread(runner.do, task)
+                self._cache_output(cache_key, output)
+            self._checkpoint_task(node, output)
+            
+            end_time = time.time()
+            task.end_time = end_time
+            
+            if verbose:
+                self._print_task_end(task, output, end_time - start_time)
             
             return output
             
@@ -703,6 +1138,49 @@ class Graph(BaseModel):
                 console.print(f"[bold red]Task '{escape_rich_markup(task.description)}' failed: {escape_rich_markup(str(e))}[/bold red]")
             raise
     
+    def _get_decision_agent(self, decision_node: DecisionLLM) -> Any:
+        """Finds the agent that evaluates an LLM-based decision."""
+        agent = self.default_agent
+        if agent is None:
+            # Try to find any agent from task nodes
+            agent = self._get_available_agent()
+            if agent is None:
+                raise ValueError(f"No agent available for LLM-based decision: '{decision_node.description}'")
+        return agent
+
+    def _decision_branch(self, decision_node: Union[DecisionFunc, DecisionLLM], result: bool, verbose: bool = False) -> Union[TaskNode, TaskChain, None]:
+        """
+        Prints the outcome of a decision in verbose mode and picks its branch.
+        
+        Args:
+            decision_node: The evaluated decision node
+            result: The outcome of the decision
+            verbose: Whether to print detailed information
+            
+        Returns:
+            The branch to follow (true or false)
+        """
+        if verbose:
+            # Create and print a decision evaluation panel
+            table = Table(show_header=False, expand=True, box=None)
+            table.add_row("[bold]Decision:[/bold]", f"[cyan]{escape_rich_markup(decision_node.description)}[/cyan]")
+            table.add_row("[bold]Result:[/bold]", f"[green]{result}[/green]")
+            panel = Panel(
+                table,
+                title="[bold yellow]🔀 Evaluating Decision[/bold yellow]",
+                border_style="yellow",
+                expand=True,
+                width=70
+            )
+            console.print(panel)
+            spacing()
+        
+        # Return the appropriate branch
+        if result:
+            return decision_node.true_branch
+        else:
+            return decision_node.false_branch
+
     def _evaluate_decision(self, decision_node: Union[DecisionFunc, DecisionLLM], state: State, verbose: bool = False) -> Union[TaskNode, TaskChain, None]:
         """
         Evaluates a decision node to determine which branch to follow.
@@ -715,6 +1193,10 @@ class Graph(BaseModel):
         Returns:
             The branch to follow (true or false)
         """
+        record = self._restored_record(decision_node, "decision")
+        if record is not None:
+            return self._decision_branch(decision_node, record["result"], verbose)
+        
         # Get the most recent output to evaluate
         latest_output = state.get_latest_output()
         
@@ -724,12 +1206,7 @@ class Graph(BaseModel):
             result = decision_node.evaluate(latest_output)
         elif isinstance(decision_node, DecisionLLM):
             # For LLM-based decisions, use the default agent or find an available one
-            agent = self.default_agent
-            if agent is None:
-                # Try to find any agent from task nodes
-                agent = self._get_available_agent()
-                if agent is None:
-                    raise ValueError(f"No agent available for LLM-based decision: '{decision_node.description}'")
+            agent = self._get_decision_agent(decision_node)
             
             # Generate the prompt for the LLM
             prompt = decision_node._generate_prompt(latest_output)
@@ -751,26 +1228,46 @@ class Graph(BaseModel):
         else:
             raise ValueError(f"Unknown decision node type: {type(decision_node)}")
         
-        if verbose:
-            # Create and print a decision evaluation panel
-            table = Table(show_header=False, expand=True, box=None)
-            table.add_row("[bold]Decision:[/bold]", f"[cyan]{escape_rich_markup(decision_node.description)}[/cyan]")
-            table.add_row("[bold]Result:[/bold]", f"[green]{result}[/green]")
-            panel = Panel(
-                table,
-                title="[bold yellow]🔀 Evaluating Decision[/bold yellow]",
-                border_style="yellow",
-                expand=True,
-                width=70
-            )
-            console.print(panel)
-            spacing()
+        self._checkpoint_decision(decision_node, result)
+        return self._decision_branch(decision_node, result, verbose)
+
+    async def _evaluate_decision_async(self, decision_node: Union[DecisionFunc, DecisionLLM], data: Any, verbose: bool = False) -> Union[TaskNode, TaskChain, None]:
+        """
+        Asynchronous version of _evaluate_decision, for the parallel scheduler.
         
-        # Return the appropriate branch
-        if result:
-            return decision_node.true_branch
+        Args:
+            decision_node: The decision node to evaluate
+            data: The output the decision is made on
+            verbose: Whether to print detailed information
+            
+        Returns:
+            The branch to follow (true or false)
+        """
+        record = self._restored_record(decision_node, "decision")
+        if record is not None:
+            return self._decision_branch(decision_node, record["result"], verbose)
+        
+        if isinstance(decision_node, DecisionFunc):
+            result = decision_node.evaluate(data)
+        elif isinstance(decision_node, DecisionLLM):
+            agent = self._get_decision_agent(decision_node)
+            decision_task = Task(decision_node._generate_prompt(data),
+                response_format=DecisionResponse
+            )
+            if hasattr(agent, 'do_async'):
+                response = await agent.do_async(decision_task)
+            else:
+                response = await asyncio.to_thread(agent.do, decision_task)
+            result = response.result if hasattr(response, 'result') else False
+            
+            if verbose:
+                console.print(f"[dim]LLM Decision Response: {escape_rich_markup(str(response))}[/dim]")
+                console.print(f"[dim]Decision Result: {'Yes' if result else 'No'}[/dim]")
         else:
-            return decision_node.false_branch
+            raise ValueError(f"Unknown decision node type: {type(decision_node)}")
+        
+        self._checkpoint_decision(decision_node, result)
+        return self._decision_branch(decision_node, result, verbose)
     
     def _format_output_for_display(self, output: Any) -> str:
         """
@@ -820,24 +1317,7 @@ class Graph(BaseModel):
         Returns:
             List of predecessor nodes
         """
-        predecessors = []
-        # Check node connections in the edges dictionary
-        for n_id, next_ids in self.edges.items():
-            if node.id in next_ids:
-                # Find the node object
-                for n in self.nodes:
-                    if n.id == n_id:
-                        predecessors.append(n)
-                        break
-        
-        # Also check TaskNode's next_nodes connections
-        for n in self.nodes:
-            if isinstance(n, TaskNode):
-                for next_node in n.next_nodes:
-                    if next_node.id == node.id:
-                        predecessors.append(n)
-        
-        return predecessors
+        return [self._nodes_by_id[pred_id] for pred_id in self._predecessor_ids.get(node.id, [])]
     
     def _get_start_nodes(self) -> List[Union[TaskNode, DecisionFunc, DecisionLLM]]:
         """
@@ -846,17 +1326,7 @@ class Graph(BaseModel):
         Returns:
             List of start nodes
         """
-        # Get all IDs that appear as targets in the edges dictionary
-        all_target_ids = {target_id for targets in self.edges.values() for target_id in targets}
-        
-        # Also get all IDs that appear as targets in TaskNode.next_nodes
-        for n in self.nodes:
-            if isinstance(n, TaskNode):
-                for next_node in n.next_nodes:
-                    all_target_ids.add(next_node.id)
-        
-        # Return nodes that don't appear as targets
-        return [node for node in self.nodes if node.id not in all_target_ids]
+        return [node for node in self.nodes if not self._predecessor_ids.get(node.id)]
     
     def _get_next_nodes(self, node: Union[TaskNode, DecisionFunc, DecisionLLM]) -> List[Union[TaskNode, DecisionFunc, DecisionLLM]]:
         """
@@ -868,23 +1338,7 @@ class Graph(BaseModel):
         Returns:
             List of successor nodes
         """
-        next_nodes = []
-        
-        # Check edges dictionary
-        if node.id in self.edges:
-            next_ids = self.edges[node.id]
-            for next_id in next_ids:
-                for n in self.nodes:
-                    if n.id == next_id:
-                        next_nodes.append(n)
-        
-        # If it's a TaskNode, also check its next_nodes attribute
-        if isinstance(node, TaskNode):
-            for next_node in node.next_nodes:
-                if next_node not in next_nodes:  # Avoid duplicates
-                    next_nodes.append(next_node)
-        
-        return next_nodes
+        return [self._nodes_by_id[next_id] for next_id in self._successor_ids.get(node.id, []) if next_id in self._nodes_by_id]
     
     def _run_sequential(self, verbose: bool = False, show_progress: bool = True) -> State:
         """
@@ -902,8 +1356,9 @@ class Graph(BaseModel):
             spacing()
         
         # We can't use topological sort with decisions, so we use a dynamic execution approach
-        execution_queue = self._get_start_nodes()
-        executed_nodes = set()
+        execution_queue = deque(self._get_start_nodes())
+        # Number of predecessors each node is still waiting for
+        waiting = {node_id: len(pred_ids) for node_id, pred_ids in self._predecessor_ids.items()}
         
         # Count all possible nodes in the graph including all branches
         all_nodes = self._count_all_possible_nodes()
@@ -923,7 +1378,7 @@ class Graph(BaseModel):
                 # Process nodes until the queue is empty
                 completed_nodes = 0
                 while execution_queue:
-                    node = execution_queue.pop(0)
+                    node = execution_queue.popleft()
                     
                     # Update progress description
                     if isinstance(node, TaskNode):
@@ -955,19 +1410,17 @@ class Graph(BaseModel):
                         
                         output = self._execute_task(node, self.state, verbose)
                         self.state.update(node.id, output)
-                        executed_nodes.add(node.id)
                         
                         # Add successor nodes to the queue
                         for next_node in self._get_next_nodes(node):
                             # Only add if all predecessors have been executed
-                            predecessors = self._get_predecessors(next_node)
-                            if all(pred.id in executed_nodes for pred in predecessors):
+                            waiting[next_node.id] -= 1
+                            if waiting[next_node.id] == 0:
                                 execution_queue.append(next_node)
                     
                     elif isinstance(node, (DecisionFunc, DecisionLLM)):
                         # Evaluate the decision
                         branch = self._evaluate_decision(node, self.state, verbose)
-                        executed_nodes.add(node.id)
                         
                         # Add the appropriate branch to the execution queue
                         if branch:
@@ -980,7 +1433,7 @@ class Graph(BaseModel):
                                         if verbose:
                                             console.print(f"[dim]Setting context from previous output for branch task: {escape_rich_markup(branch.task.description)}[/dim]")
                                 
-                                execution_queue.insert(0, branch)
+                                execution_queue.appendleft(branch)
                             elif isinstance(branch, TaskChain):
                                 # Add all nodes from the branch to the queue in reverse order
                                 branch_nodes = list(reversed(branch.nodes))
@@ -995,14 +1448,13 @@ class Graph(BaseModel):
                                             if verbose:
                                                 console.print(f"[dim]Setting context from previous output for first branch chain task: {escape_rich_markup(first_task.task.description)}[/dim]")
                                 
-                                for branch_node in branch_nodes:
-                                    execution_queue.insert(0, branch_node)
+                                execution_queue.extendleft(branch_nodes)
                             elif isinstance(branch, (DecisionFunc, DecisionLLM)):
                                 # Handle the case where a decision returns another decision node
                                 # Insert at the front of the queue to be processed next
                                 if verbose:
                                     console.print(f"[dim]Decision returned another decision node: {escape_rich_markup(branch.description)}[/dim]")
-                                execution_queue.insert(0, branch)
+                                execution_queue.appendleft(branch)
                     
                     # Increment completed nodes and update progress
                     completed_nodes += 1
@@ -1013,7 +1465,7 @@ class Graph(BaseModel):
         else:
             # Process nodes without progress bar
             while execution_queue:
-                node = execution_queue.pop(0)
+                node = execution_queue.popleft()
                 
                 # Process the node
                 if isinstance(node, TaskNode):
@@ -1027,19 +1479,17 @@ class Graph(BaseModel):
                     
                     output = self._execute_task(node, self.state, verbose)
                     self.state.update(node.id, output)
-                    executed_nodes.add(node.id)
                     
                     # Add successor nodes to the queue
                     for next_node in self._get_next_nodes(node):
                         # Only add if all predecessors have been executed
-                        predecessors = self._get_predecessors(next_node)
-                        if all(pred.id in executed_nodes for pred in predecessors):
+                        waiting[next_node.id] -= 1
+                        if waiting[next_node.id] == 0:
                             execution_queue.append(next_node)
                 
                 elif isinstance(node, (DecisionFunc, DecisionLLM)):
                     # Evaluate the decision
                     branch = self._evaluate_decision(node, self.state, verbose)
-                    executed_nodes.add(node.id)
                     
                     # Add the appropriate branch to the execution queue
                     if branch:
@@ -1050,7 +1500,7 @@ class Graph(BaseModel):
                                 if latest_output:
                                     branch.task.context = [latest_output]
                                     
-                            execution_queue.insert(0, branch)
+                            execution_queue.appendleft(branch)
                         elif isinstance(branch, TaskChain):
                             # Add all nodes from the branch to the queue in reverse order
                             branch_nodes = list(reversed(branch.nodes))
@@ -1063,16 +1513,374 @@ class Graph(BaseModel):
                                     if latest_output:
                                         first_task.task.context = [latest_output]
                             
-                            for branch_node in branch_nodes:
-                                execution_queue.insert(0, branch_node)
+                            execution_queue.extendleft(branch_nodes)
                         elif isinstance(branch, (DecisionFunc, DecisionLLM)):
                             # Handle the case where a decision returns another decision node
                             # Insert at the front of the queue to be processed next
                             if verbose:
                                 console.print(f"[dim]Decision returned another decision node: {escape_rich_markup(branch.description)}[/dim]")
-                            execution_queue.insert(0, branch)
+                            execution_queue.appendleft(branch)
+        
+        if verbose:
+            console.print("[bold green]Graph Execution Completed[/bold green]")
+            spacing()
+        
+        return self.state
+    
+    def _scheduler_predecessor_ids(self, node: Union[TaskNode, DecisionFunc, DecisionLLM]) -> List[str]:
+        """Gets the IDs of the nodes the parallel scheduler waits for before running a node."""
+        ids = []
+        for pred_id in self._predecessor_ids.get(node.id, []):
+            # `decision >> task` links the task to the end of a branch, so it waits for the whole decision
+            pred_id = self._outer_decision_id(pred_id, node.id) or pred_id
+            if pred_id not in ids:
+                ids.append(pred_id)
+        for pred_id in self._implicit_predecessors.get(node.id, []):
+            if pred_id not in ids:
+                ids.append(pred_id)
+        return ids
+    
+    def _outer_decision_id(self, branch_node_id: str, node_id: str) -> Optional[str]:
+        """Gets the ID of the outermost decision with a node in its branches but not another one."""
+        for decision_id in self._branch_owners.get(branch_node_id, []):
+            if node_id not in self._decision_branches[decision_id]:
+                return decision_id
+        return None
+    
+    def _scheduler_inputs(self, node: Union[TaskNode, DecisionFunc, DecisionLLM], run: _ParallelRun) -> List[Any]:
+        """Gets the outputs a node receives from its predecessors in a parallel run."""
+        inputs = []
+        for pred_id in run.predecessors[node.id]:
+            if pred_id in run.decision_outputs:
+                output = run.decision_outputs[pred_id]
+            else:
+                output = self.state.get_task_output(pred_id)
+            if output is not None:
+                inputs.append(output)
+        return inputs
+    
+    def _branch_entries(self, branch: Union[TaskNode, TaskChain, DecisionFunc, DecisionLLM]):
+        """
+        Gets the entry nodes of a decision branch and the IDs of the nodes its scheduler may run.
+        
+        Args:
+            branch: The branch taken
+            
+        Returns:
+            A tuple of the entry nodes and the set of allowed node IDs
+        """
+        if isinstance(branch, TaskChain):
+            if not branch.nodes:
+                return [], set()
+            allowed = {each.id for each in branch.nodes}
+            for each in branch.nodes:
+                if isinstance(each, (DecisionFunc, DecisionLLM)):
+                    allowed -= self._branch_node_ids(each)
+            return [branch.nodes[0]], allowed
+        return [branch], {branch.id}
+    
+    async def _run_node(self, node: Union[TaskNode, DecisionFunc, DecisionLLM], run: _ParallelRun, data: Any = None, speculation: Optional[asyncio.Future] = None) -> List[str]:
+        """
+        Runs one node of a parallel run, and the branch it picks if it is a decision.
+        
+        Args:
+            node: The node to run
+            run: The bookkeeping of the run
+            data: The input of a branch entry, passed on by its decision
+            speculation: The run of a branch entry started while its decision was made, to finish instead of running it
+            
+        Returns:
+            The IDs of the nodes that were run
+        """
+        inputs = [data] if data is not None else self._scheduler_inputs(node, run)
+        
+        if isinstance(node, TaskNode):
+            if speculation is not None:
+                output, fresh, cache_key = await speculation
+                self._keep_speculation(node, run, output, fresh, cache_key)
+            else:
+                # A task gets the outputs of its own predecessors, never those of unrelated tasks
+                if not node.task.context and inputs:
+                    node.task.context = inputs
+                async with run.semaphore:
+                    output = await self._execute_task_async(node, run.verbose)
+            self.state.update(node.id, output)
+            run.node_done()
+            return [node.id]
+        
+        decision_input = inputs[-1] if inputs else self.state.get_latest_output()
+        speculations = self._start_speculation(node, run, decision_input)
+        try:
+            async with run.semaphore:
+                branch = await self._evaluate_decision_async(node, decision_input, run.verbose)
+        except BaseException:
+            await self._discard_speculation(speculations, run)
+            raise
+        run.decision_outputs[node.id] = decision_input
+        run.node_done()
+        
+        executed = [node.id]
+        entries, allowed = self._branch_entries(branch) if branch is not None else ([], set())
+        kept = {each.id: speculations.pop(each.id)[1] for each in entries if each.id in speculations}
+        await self._discard_speculation(speculations, run)
+        if branch is not None:
+            branch_executed = await self._run_dag(entries, allowed, run, decision_input, run.levels.get(node.id, 0), kept)
+            executed.extend(branch_executed)
+            outputs = [each for each in branch_executed if each in self.state.task_outputs]
+            if outputs:
+                # Nodes after the decision continue from the end of its branch
+                last = max(outputs, key=run.rank)
+                run.decision_outputs[node.id] = self.state.get_task_output(last)
+                run.levels[node.id] = max(run.levels[each] for each in branch_executed)
+        return executed
+    
+    def _start_speculation(self, decision_node: Union[DecisionFunc, DecisionLLM], run: _ParallelRun, data: Any) -> Dict[str, tuple]:
+        """
+        Starts the first task of both branches of an LLM decision before the decision is made.
+        
+        The task of the branch taken is finished by its branch, the other one
+        is discarded. Nothing is started once the run's discarded tasks cost
+        the speculation budget, or when max_parallel_tasks is 1, since the
+        decision itself then holds the only slot.
+        
+        Args:
+            decision_node: The decision about to be evaluated
+            run: The bookkeeping of the run
+            data: The input of the decision, which is also the input of its branches
+            
+        Returns:
+            (node, future, original context, estimated cost) tuples by node ID
+        """
+        if not self.speculative_decisions or not isinstance(decision_node, DecisionLLM):
+            return {}
+        if self.max_parallel_tasks <= 1:
+            return {}
+        if self.speculation_budget is not None and run.wasted_cost >= self.speculation_budget:
+            return {}
+        if self._restored_record(decision_node, "decision") is not None:
+            return {}
+        
+        speculations = {}
+        for branch in (decision_node.true_branch, decision_node.false_branch):
+            if branch is None:
+                continue
+            for entry in self._branch_entries(branch)[0]:
+                if isinstance(entry, TaskNode) and entry.id not in speculations and entry.id not in run.scheduled:
+                    context = entry.task.context
+                    if not context and data is not None:
+                        entry.task.context = [data]
+                    estimate = self._estimate_cost(entry.task)
+                    speculations[entry.id] = (entry, asyncio.ensure_future(self._speculate(entry, run)), context, estimate)
+        return speculations
+    
+    def _estimate_cost(self, task: Task) -> float:
+        """
+        Estimates the cost in dollars of running a task, from its prompt size and its model's pricing.
+        
+        A speculative task that is cancelled has no recorded cost, but the
+        request it already sent is still billed, so this is what its discard
+        counts against the speculation budget.
+        
+        Args:
+            task: The task, with its context set
+            
+        Returns:
+            The estimated cost, 0.0 if the model has no known pricing
+        """
+        model = getattr(self._get_runner(task), "model", None)
+        if not isinstance(model, str):
+            model = AgentConfiguration.model_fields["model"].default
+        # About four characters per token
+        input_tokens = len(task.description + str(task.context or "")) // 4
+        cost = get_estimated_cost(input_tokens, SPECULATIVE_OUTPUT_TOKENS, model)
+        try:
+            return float(cost.replace("~", "").replace("$", ""))
+        except ValueError:
+            return 0.0
+    
+    async def _speculate(self, node: TaskNode, run: _ParallelRun) -> tuple:
+        """
+        Runs a branch entry the way its branch would, without printing, checkpointing or caching it.
+        
+        Args:
+            node: The branch entry, with its context set
+            run: The bookkeeping of the run
+            
+        Returns:
+            The output, whether it was produced by an agent rather than taken from the cache, and its cache key
+        """
+        task = node.task
+        runner = self._get_runner(task)
+        cache_key = self._task_cache_key(task, runner) if self.caching else None
+        output = self._cached_output(node, cache_key)
+        if output is not None:
+            return output, False, cache_key
+        async with run.semaphore:
+            task.start_time = time.time()
+            if hasattr(runner, 'do_async'):
+                output = await runner.do_async(task)
+            else:
+                output = await asyncio.to_thread(runner.do, task)
+            task.end_time = time.time()
+        return output, True, cache_key
+    
+    def _keep_speculation(self, node: TaskNode, run: _ParallelRun, output: Any, fresh: bool, cache_key: Optional[str]):
+        """Stores and prints the output of a speculative task whose branch was taken, as if it had run there."""
+        task = node.task
+        runner = self._get_runner(task)
+        if run.verbose:
+            self._print_task_start(task, runner)
+            if not fresh:
+                console.print(f"[dim]Using the cached output of task '{escape_rich_markup(task.description)}'[/dim]")
+        if fresh:
+            self._cache_output(cache_key, output)
+        self._checkpoint_task(node, output)
+        if run.verbose:
+            self._print_task_end(task, output, (task.end_time or time.time()) - (task.start_time or time.time()))
+    
+    async def _discard_speculation(self, speculations: Dict[str, tuple], run: _ParallelRun):
+        """
+        Cancels the speculative tasks of the branches not taken and adds their cost to the run's waste.
+        
+        Args:
+            speculations: The (node, future, original context, estimated cost) tuples to discard
+            run: The bookkeeping of the run
+        """
+        for entry, future, context, estimate in speculations.values():
+            future.cancel()
+            await asyncio.gather(future, return_exceptions=True)
+            run.wasted_cost += max(entry.task.total_cost or 0.0, estimate)
+            run.wasted_tasks += 1
+            entry.task.context = context
+            entry.task._response = None
+            if run.verbose:
+                console.print(f"[dim]Discarded the speculative run of task '{escape_rich_markup(entry.task.description)}'[/dim]")
+    
+    async def _run_dag(self, entries: List[Union[TaskNode, DecisionFunc, DecisionLLM]], allowed_ids: Optional[Set[str]], run: _ParallelRun, entry_data: Any = None, entry_level: int = 0, speculations: Optional[Dict[str, asyncio.Future]] = None) -> List[str]:
+        """
+        Runs every node as soon as all of its predecessors are done, starting from the entry nodes.
+        
+        Ready nodes are started together and take turns on the run's semaphore,
+        so at most max_parallel_tasks tasks or decisions run at once.
+        
+        Args:
+            entries: The nodes to start with
+            allowed_ids: The decision branch nodes this scheduler may run, None for the top level
+            run: The bookkeeping of the run
+            entry_data: The input passed to the entry nodes, from the decision that picked them
+            entry_level: The depth of that decision
+            speculations: Runs of entry nodes already started by that decision, by node ID
+            
+        Returns:
+            The IDs of the nodes that were run, including inside decision branches
+        """
+        running = {}
+        executed = []
+        
+        def dispatch(node, level, data=None):
+            run.scheduled.add(node.id)
+            run.levels[node.id] = level
+            speculation = speculations.get(node.id) if speculations else None
+            running[asyncio.ensure_future(self._run_node(node, run, data, speculation))] = node
+        
+        for entry in entries:
+            if entry.id not in run.scheduled:
+                dispatch(entry, entry_level + 1, entry_data)
+        
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                # Handle nodes finishing together in graph order, so the result doesn't depend on timing
+                for finished in sorted(done, key=lambda each: run.rank(running[each].id)):
+                    node = running.pop(finished)
+                    executed.extend(finished.result())
+                    
+                    for candidate_id in run.successors[node.id]:
+                        run.waiting[candidate_id] -= 1
+                        if run.waiting[candidate_id] or candidate_id in run.scheduled:
+                            continue
+                        if candidate_id in run.branch_ids and (allowed_ids is None or candidate_id not in allowed_ids):
+                            continue
+                        level = 1 + max((run.levels.get(each, 0) for each in run.predecessors[candidate_id]), default=entry_level)
+                        dispatch(self._nodes_by_id[candidate_id], level)
+        finally:
+            if running:
+                # A node failed, stop the others
+                for each in running:
+                    each.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        return executed
+    
+    async def _run_parallel_async(self, verbose: bool = False, show_progress: bool = True) -> State:
+        """
+        Runs the graph as a DAG, with independent nodes running in parallel.
+        
+        A node starts once all of its predecessors are done, up to
+        max_parallel_tasks at a time. A task without its own context gets the
+        outputs of its predecessors, and a decision evaluates the output of the
+        node before it. Outputs are stored in the state in graph order (depth,
+        then position) rather than completion order.
+        
+        Args:
+            verbose: Whether to print detailed information
+            show_progress: Whether to display a progress bar
+            
+        Returns:
+            The final state object
+        """
+        if verbose:
+            console.print(f"[blue]Executing graph in parallel with up to {self.max_parallel_tasks} tasks at once[/blue]")
+            spacing()
+        
+        progress = None
+        overall_task = None
+        if show_progress:
+            progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TimeElapsedColumn(),
+                console=console
+            )
+            overall_task = progress.add_task("[bold blue]Graph Execution", total=self._count_all_possible_nodes())
+        
+        run = _ParallelRun(
+            self.max_parallel_tasks,
+            verbose,
+            on_node_done=(lambda: progress.advance(overall_task)) if progress is not None else None
+        )
+        for position, each in enumerate(self.nodes):
+            run.positions.setdefault(each.id, position)
+            run.predecessors.setdefault(each.id, self._scheduler_predecessor_ids(each))
+            run.successors.setdefault(each.id, [])
+            if isinstance(each, (DecisionFunc, DecisionLLM)):
+                run.branch_ids |= self._branch_node_ids(each)
+        for node_id, pred_ids in run.predecessors.items():
+            run.waiting[node_id] = len(pred_ids)
+            for pred_id in pred_ids:
+                run.successors.setdefault(pred_id, []).append(node_id)
+        
+        start_nodes = [
+            each for each in self.nodes
+            if each.id not in run.branch_ids and not run.predecessors[each.id]
+        ]
+        
+        if progress is not None:
+            progress.start()
+        try:
+            await self._run_dag(start_nodes, None, run)
+        finally:
+            if progress is not None:
+                progress.update(overall_task, completed=progress.tasks[0].total)
+                progress.stop()
+        
+        self.state.task_outputs = dict(sorted(self.state.task_outputs.items(), key=lambda item: run.rank(item[0])))
         
         if verbose:
+            if run.wasted_tasks:
+                console.print(f"[dim]Discarded {run.wasted_tasks} speculative tasks, estimated cost ${run.wasted_cost:.4f}[/dim]")
             console.print("[bold green]Graph Execution Completed[/bold green]")
             spacing()
         
@@ -1087,10 +1895,10 @@ class Graph(BaseModel):
         """
         # Start with the nodes directly in the graph
         counted = set()
-        to_count = list(self.nodes)
+        to_count = deque(self.nodes)
         
         while to_count:
-            node = to_count.pop(0)
+            node = to_count.popleft()
             if node.id in counted:
                 continue
                 
@@ -1119,13 +1927,15 @@ class Graph(BaseModel):
         # Return the count, minimum of 1 to avoid division by zero
         return max(len(counted), 1)
     
-    def run(self, verbose: bool = True, show_progress: bool = None) -> State:
+    def run(self, verbose: bool = True, show_progress: bool = None, resume: bool = False) -> State:
         """
         Executes the graph, running all tasks in the appropriate order.
         
         Args:
             verbose: Whether to print detailed information
             show_progress: Whether to display a progress bar during execution. If None, uses the graph's show_progress attribute.
+            resume: Whether to continue the run checkpointed under checkpoint_id, restoring the
+                outputs of its completed tasks and the results of its decisions instead of running them again
             
         Returns:
             The final state object with all task outputs
@@ -1140,10 +1950,46 @@ class Graph(BaseModel):
         
         # Reset state
         self.state = State()
+        self._compile()
+        self._start_checkpoint(resume)
+        
+        if self.parallel_execution:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._run_parallel_async(verbose, show_progress))
+            # Called from a coroutine, so the graph gets a loop of its own thread
+            return run_coroutine_in_new_thread(self._run_parallel_async(verbose, show_progress))
         
-        # With decision support, we always use the sequential implementation for now
         return self._run_sequential(verbose, show_progress)
     
+    async def run_async(self, verbose: bool = True, show_progress: bool = None, resume: bool = False) -> State:
+        """
+        Asynchronous version of the run method.
+        
+        Args:
+            verbose: Whether to print detailed information
+            show_progress: Whether to display a progress bar during execution. If None, uses the graph's show_progress attribute.
+            resume: Whether to continue the run checkpointed under checkpoint_id
+            
+        Returns:
+            The final state object with all task outputs
+        """
+        if show_progress is None:
+            show_progress = self.show_progress
+        
+        if verbose:
+            console.print("[bold blue]Starting Graph Execution[/bold blue]")
+            spacing()
+        
+        self.state = State()
+        self._compile()
+        self._start_checkpoint(resume)
+        
+        if self.parallel_execution:
+            return await self._run_parallel_async(verbose, show_progress)
+        return await asyncio.to_thread(self._run_sequential, verbose, show_progress)
+    
     def get_output(self) -> Any:
         """
         Gets the output of the last task executed in the graph.
@@ -1224,7 +2070,12 @@ def node(task_instance: Task) -> TaskNode:
 
 def create_graph(default_agent: Optional[Any] = None,
                  parallel_execution: bool = False,
-                 show_progress: bool = True) -> Graph:
+                 show_progress: bool = True,
+                 max_parallel_tasks: int = 4,
+                 checkpoint_id: Optional[str] = None,
+                 caching: bool = False,
+                 speculative_decisions: bool = False,
+                 speculation_budget: Optional[float] = None) -> Graph:
     """
     Creates a new graph with the specified configuration.
     
@@ -1232,6 +2083,11 @@ def create_graph(default_agent: Optional[Any] = None,
         default_agent: Default agent to use for tasks (AgentConfiguration or Direct)
         parallel_execution: Whether to execute independent tasks in parallel
         show_progress: Whether to display a progress bar during execution
+        max_parallel_tasks: Maximum number of tasks to execute in parallel
+        checkpoint_id: Name to checkpoint every completed node under, so a failed run can be resumed
+        caching: Whether to reuse task outputs of earlier runs whose task and inputs are unchanged
+        speculative_decisions: Whether a parallel run starts both branches of an LLM decision while it is being made
+        speculation_budget: Estimated cost in dollars of discarded speculative tasks a run may spend, None for no limit
         
     Returns:
         A configured Graph instance
@@ -1239,7 +2095,12 @@ def create_graph(default_agent: Optional[Any] = None,
     return Graph(
         default_agent=default_agent,
         parallel_execution=parallel_execution,
-        show_progress=show_progress
+        show_progress=show_progress,
+        max_parallel_tasks=max_parallel_tasks,
+        checkpoint_id=checkpoint_id,
+        caching=caching,
+        speculative_decisions=speculative_decisions,
+        speculation_budget=speculation_budget
     )
 
 
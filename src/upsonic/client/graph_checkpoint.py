@@ -0,0 +1,111 @@
+"""
+Checkpoints of graph runs in the client storage backend.
+
+Every task output and decision result of a run is appended to a list under
+the run's checkpoint ID as soon as it is known, so a run that crashed or
+timed out can be resumed: completed tasks get their stored output back and
+decisions take their stored branch, without calling an agent again.
+
+Nodes are identified by their position in the graph and their description,
+since node IDs are generated anew each time a graph is built.
+"""
+
+import base64
+import hashlib
+import logging
+from typing import Any, Dict
+
+import cloudpickle
+
+from ..storage.backends import StorageBackend
+from ..storage.configuration import ClientConfiguration
+
+
+def node_key(position: int, description: str) -> str:
+    """
+    Build the key a node is checkpointed under.
+
+    Args:
+        position: Index of the node in the graph's nodes
+        description: The description of its task or decision
+
+    Returns:
+        A key that is the same each time the same graph is built
+    """
+    digest = hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+    return f"{position}-{digest}"
+
+
+class GraphCheckpoint:
+    """
+    Append-only record of the completed nodes of one graph run.
+
+    Appends are atomic on every storage backend, so a crash leaves every
+    record before it intact.
+    """
+
+    def __init__(self, checkpoint_id: str, config: StorageBackend = ClientConfiguration):
+        """
+        Args:
+            checkpoint_id: Name of the run, the same when it is resumed
+            config: The storage backend to keep the records in
+        """
+        self.checkpoint_id = checkpoint_id
+        self.config = config
+
+    @property
+    def key(self) -> str:
+        return f"graph_checkpoint_{self.checkpoint_id}"
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the records of the run.
+
+        Returns:
+            The latest record of each node key, a dict with a "kind" of "task"
+            and its "output", or "decision" and its boolean "result"
+        """
+        records = {}
+        for record in self.config.get_range(self.key):
+            if record["kind"] == "task":
+                try:
+                    record["output"] = cloudpickle.loads(base64.b64decode(record["output"]))
+                except Exception as e:
+                    # The task runs again
+                    logging.warning(f"Could not restore the checkpointed output of node {record['node']}: {e}")
+                    continue
+            records[record["node"]] = record
+        return records
+
+    def record_task(self, key: str, output: Any) -> bool:
+        """
+        Record the output of a completed task.
+
+        Args:
+            key: The node key
+            output: The task output
+
+        Returns:
+            True if it was recorded, False if the output can't be pickled
+        """
+        try:
+            data = base64.b64encode(cloudpickle.dumps(output)).decode("utf-8")
+        except Exception as e:
+            logging.warning(f"Could not checkpoint the output of node {key}: {e}")
+            return False
+        self.config.append(self.key, [{"node": key, "kind": "task", "output": data}])
+        return True
+
+    def record_decision(self, key: str, result: bool) -> None:
+        """
+        Record the result of an evaluated decision.
+
+        Args:
+            key: The node key
+            result: Whether the decision took its true branch
+        """
+        self.config.append(self.key, [{"node": key, "kind": "decision", "result": bool(result)}])
+
+    def clear(self) -> None:
+        """Delete the records of the run."""
+        self.config.delete(self.key)
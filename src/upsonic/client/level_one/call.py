@@ -9,7 +9,7 @@ cloudpickle.DEFAULT_PROTOCOL = 2
 import dill
 import base64
 import httpx
-from typing import Any, List, Dict, Optional, Type, Union
+from typing import Any, AsyncIterator, List, Dict, Optional, Type, Union
 from pydantic import BaseModel
 
 from ..tasks.tasks import Task
@@ -21,7 +21,7 @@ from ..tasks.task_response import ObjectResponse
 
 from ..language import Language
 
-from ..level_utilized.utility import context_serializer, response_format_serializer, tools_serializer, response_format_deserializer, error_handler
+from ..level_utilized.utility import context_serializer, response_format_serializer, tools_serializer, response_format_deserializer, error_handler, is_retryable_error
 
 class Call:
 
@@ -33,54 +33,7 @@ class Call:
         retry: int = 3
     ) -> Any:
         
-        start_time = time.time()
-
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # If there's a running loop, run the async function in that loop
-                    if isinstance(task, list):
-                        for each in task:
-                            the_result = asyncio.run_coroutine_threadsafe(self.call_async_(each, llm_model, retry), loop).result()
-                            call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-                    else:
-                        the_result = asyncio.run_coroutine_threadsafe(self.call_async_(task, llm_model, retry), loop).result()
-                        call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-                else:
-                    # If there's a loop but it's not running, use asyncio.run
-                    if isinstance(task, list):
-                        for each in task:
-                            the_result = asyncio.run(self.call_async_(each, llm_model, retry))
-                            call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-                    else:
-                        the_result = asyncio.run(self.call_async_(task, llm_model, retry))
-                        call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-            except RuntimeError:
-                # No event loop exists, create one with asyncio.run
-                if isinstance(task, list):
-                    for each in task:
-                        the_result = asyncio.run(self.call_async_(each, llm_model, retry))
-                        call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-                else:
-                    the_result = asyncio.run(self.call_async_(task, llm_model, retry))
-                    call_end(the_result["result"], the_result["llm_model"], the_result["response_format"], start_time, time.time(), the_result["usage"], self.debug)
-        except Exception as outer_e:
-            try:
-                from ...server import stop_dev_server, stop_main_server, is_tools_server_running, is_main_server_running
-
-                if is_tools_server_running() or is_main_server_running():
-                    stop_dev_server()
-
-            except Exception:
-                pass
-
-            raise outer_e
-
-        end_time = time.time()
-
-        return task.response
+        return self.run_sync(self.call_async(task, llm_model, retry))
 
     def call_(
         self,
@@ -100,18 +53,7 @@ class Call:
         Returns:
             The response in the specified format
         """
-        # Try to get the current event loop
-        try:
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the async function in that loop
-                return asyncio.run_coroutine_threadsafe(self.call_async_(task, llm_model, retry), loop).result()
-            else:
-                # If there's a loop but it's not running, use asyncio.run
-                return asyncio.run(self.call_async_(task, llm_model, retry))
-        except RuntimeError:
-            # No event loop exists, create one with asyncio.run
-            return asyncio.run(self.call_async_(task, llm_model, retry))
+        return self.run_sync(self.call_async_(task, llm_model, retry))
 
     async def call_async(
         self,
@@ -166,10 +108,12 @@ class Call:
         tools = tools_serializer(task.tools)
 
         response_format = task.response_format
+        # Send pickles as raw binary frames when the server supports them
+        framed = self.binary_transport
         with sentry_sdk.start_transaction(op="task", name="Call.call_async") as transaction:
             with sentry_sdk.start_span(op="serialize"):
                 # Serialize the response format if it's a type or BaseModel
-                response_format_str = response_format_serializer(task.response_format)
+                response_format_str = response_format_serializer(task.response_format, raw=framed)
 
                 new_context = []
                 if task.context:
@@ -180,7 +124,7 @@ class Call:
                         else:
                             new_context.append(each)
 
-                context = context_serializer(new_context, self)
+                context = context_serializer(new_context, self, raw=framed)
 
             with sentry_sdk.start_span(op="prepare_request"):
                 # Prepare the request data
@@ -198,7 +142,7 @@ class Call:
             while True:
                 try:
                     with sentry_sdk.start_span(op="send_request"):
-                        result = await self.send_request_async("/level_one/gpt4o", data)
+                        result = await self.send_request_async("/level_one/gpt4o", data, framed=framed)
                         original_result = result
                         
                         result = result["result"]
@@ -245,5 +189,107 @@ class Call:
         
         return {"result": deserialized_result["result"], "llm_model": llm_model, "response_format": response_format_req, "usage": deserialized_result["usage"], "tool_usage": deserialized_result["tool_usage"]}
 
+    async def call_stream_async(
+        self,
+        task: Task,
+        llm_model: str = None,
+        retry: int = 3
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of call_async_, yielding the events of the run as they arrive.
+
+        Failed requests and server errors with a retryable status code are
+        only retried until the first event arrives, since the events yielded
+        before a failure can't be taken back. Other server errors are raised
+        at once.
 
+        Args:
+            task: The task to run
+            llm_model: Optional model overriding the client's default
+            retry: Number of retries for failed calls (default: 3)
+
+        Yields:
+            Event dicts with a "type" of "text_delta", "tool_call", "tool_result"
+            or, last, "result" with the deserialized result, usage and tool_usage.
+            The task's response is set before the result event is yielded.
+
+        Raises:
+            CallErrorException: If the server reports an error
+        """
+        from ..level_utilized.utility import CallErrorException
+        from ..printing import agent_retry
 
+        start_time = time.time()
+        task.start_time = start_time
+
+        if llm_model is None:
+            llm_model = self.default_llm_model
+
+        tools = tools_serializer(task.tools)
+        response_format = task.response_format
+        response_format_str = response_format_serializer(task.response_format)
+
+        new_context = []
+        if task.context:
+            for each in task.context:
+                if isinstance(each, KnowledgeBase):
+                    if not each.rag:
+                        new_context.append(each.markdown(self))
+                else:
+                    new_context.append(each)
+
+        data = {
+            "prompt": task.description + await task.additional_description(self),
+            "images": task.images_base_64,
+            "response_format": response_format_str,
+            "tools": tools or [],
+            "context": context_serializer(new_context, self),
+            "llm_model": llm_model,
+            "system_prompt": None
+        }
+
+        retry_count = 0
+        while True:
+            started = False
+            # Set once the server has reported an error, which is raised as it is
+            reported = False
+            try:
+                async for event in self.stream_events_async("/level_one/gpt4o/stream", data):
+                    if event["type"] == "error":
+                        result = event["result"]
+                        if not started and is_retryable_error(result) and retry > 0 and retry_count < retry:
+                            break
+                        reported = True
+                        if isinstance(result, dict) and "status_code" in result:
+                            # Raises the exception of errors like a missing API key
+                            error_handler(result)
+                        raise CallErrorException(result)
+
+                    if event["type"] == "result":
+                        deserialized_result = response_format_deserializer(response_format_str, event["result"])
+                        task._response = deserialized_result["result"]
+                        if task.response_lang:
+                            language = Language(task.response_lang, task, llm_model)
+                            task._response = await language.transform()
+                        task.end_time = time.time()
+
+                        response_format_req = response_format_str if response_format_str == "str" else response_format.__name__
+                        call_end(task._response, llm_model, response_format_req, start_time, task.end_time, deserialized_result["usage"], deserialized_result["tool_usage"], self.debug)
+                        event = {
+                            "type": "result",
+                            "result": task._response,
+                            "usage": deserialized_result["usage"],
+                            "tool_usage": deserialized_result["tool_usage"]
+                        }
+
+                    started = True
+                    yield event
+                else:
+                    return
+            except CallErrorException:
+                raise
+            except Exception:
+                if reported or started or retry <= 0 or retry_count >= retry:
+                    raise
+            retry_count += 1
+            agent_retry(retry_count, retry)
@@ -8,7 +8,7 @@ import dill
 import base64
 import httpx
 import hashlib
-from typing import Any, List, Dict, Optional, Type, Union, Literal
+from typing import Any, AsyncIterator, List, Dict, Optional, Type, Union, Literal
 from pydantic import BaseModel
 import uuid
 
@@ -23,9 +23,9 @@ from ..agent_configuration.agent_configuration import AgentConfiguration
 
 from ..level_utilized.utility import context_serializer
 
-from ..level_utilized.utility import context_serializer, response_format_serializer, tools_serializer, response_format_deserializer, error_handler
+from ..level_utilized.utility import context_serializer, response_format_serializer, tools_serializer, response_format_deserializer, error_handler, is_retryable_error
 
-from ...storage.caching import save_to_cache_with_expiry, get_from_cache_with_expiry
+from ...storage.caching import get_or_compute_with_expiry_async
 
 from ..tools.tools import Search
 
@@ -78,23 +78,7 @@ class Agent:
         task: Task,
         llm_model: str = None,
     ) -> Any:
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.agent_async_(agent_configuration, task, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.agent_async_(agent_configuration, task, llm_model))
+        return self.run_sync(self.agent_async_(agent_configuration, task, llm_model))
 
     def send_agent_request(
         self,
@@ -116,99 +100,22 @@ class Agent:
         Returns:
             The response in the specified format
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.send_agent_request_async(agent_configuration, task, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.send_agent_request_async(agent_configuration, task, llm_model))
+        return self.run_sync(self.send_agent_request_async(agent_configuration, task, llm_model))
 
     def create_characterization(self, agent_configuration: AgentConfiguration, llm_model: str = None, price_id: str = None):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.create_characterization_async(agent_configuration, llm_model, price_id), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.create_characterization_async(agent_configuration, llm_model, price_id))
+        return self.run_sync(self.create_characterization_async(agent_configuration, llm_model, price_id))
 
     def agent(self, agent_configuration: AgentConfiguration, task: Task,  llm_model: str = None):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.agent_async(agent_configuration, task, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.agent_async(agent_configuration, task, llm_model))
+        return self.run_sync(self.agent_async(agent_configuration, task, llm_model))
 
     def multiple(self, agent_configuration: AgentConfiguration, task: Task, llm_model: str = None):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.multiple_async(agent_configuration, task, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.multiple_async(agent_configuration, task, llm_model))
+        return self.run_sync(self.multiple_async(agent_configuration, task, llm_model))
 
     def multi_agent(self, agent_configurations: List[AgentConfiguration], tasks: Any, llm_model: str = None):
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.multi_agent_async(agent_configurations, tasks, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.multi_agent_async(agent_configurations, tasks, llm_model))
+        return self.run_sync(self.multi_agent_async(agent_configurations, tasks, llm_model))
+
+    def agent_batch(self, agent_configuration: AgentConfiguration, tasks: List[Task], llm_model: str = None, max_concurrency: int = 8):
+        return self.run_sync(self.agent_batch_list_async(agent_configuration, tasks, llm_model, max_concurrency))
 
     async def multi_agent_async(self, agent_configurations: List[AgentConfiguration], tasks: Any, llm_model: str = None):
         """
@@ -267,16 +174,10 @@ class Agent:
 
         return the_agents
 
-    async def agent_async(self, agent_configuration: AgentConfiguration, task: Task, llm_model: str = None):
+    async def get_characterization_async(self, agent_configuration: AgentConfiguration, llm_model: str = None, price_id: str = None):
         """
-        Asynchronous version of the agent method.
+        Return the characterization used as the agent's context, from the cache when enabled.
         """
-        original_task = task
-        original_task.start_time = time.time()
-        
-        if llm_model is None:
-            llm_model = agent_configuration.model
-
         copy_agent_configuration = copy.deepcopy(agent_configuration)
         copy_agent_configuration_json = copy_agent_configuration.model_dump_json(include={"job_title", "company_url", "company_objective", "name", "contact"})
         
@@ -287,12 +188,28 @@ class Agent:
         elif llm_model and llm_model.startswith("ollama"):
             the_characterization = agent_configuration.system_prompt if agent_configuration.system_prompt else agent_configuration.name
         elif agent_configuration.caching:
-            the_characterization = get_from_cache_with_expiry(the_characterization_cache_key)
-            if the_characterization is None:
-                the_characterization = await self.create_characterization_async(agent_configuration, llm_model, task.price_id)
-                save_to_cache_with_expiry(the_characterization, the_characterization_cache_key, agent_configuration.cache_expiry)
+            # Tasks started together for one configuration share a single characterization
+            the_characterization = await get_or_compute_with_expiry_async(
+                the_characterization_cache_key,
+                lambda: self.create_characterization_async(agent_configuration, llm_model, price_id),
+                agent_configuration.cache_expiry,
+            )
         else:
-            the_characterization = await self.create_characterization_async(agent_configuration, llm_model, task.price_id)
+            the_characterization = await self.create_characterization_async(agent_configuration, llm_model, price_id)
+
+        return the_characterization
+
+    async def agent_async(self, agent_configuration: AgentConfiguration, task: Task, llm_model: str = None):
+        """
+        Asynchronous version of the agent method.
+        """
+        original_task = task
+        original_task.start_time = time.time()
+        
+        if llm_model is None:
+            llm_model = agent_configuration.model
+
+        the_characterization = await self.get_characterization_async(agent_configuration, llm_model, task.price_id)
 
         knowledge_base = None
         if agent_configuration.knowledge_base:
@@ -439,6 +356,279 @@ class Agent:
 
         return results
 
+    async def agent_batch_async(
+        self,
+        agent_configuration: AgentConfiguration,
+        tasks: List[Task],
+        llm_model: str = None,
+        max_concurrency: int = 8,
+    ) -> AsyncIterator[Task]:
+        """
+        Run many tasks for one agent in a single request, yielding each task as it completes.
+
+        The characterization is created once, the server builds the model and
+        tools once and runs the tasks concurrently, and results stream back in
+        completion order. Tasks that fail with a retriable error are retried on
+        their own through the regular agent endpoint. Sub-task decomposition is
+        not applied in batch mode.
+
+        Args:
+            agent_configuration: The agent that runs every task
+            tasks: The tasks to run
+            llm_model: Optional model overriding the agent's model
+            max_concurrency: Maximum number of tasks the server runs at once
+
+        Yields:
+            Each task, with its response set, in completion order
+        """
+        from ..trace import sentry_sdk
+
+        if llm_model is None:
+            llm_model = agent_configuration.model
+        if llm_model is None:
+            llm_model = self.default_llm_model
+
+        if not tasks:
+            return
+
+        start_time = time.time()
+        the_characterization = await self.get_characterization_async(agent_configuration, llm_model, tasks[0].price_id)
+
+        tool_names = []
+        for each in ([agent_configuration.tools] if agent_configuration.tools else [task.tools for task in tasks]):
+            for name in tools_serializer(each or []):
+                if name not in tool_names:
+                    tool_names.append(name)
+
+        response_format_strs = []
+        data_tasks = []
+        with sentry_sdk.start_transaction(op="task", name="Agent.agent_batch_async") as transaction:
+            with sentry_sdk.start_span(op="serialize"):
+                for task in tasks:
+                    task.start_time = start_time
+                    if agent_configuration.tools:
+                        task.tools = agent_configuration.tools
+
+                    # Same context as a single agent run, so retries can reuse the task as is
+                    task.context = list(task.context) if isinstance(task.context, list) else ([task.context] if task.context else [])
+                    task.context.append(the_characterization)
+                    if agent_configuration.knowledge_base:
+                        task.context.append(agent_configuration.knowledge_base)
+
+                    new_context = []
+                    for each in task.context:
+                        if isinstance(each, KnowledgeBase):
+                            if not each.rag:
+                                new_context.append(each.markdown(self))
+                        else:
+                            new_context.append(each)
+
+                    response_format_str = response_format_serializer(task.response_format)
+                    response_format_strs.append(response_format_str)
+                    data_tasks.append({
+                        "prompt": task.description + await task.additional_description(self),
+                        "images": task.images_base_64,
+                        "response_format": response_format_str,
+                        "context": context_serializer(new_context, self),
+                    })
+
+            data = {
+                "agent_id": agent_configuration.agent_id,
+                "tasks": data_tasks,
+                "tools": tool_names,
+                "llm_model": llm_model,
+                "system_prompt": None,
+                "context_compress": agent_configuration.context_compress,
+                "memory": agent_configuration.memory,
+                "max_concurrency": max_concurrency,
+                "parallel_tool_calls": agent_configuration.parallel_tool_calls,
+                "memory_budget": agent_configuration.memory_budget,
+            }
+
+            total_input_tokens = 0
+            total_output_tokens = 0
+            async for line in self.stream_request_async("/level_two/agent/batch", data):
+                index = line["index"]
+                result = line["result"]
+                task = tasks[index]
+
+                if error_handler(result):
+                    # Retriable errors go through the single task path and its retry loop
+                    the_result = await self.send_agent_request_async(agent_configuration, task, llm_model)
+                    usage = the_result["usage"]
+                else:
+                    deserialized_result = response_format_deserializer(response_format_strs[index], result)
+                    processed_result = await ReliabilityProcessor.process_result(
+                        deserialized_result["result"],
+                        agent_configuration.reliability_layer,
+                        task,
+                        llm_model
+                    )
+                    task._response = processed_result
+
+                    if task.response_lang:
+                        language = Language(task.response_lang, task, llm_model)
+                        task._response = await language.transform()
+
+                    usage = deserialized_result["usage"]
+
+                    if self.debug:
+                        response_format_req = "str" if response_format_strs[index] == "str" else task.response_format.__name__
+                        agent_end(task.response, llm_model, response_format_req, start_time, time.time(),
+                                  usage, deserialized_result["tool_usage"], len(tool_names),
+                                  len(task.context), self.debug, task.price_id)
+
+                if usage is not None:
+                    total_input_tokens += usage.get("input_tokens", 0)
+                    total_output_tokens += usage.get("output_tokens", 0)
+
+                task.end_time = time.time()
+                yield task
+
+        agent_total_cost(total_input_tokens, total_output_tokens, time.time() - start_time, llm_model)
+
+    async def agent_batch_list_async(
+        self,
+        agent_configuration: AgentConfiguration,
+        tasks: List[Task],
+        llm_model: str = None,
+        max_concurrency: int = 8,
+    ) -> List[Any]:
+        """
+        Run many tasks for one agent in a single request and return their responses in input order.
+        """
+        async for _ in self.agent_batch_async(agent_configuration, tasks, llm_model, max_concurrency):
+            pass
+        return [task.response for task in tasks]
+
+    async def agent_stream_async(
+        self,
+        agent_configuration: AgentConfiguration,
+        task: Task,
+        llm_model: str = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a task with an agent, yielding the events of the run as they arrive.
+
+        The task gets the same characterization and knowledge base context as
+        agent_async, but isn't split into sub-tasks, so its whole answer is
+        streamed. Failed requests and server errors with a retryable status
+        code are only retried until the first event arrives, since the events
+        yielded before a failure can't be taken back. Other server errors are
+        raised at once.
+
+        Args:
+            agent_configuration: The agent that runs the task
+            task: The task to run
+            llm_model: Optional model overriding the agent's model
+
+        Yields:
+            Event dicts with a "type" of "text_delta", "tool_call", "tool_result"
+            or, last, "result" with the processed result, usage and tool_usage.
+            The task's response is set before the result event is yielded.
+
+        Raises:
+            CallErrorException: If the server reports an error
+        """
+        from ..level_utilized.utility import CallErrorException
+
+        start_time = time.time()
+        task.start_time = start_time
+
+        if llm_model is None:
+            llm_model = agent_configuration.model
+        if llm_model is None:
+            llm_model = self.default_llm_model
+
+        the_characterization = await self.get_characterization_async(agent_configuration, llm_model, task.price_id)
+
+        if agent_configuration.tools:
+            task.tools = agent_configuration.tools
+        task.context = list(task.context) if isinstance(task.context, list) else ([task.context] if task.context else [])
+        task.context.append(the_characterization)
+        if agent_configuration.knowledge_base:
+            task.context.append(agent_configuration.knowledge_base)
+
+        new_context = []
+        for each in task.context:
+            if isinstance(each, KnowledgeBase):
+                if not each.rag:
+                    new_context.append(each.markdown(self))
+            else:
+                new_context.append(each)
+
+        tools = tools_serializer(task.tools)
+        response_format = task.response_format
+        response_format_str = response_format_serializer(task.response_format)
+        data = {
+            "agent_id": agent_configuration.agent_id,
+            "prompt": task.description + await task.additional_description(self),
+            "images": task.images_base_64,
+            "response_format": response_format_str,
+            "tools": tools or [],
+            "context": context_serializer(new_context, self),
+            "llm_model": llm_model,
+            "system_prompt": None,
+            "context_compress": agent_configuration.context_compress,
+            "memory": agent_configuration.memory,
+            "parallel_tool_calls": agent_configuration.parallel_tool_calls,
+            "memory_budget": agent_configuration.memory_budget
+        }
+
+        retry = agent_configuration.retry
+        retry_count = 0
+        while True:
+            started = False
+            # Set once the server has reported an error, which is raised as it is
+            reported = False
+            try:
+                async for event in self.stream_events_async("/level_two/agent/stream", data):
+                    if event["type"] == "error":
+                        result = event["result"]
+                        if not started and is_retryable_error(result) and retry > 0 and retry_count < retry:
+                            break
+                        reported = True
+                        if isinstance(result, dict) and "status_code" in result:
+                            # Raises the exception of errors like a missing API key
+                            error_handler(result)
+                        raise CallErrorException(result)
+
+                    if event["type"] == "result":
+                        deserialized_result = response_format_deserializer(response_format_str, event["result"])
+                        task._response = await ReliabilityProcessor.process_result(
+                            deserialized_result["result"],
+                            agent_configuration.reliability_layer,
+                            task,
+                            llm_model
+                        )
+                        if task.response_lang:
+                            language = Language(task.response_lang, task, llm_model)
+                            task._response = await language.transform()
+                        task.end_time = time.time()
+
+                        response_format_req = response_format_str if response_format_str == "str" else response_format.__name__
+                        agent_end(task.response, llm_model, response_format_req, start_time, task.end_time,
+                                  deserialized_result["usage"], deserialized_result["tool_usage"], len(tools),
+                                  len(task.context), self.debug, task.price_id)
+                        event = {
+                            "type": "result",
+                            "result": task.response,
+                            "usage": deserialized_result["usage"],
+                            "tool_usage": deserialized_result["tool_usage"]
+                        }
+
+                    started = True
+                    yield event
+                else:
+                    return
+            except CallErrorException:
+                raise
+            except Exception:
+                if reported or started or retry <= 0 or retry_count >= retry:
+                    raise
+            retry_count += 1
+            agent_retry(retry_count, retry)
+
     async def send_agent_request_async(
         self,
         agent_configuration: AgentConfiguration,
@@ -456,11 +646,13 @@ class Agent:
 
         tools = tools_serializer(task.tools)
         response_format = task.response_format
+        # Send pickles as raw binary frames when the server supports them
+        framed = self.binary_transport
         
         with sentry_sdk.start_transaction(op="task", name="Agent.send_agent_request_async") as transaction:
             with sentry_sdk.start_span(op="serialize"):
                 # Serialize the response format if it's a type or BaseModel
-                response_format_str = response_format_serializer(task.response_format)
+                response_format_str = response_format_serializer(task.response_format, raw=framed)
 
             new_context = []
             if task.context:
@@ -471,7 +663,7 @@ class Agent:
                     else:
                         new_context.append(each)
 
-                context = context_serializer(new_context, self)
+                context = context_serializer(new_context, self, raw=framed)
             else:
                 context = None
 
@@ -487,7 +679,9 @@ class Agent:
                     "llm_model": llm_model,
                     "system_prompt": None,
                     "context_compress": agent_configuration.context_compress,
-                    "memory": agent_configuration.memory
+                    "memory": agent_configuration.memory,
+                    "parallel_tool_calls": agent_configuration.parallel_tool_calls,
+                    "memory_budget": agent_configuration.memory_budget
                 }
 
             retry_count = 0
@@ -495,7 +689,7 @@ class Agent:
                 try:
                     with sentry_sdk.start_span(op="send_request"):
                         # Send the request asynchronously
-                        result = await self.send_request_async("/level_two/agent", data)
+                        result = await self.send_request_async("/level_two/agent", data, framed=framed)
                         result = result["result"]
                         
                         if error_handler(result):  # If it's a retriable error
@@ -750,22 +944,6 @@ Tool Availability Impact:
         """
         Synchronous version of the call method that uses the async version internally.
         """
-        import asyncio
-        
-        try:
-            # Check if there's a running event loop
-            loop = asyncio.get_running_loop()
-            if loop.is_running():
-                # If there's a running loop, run the coroutine in that loop
-                return asyncio.run_coroutine_threadsafe(
-                    self.call_async(task, llm_model), 
-                    loop
-                ).result()
-        except RuntimeError:
-            # No running event loop
-            pass
-        
-        # If no running loop or exception occurred, create a new one
-        return asyncio.run(self.call_async(task, llm_model))
+        return self.run_sync(self.call_async(task, llm_model))
 
 
@@ -1,4 +1,7 @@
 import copy
+import hashlib
+import threading
+import weakref
 from datetime import datetime
 import dill
 import cloudpickle
@@ -24,7 +27,7 @@ def serialize_context(context, client):
     
     return context
 
-def context_serializer(context, client):
+def context_serializer(context, client, raw=False):
 
     if context is None:
         context = []
@@ -58,6 +61,9 @@ def context_serializer(context, client):
 
 
     pickled_context = cloudpickle.dumps(copy_of_context)
+    if raw:
+        # Binary frames carry the pickle as it is
+        return pickled_context
     context = base64.b64encode(pickled_context).decode("utf-8")
 
 
@@ -65,16 +71,160 @@ def context_serializer(context, client):
 
 
 
-def response_format_serializer(response_format):
+# Encoded blobs for response formats and tool functions, computed once per process.
+# Keys are weak so classes and functions that go away drop out on their own.
+_serialized_by_value = weakref.WeakKeyDictionary()
+_serialized_by_value_lock = threading.Lock()
+
+
+# Values of closure cells and globals described by their repr, anything else by its type
+_PLAIN_TYPES = (str, bytes, int, float, complex, bool, type(None))
+# Groups of pydantic's __pydantic_decorators__ holding validators and serializers
+_PYDANTIC_DECORATOR_GROUPS = (
+    "validators", "field_validators", "root_validators", "field_serializers",
+    "model_serializers", "model_validators", "computed_fields",
+)
+
+
+def _definition_hash(obj) -> str:
+    """
+    Hash the parts of a class or function definition that end up in its pickle.
+
+    A function is described by its code, defaults, closure cells and the globals
+    its code reads; a class by its fields, methods and pydantic validators.
+    Functions and classes found along the way are described the same way.
+    """
+    return hashlib.sha256("\0".join(_definition_parts(obj, set())).encode("utf-8")).hexdigest()
+
+
+def _definition_parts(obj, seen: set) -> list:
+    parts = [str(getattr(obj, "__module__", "")), str(getattr(obj, "__qualname__", ""))]
+    if id(obj) in seen:
+        # Recursive functions and classes referring to themselves
+        return parts
+    seen.add(id(obj))
+
+    code = getattr(obj, "__code__", None)
+    if code is not None:
+        parts += _code_parts(code)
+        parts += [repr(getattr(obj, "__defaults__", None)), repr(getattr(obj, "__kwdefaults__", None))]
+        for cell in getattr(obj, "__closure__", None) or ():
+            try:
+                parts.append(_value_part(cell.cell_contents, seen))
+            except ValueError:
+                # A cell whose variable isn't assigned yet
+                parts.append("<empty>")
+        func_globals = getattr(obj, "__globals__", {})
+        for name in sorted(_global_names(code)):
+            if name in func_globals:
+                parts.append(f"{name}={_value_part(func_globals[name], seen)}")
+
+    fields = getattr(obj, "model_fields", None)
+    if isinstance(fields, dict):
+        parts += [f"{name}:{field.annotation!r}:{field.default!r}" for name, field in fields.items()]
+
+    if isinstance(obj, type):
+        for name, value in sorted(vars(obj).items()):
+            function = getattr(value, "__func__", value)
+            if hasattr(function, "__code__"):
+                parts += [name, *_definition_parts(function, seen)]
+        decorators = getattr(obj, "__pydantic_decorators__", None)
+        for group in _PYDANTIC_DECORATOR_GROUPS:
+            for name, decorator in sorted(getattr(decorators, group, {}).items()):
+                function = getattr(decorator.func, "__func__", decorator.func)
+                parts += [f"{group}.{name}", repr(decorator.info), *_definition_parts(function, seen)]
+    return parts
+
+
+def _code_parts(code) -> list:
+    # Names of attributes and globals, e.g. value.strip() and value.lower() only differ there
+    parts = [code.co_code.hex(), repr(code.co_names)]
+    for const in code.co_consts:
+        # Nested functions, lambdas and comprehensions, whose repr holds their address
+        parts += _code_parts(const) if hasattr(const, "co_code") else [_const_repr(const)]
+    return parts
+
+
+def _const_repr(value) -> str:
+    if isinstance(value, frozenset):
+        # Its order depends on string hashing, which changes between processes
+        return "frozenset(" + ",".join(sorted(_const_repr(each) for each in value)) + ")"
+    if isinstance(value, tuple):
+        return "(" + ",".join(_const_repr(each) for each in value) + ")"
+    return repr(value)
+
+
+def _global_names(code) -> set:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            names |= _global_names(const)
+    return names
+
+
+def _value_part(value, seen: set) -> str:
+    if isinstance(value, _PLAIN_TYPES):
+        return repr(value)
+    if isinstance(value, type) or hasattr(value, "__code__"):
+        return ":".join(_definition_parts(value, seen))
+    if isinstance(value, type(hashlib)):
+        return f"module:{value.__name__}"
+    if isinstance(value, (tuple, frozenset)) and all(isinstance(each, _PLAIN_TYPES) for each in value):
+        return _const_repr(value)
+    # Other objects may be large and their repr may hold their address, which
+    # changes between processes, so their contents are not part of the hash
+    return f"{type(value).__module__}.{type(value).__qualname__}"
+
+
+def _dumps_by_value(obj) -> bytes:
+    the_module = dill.detect.getmodule(obj)
+    if the_module is not None:
+        cloudpickle.register_pickle_by_value(the_module)
+    return cloudpickle.dumps(obj)
+
+
+def serialize_by_value(obj, key=None, raw=False):
+    """
+    Cloudpickle and base64 encode an object, reusing the blob for repeated calls.
+
+    Entries are keyed by the identity of ``key`` (``obj`` itself by default) and
+    checked against a hash of its definition, so a redefined class or function
+    is encoded again. Objects that cannot be weakly referenced are not cached.
+
+    Args:
+        obj: The class or function to serialize
+        key: The object whose identity and definition identify ``obj``
+        raw: Whether to return the raw pickle instead of its base64 encoding
+
+    Returns:
+        The base64 encoded pickle of ``obj``, or the pickle itself when raw
+    """
+    key = obj if key is None else key
+    fingerprint = (getattr(obj, "__name__", None), _definition_hash(key))
+
+    try:
+        with _serialized_by_value_lock:
+            cached = _serialized_by_value.get(key)
+    except TypeError:
+        cached = None
+        key = None
+
+    if cached is None or cached[0] != fingerprint:
+        pickled = _dumps_by_value(obj)
+        cached = (fingerprint, pickled, base64.b64encode(pickled).decode("utf-8"))
+        if key is not None:
+            with _serialized_by_value_lock:
+                _serialized_by_value[key] = cached
+
+    return cached[1] if raw else cached[2]
+
+
+def response_format_serializer(response_format, raw=False):
     if response_format is None:
         response_format_str = "str"
     elif isinstance(response_format, (type, BaseModel)):
         # If it's a Pydantic model or other type, cloudpickle and base64 encode it
-        the_module = dill.detect.getmodule(response_format)
-        if the_module is not None:
-            cloudpickle.register_pickle_by_value(the_module)
-        pickled_format = cloudpickle.dumps(response_format)
-        response_format_str = base64.b64encode(pickled_format).decode("utf-8")
+        response_format_str = serialize_by_value(response_format, raw=raw)
     else:
         response_format_str = "str"
 
@@ -83,7 +233,9 @@ def response_format_serializer(response_format):
 
 def response_format_deserializer(response_format_str, result):
     if response_format_str != "str":
-        decoded_result = base64.b64decode(result["result"])
+        decoded_result = result["result"]
+        if not isinstance(decoded_result, bytes):
+            decoded_result = base64.b64decode(decoded_result)
         deserialized_result = cloudpickle.loads(decoded_result)
     else:
         deserialized_result = result["result"]
@@ -112,6 +264,15 @@ def tools_serializer(tools_):
 
 
 
+# Status codes of server errors that may go away when the request is sent again
+RETRYABLE_STATUS_CODES = (500,)
+
+
+def is_retryable_error(result) -> bool:
+    """Whether the server reported an error that may go away when the request is sent again."""
+    return isinstance(result, dict) and result.get("status_code") in RETRYABLE_STATUS_CODES
+
+
 def error_handler(result):
     if result["status_code"] == 401:
         error_message("API Key Error", result["detail"], 401)
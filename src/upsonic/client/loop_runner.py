@@ -0,0 +1,124 @@
+import asyncio
+import concurrent.futures
+import threading
+
+
+# Helper function to run a coroutine in a new thread with a new event loop
+def run_coroutine_in_new_thread(coro):
+    """
+    Run a coroutine in a new thread with a new event loop.
+    This is useful when we're in an async context but need a synchronous result.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The result of the coroutine
+    """
+    def run_coro_in_thread(coro):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_coro_in_thread, coro).result()
+
+
+class LoopRunner:
+    """
+    Owns a single event loop running forever in a background daemon thread.
+
+    Sync code submits coroutines into it instead of creating and tearing down
+    a loop per call, so anything bound to the loop (connection pools, futures
+    used for caching) survives between calls.
+    """
+
+    def __init__(self, name: str = "upsonic-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                started.set()
+                try:
+                    loop.run_forever()
+                finally:
+                    # Give pending tasks a chance to finish their cleanup
+                    pending = asyncio.all_tasks(loop)
+                    for task in pending:
+                        task.cancel()
+                    if pending:
+                        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                    loop.run_until_complete(loop.shutdown_asyncgens())
+                    loop.close()
+
+            thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's event loop, started on first use."""
+        return self._ensure_started()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_runner_thread(self) -> bool:
+        """Whether the caller is executing on the runner's own thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro, timeout: float = None):
+        """
+        Run a coroutine on the runner loop and block until it finishes.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Optional number of seconds to wait for the result
+
+        Returns:
+            The result of the coroutine
+        """
+        if self.in_runner_thread():
+            # Blocking the runner thread on its own loop would deadlock, so a
+            # sync call made from inside a coroutine gets a throwaway loop.
+            return run_coroutine_in_new_thread(coro)
+
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runner loop without waiting for it."""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop and wait for the background thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        if threading.current_thread() is not thread:
+            thread.join(timeout)
@@ -50,20 +50,7 @@ class Storage:
         Returns:
             The configuration value
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    from ..base import run_coroutine_in_new_thread
-                    return run_coroutine_in_new_thread(self.get_config_async(key))
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.get_config_async(key))
-        except Exception as e:
-            raise e
+        return self.run_sync(self.get_config_async(key))
 
     async def get_config_async(self, key: str) -> Any:
         """
@@ -93,20 +80,7 @@ class Storage:
         Returns:
             A success message
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    from ..base import run_coroutine_in_new_thread
-                    return run_coroutine_in_new_thread(self.set_config_async(key, value))
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.set_config_async(key, value))
-        except Exception as e:
-            raise e
+        return self.run_sync(self.set_config_async(key, value))
 
     async def set_config_async(self, key: str, value: str) -> str:
         """
@@ -136,20 +110,7 @@ class Storage:
         Returns:
             A success message
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    from ..base import run_coroutine_in_new_thread
-                    return run_coroutine_in_new_thread(self.bulk_set_config_async(configs))
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.bulk_set_config_async(configs))
-        except Exception as e:
-            raise e
+        return self.run_sync(self.bulk_set_config_async(configs))
 
     async def bulk_set_config_async(self, configs: Dict[str, str]) -> str:
         """
@@ -175,20 +136,7 @@ class Storage:
         Args:
             config: ClientConfig object with configuration values
         """
-        try:
-            # Try to get the current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop.is_running():
-                    # We're in an async context, but this is a sync method
-                    # We need to run the async method in a new thread
-                    from ..base import run_coroutine_in_new_thread
-                    return run_coroutine_in_new_thread(self.config_async(config))
-            except RuntimeError:
-                # No event loop is running, use asyncio.run
-                return asyncio.run(self.config_async(config))
-        except Exception as e:
-            raise e
+        return self.run_sync(self.config_async(config))
 
     async def config_async(self, config: ClientConfig):
         """
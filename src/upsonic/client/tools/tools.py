@@ -1,7 +1,7 @@
 import inspect
 import cloudpickle
 
-from ..level_utilized.utility import error_handler
+from ..level_utilized.utility import error_handler, serialize_by_value
 cloudpickle.DEFAULT_PROTOCOL = 2
 import dill
 import base64
@@ -66,14 +66,24 @@ def generate_static_method_class(instance):
     return TransformedClass
 
 class Tools:
-    def tool(self, library: Optional[Union[str, List[str]]] = None):
+    def tool(
+        self,
+        library: Optional[Union[str, List[str]]] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+        executor: str = "thread",
+    ):
         """
         Decorator to register a function or class as a tool.
         Can be used as @tool(), @tool("pandas"), or @tool(["pandas", "numpy"])
 
         Args:
             library: Optional library name or list of library names to install before registering the tool
+            max_concurrency: Optional maximum number of calls of each registered tool running at once
+            timeout: Seconds a tool call may run before the tools server cancels it
+            executor: "thread", or "process" for CPU-heavy tools that must be stoppable
         """
+        settings = {"max_concurrency": max_concurrency, "timeout": timeout, "executor": executor}
         def decorator(obj: Union[Callable, Type]):
             # Install libraries first if specified
             if library:
@@ -108,7 +118,7 @@ class Tools:
                     
                     full_name = f"{class_name}__{name}"
                     standalone = create_standalone(method, full_name)
-                    self.add_tool(standalone)
+                    self.add_tool(standalone, **settings)
                 
                 return obj
             
@@ -136,7 +146,7 @@ class Tools:
                     
                     full_name = f"{obj.__name__}__{name}"
                     standalone = create_standalone(method, full_name)
-                    self.add_tool(standalone)
+                    self.add_tool(standalone, **settings)
                 
             else:
                 # Register the function as a tool
@@ -149,7 +159,7 @@ class Tools:
                     def wrapper(*args, **kwargs):
                         return obj(*args, **kwargs)
                 
-                self.add_tool(wrapper)
+                self.add_tool(wrapper, **settings)
                 return wrapper
                 
         return decorator
@@ -157,19 +167,21 @@ class Tools:
     def add_tool(
         self,
         function,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+        executor: str = "thread",
     ) -> Any:
-        # Get the function then make a cloudpickle of it
-        the_module = dill.detect.getmodule(function)
-        if the_module is not None:
-            cloudpickle.register_pickle_by_value(the_module)
-
-        the_dumped_function = cloudpickle.dumps(function)
-
+        # Get the function then make a cloudpickle of it. The wrappers built by
+        # tool() are new on every call, so key the cache on the wrapped function.
+        framed = self.binary_transport
         data = {
-            "function": base64.b64encode(the_dumped_function).decode("utf-8"),
+            "function": serialize_by_value(function, key=getattr(function, "__wrapped__", function), raw=framed),
+            "max_concurrency": max_concurrency,
+            "timeout": timeout,
+            "executor": executor,
         }
         
-        result = self.send_request("/tools/add_tool", data)
+        result = self.send_request("/tools/add_tool", data, framed=framed)
         return result
     
 
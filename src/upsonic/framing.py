@@ -0,0 +1,106 @@
+"""
+Length-prefixed binary frames for the client/server protocol.
+
+A frame carries a JSON header followed by raw byte parts, so pickled
+contexts, response formats, results and tool functions travel as they are
+instead of being base64 encoded into a JSON document.
+
+Layout::
+
+    magic (4 bytes) | header length (uint32, big endian) | header JSON | part 0 | part 1 | ...
+
+Every ``bytes`` value found in the payload is moved into a part and replaced
+in the header by ``{"__frame__": <index>}``; the header also lists the length
+of each part so they can be sliced back out.
+"""
+
+import json
+import struct
+from typing import Any, Callable, Optional
+
+
+FRAMES_CONTENT_TYPE = "application/x-upsonic-frames"
+
+TRANSPORT_JSON = "json"
+TRANSPORT_FRAMES = "frames"
+SUPPORTED_TRANSPORTS = [TRANSPORT_JSON, TRANSPORT_FRAMES]
+
+_MAGIC = b"UPF1"
+_PREFIX = struct.Struct(">4sI")
+_FRAME_KEY = "__frame__"
+
+
+class FrameDecodeError(ValueError):
+    """Raised when a body is not a valid frame."""
+
+
+def dumps_frames(payload: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode a JSON compatible payload whose leaves may be bytes into a frame.
+
+    Args:
+        payload: Dicts, lists, JSON scalars and bytes
+        default: Called for other objects in the header, as in json.dumps
+
+    Returns:
+        The encoded frame
+    """
+    parts = []
+
+    def extract(value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            parts.append(value)
+            return {_FRAME_KEY: len(parts) - 1}
+        if isinstance(value, dict):
+            return {key: extract(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [extract(item) for item in value]
+        return value
+
+    header = json.dumps(
+        {"payload": extract(payload), "lengths": [memoryview(part).nbytes for part in parts]},
+        default=default,
+    ).encode("utf-8")
+
+    return b"".join([_PREFIX.pack(_MAGIC, len(header)), header, *parts])
+
+
+def loads_frames(body: bytes) -> Any:
+    """
+    Decode a frame produced by ``dumps_frames``.
+
+    Args:
+        body: The encoded frame
+
+    Returns:
+        The payload with its bytes values restored
+    """
+    view = memoryview(body)
+    if len(view) < _PREFIX.size:
+        raise FrameDecodeError("Frame is too short")
+
+    magic, header_length = _PREFIX.unpack_from(view)
+    if magic != _MAGIC:
+        raise FrameDecodeError("Body is not an Upsonic frame")
+
+    offset = _PREFIX.size
+    header = json.loads(bytes(view[offset:offset + header_length]).decode("utf-8"))
+    offset += header_length
+
+    parts = []
+    for length in header["lengths"]:
+        if offset + length > len(view):
+            raise FrameDecodeError("Frame is truncated")
+        parts.append(bytes(view[offset:offset + length]))
+        offset += length
+
+    def restore(value):
+        if isinstance(value, dict):
+            if len(value) == 1 and _FRAME_KEY in value:
+                return parts[value[_FRAME_KEY]]
+            return {key: restore(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore(item) for item in value]
+        return value
+
+    return restore(header["payload"])
@@ -41,6 +41,13 @@ MODEL_SETTINGS = {
     # Add other provider settings as needed
 }
 
+# Settings used when an agent opts in to running several tool calls of a turn at once
+PARALLEL_MODEL_SETTINGS = {
+    "openai": OpenAIModelSettings(parallel_tool_calls=True),
+    "anthropic": AnthropicModelSettings(parallel_tool_calls=True),
+    "openrouter": OpenAIModelSettings(parallel_tool_calls=True),
+}
+
 # OpenAI models that don't support parallel tool calls
 OPENAI_NON_PARALLEL_MODELS = {
     "o3-mini": True,
@@ -54,6 +61,7 @@ MODEL_REGISTRY = {
         "model_name": "gpt-4o", 
         "capabilities": [],
         "pricing": {"input": 2.50, "output": 10.00},
+        "context_window": 128000,
         "required_environment_variables": ["OPENAI_API_KEY"]
     },
     "openai/gpt-4.5-preview": {
@@ -61,6 +69,7 @@ MODEL_REGISTRY = {
         "model_name": "gpt-4.5-preview", 
         "capabilities": [],
         "pricing": {"input": 75.00, "output": 150.00},
+        "context_window": 128000,
         "required_environment_variables": ["OPENAI_API_KEY"]
     },
 
@@ -69,6 +78,7 @@ MODEL_REGISTRY = {
         "model_name": "o3-mini", 
         "capabilities": [],
         "pricing": {"input": 1.1, "output": 4.4},
+        "context_window": 200000,
         "required_environment_variables": ["OPENAI_API_KEY"]
     },
     "openai/gpt-4o-mini": {
@@ -76,6 +86,7 @@ MODEL_REGISTRY = {
         "model_name": "gpt-4o-mini", 
         "capabilities": [],
         "pricing": {"input": 0.15, "output": 0.60},
+        "context_window": 128000,
         "required_environment_variables": ["OPENAI_API_KEY"]
     },
     
@@ -85,6 +96,7 @@ MODEL_REGISTRY = {
         "model_name": "gpt-4o", 
         "capabilities": [],
         "pricing": {"input": 2.50, "output": 10.00},
+        "context_window": 128000,
         "required_environment_variables": ["AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_VERSION", "AZURE_OPENAI_API_KEY"]
     },
 
@@ -93,6 +105,7 @@ MODEL_REGISTRY = {
         "model_name": "gpt-4o-mini", 
         "capabilities": [],
         "pricing":{"input": 0.15, "output": 0.60},
+        "context_window": 128000,
         "required_environment_variables": ["AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_VERSION", "AZURE_OPENAI_API_KEY"]
     },
     
@@ -102,6 +115,7 @@ MODEL_REGISTRY = {
         "model_name": "deepseek-chat", 
         "capabilities": [],
         "pricing": {"input": 0.27, "output": 1.10},
+        "context_window": 64000,
         "required_environment_variables": ["DEEPSEEK_API_KEY"]
     },
 
@@ -110,6 +124,7 @@ MODEL_REGISTRY = {
         "model_name": "gemini-2.0-flash", 
         "capabilities": [],
         "pricing": {"input": 0.10, "output": 0.40},
+        "context_window": 1048576,
         "required_environment_variables": ["GOOGLE_GLA_API_KEY"]
     },
 
@@ -118,6 +133,7 @@ MODEL_REGISTRY = {
         "model_name": "gemini-1.5-pro", 
         "capabilities": [],
         "pricing": {"input": 1.25, "output": 5.00},
+        "context_window": 2097152,
         "required_environment_variables": ["GOOGLE_GLA_API_KEY"]
     },
 
@@ -126,6 +142,7 @@ MODEL_REGISTRY = {
         "model_name": "gemini-1.5-flash", 
         "capabilities": [],
         "pricing": {"input": 0.075, "output": 0.30},
+        "context_window": 1048576,
         "required_environment_variables": ["GOOGLE_GLA_API_KEY"]
     },
     
@@ -134,6 +151,7 @@ MODEL_REGISTRY = {
         "model_name": "llama3.2", 
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 128000,
         "required_environment_variables": []
     },
 
@@ -142,6 +160,7 @@ MODEL_REGISTRY = {
         "model_name": "llama3.1:70b", 
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 128000,
         "required_environment_variables": []
     },
 
@@ -150,6 +169,7 @@ MODEL_REGISTRY = {
         "model_name": "llama3.1", 
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 128000,
         "required_environment_variables": []
     },
 
@@ -158,6 +178,7 @@ MODEL_REGISTRY = {
         "model_name": "llama3.3", 
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 128000,
         "required_environment_variables": []
     },
 
@@ -166,6 +187,7 @@ MODEL_REGISTRY = {
         "model_name": "qwen2.5", 
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 32768,
         "required_environment_variables": []
     },
 
@@ -175,6 +197,7 @@ MODEL_REGISTRY = {
         "model_name": "claude-3-5-sonnet-latest", 
         "capabilities": ["computer_use"],
         "pricing": {"input": 3.00, "output": 15.00},
+        "context_window": 200000,
         "required_environment_variables": ["ANTHROPIC_API_KEY"]
     },
     "claude/claude-3-7-sonnet": {
@@ -182,6 +205,7 @@ MODEL_REGISTRY = {
         "model_name": "claude-3-7-sonnet-latest", 
         "capabilities": ["computer_use"],
         "pricing": {"input": 3.00, "output": 15.00},
+        "context_window": 200000,
         "required_environment_variables": ["ANTHROPIC_API_KEY"]
     },
 
@@ -192,6 +216,7 @@ MODEL_REGISTRY = {
         "model_name": "us.anthropic.claude-3-5-sonnet-20241022-v2:0", 
         "capabilities": ["computer_use"],
         "pricing": {"input": 3.00, "output": 15.00},
+        "context_window": 200000,
         "required_environment_variables": ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION"]
     },
 
@@ -201,6 +226,7 @@ MODEL_REGISTRY = {
         "model_name": "anthropic/claude-3-sonnet",
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 200000,
         "required_environment_variables": ["OPENROUTER_API_KEY"]
     },
     "openrouter/meta-llama/llama-3.1-8b-instruct": {
@@ -208,6 +234,7 @@ MODEL_REGISTRY = {
         "model_name": "meta-llama/llama-3.1-8b-instruct",
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 131072,
         "required_environment_variables": ["OPENROUTER_API_KEY"]
     },
     "openrouter/google/gemini-pro": {
@@ -215,10 +242,14 @@ MODEL_REGISTRY = {
         "model_name": "google/gemini-pro",
         "capabilities": [],
         "pricing": {"input": 0.0, "output": 0.0},
+        "context_window": 32760,
         "required_environment_variables": ["OPENROUTER_API_KEY"]
     },
 }
 
+# Context window assumed for models without one in the registry, e.g. dynamic OpenRouter models
+DEFAULT_CONTEXT_WINDOW = 32000
+
 # Helper functions for model registry access
 
 def get_model_registry_entry(llm_model: str):
@@ -247,6 +278,13 @@ def get_model_registry_entry(llm_model: str):
     print(f"Warning: Model '{llm_model}' not found in registry")
     return None
 
+def get_context_window(llm_model: str) -> int:
+    """Get the number of tokens a model accepts in one request."""
+    model_info = get_model_registry_entry(llm_model)
+    if model_info and "context_window" in model_info:
+        return model_info["context_window"]
+    return DEFAULT_CONTEXT_WINDOW
+
 def get_model_family(provider_type: str):
     """Get all models of a specific provider type."""
     return [model for model, info in MODEL_REGISTRY.items() if info["provider"] == provider_type]
@@ -255,8 +293,18 @@ def get_model_family(provider_type: str):
 OPENAI_MODELS = [model for model, info in MODEL_REGISTRY.items() if info["provider"] in ["openai", "azure_openai", "deepseek"]]
 ANTHROPIC_MODELS = [model for model, info in MODEL_REGISTRY.items() if info["provider"] in ["anthropic", "bedrock_anthropic"]]
 
-def get_model_settings(llm_model: str, tools=None):
-    """Get the appropriate model settings based on the model type."""
+def get_model_settings(llm_model: str, tools=None, parallel_tool_calls: bool = False):
+    """
+    Get the appropriate model settings based on the model type.
+
+    Args:
+        llm_model: The model identifier
+        tools: The tool names the agent will be given
+        parallel_tool_calls: Whether the model may request several tool calls in one turn
+
+    Returns:
+        The provider model settings, or None if none apply
+    """
     # If no tools are provided, no model settings are needed
     if not tools:
         return None
@@ -283,6 +331,8 @@ def get_model_settings(llm_model: str, tools=None):
     
     # For all other models, return provider settings
     provider = model_info["provider"]
+    if parallel_tool_calls and provider in PARALLEL_MODEL_SETTINGS:
+        return PARALLEL_MODEL_SETTINGS[provider]
     if provider in MODEL_SETTINGS:
         return MODEL_SETTINGS[provider]
     
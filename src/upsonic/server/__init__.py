@@ -1,6 +1,6 @@
 from ..storage.configuration import Configuration
 from .level_one.call import Call
-from ..server_manager import ServerManager
+from ..server_manager import ServerManager, workers_from_env
 
 from .api import app
 from .level_one.server.server import *
@@ -15,6 +15,7 @@ import threading
 import time
 import concurrent.futures
 import traceback
+from typing import Optional
 from multiprocessing import freeze_support
 from ..tools_server import run_tools_server, stop_tools_server, is_tools_server_running
 
@@ -29,14 +30,17 @@ _server_manager = ServerManager(
     name="main"
 )
 
-def run_main_server(redirect_output: bool = False):
+def run_main_server(redirect_output: bool = False, workers: Optional[int] = None):
     """Start the main server if it's not already running."""
-    _server_manager.start(redirect_output=redirect_output)
+    _server_manager.start(redirect_output=redirect_output, workers=workers)
 
-def run_main_server_internal(reload: bool = True):
-    """Run the main server directly (for development)"""
+def run_main_server_internal(reload: bool = True, workers: Optional[int] = None):
+    """Run the main server directly (for development), with several worker processes if workers > 1"""
     import uvicorn
-    uvicorn.run("upsonic.server.api:app", host="0.0.0.0", port=7541, reload=reload)
+    workers = workers or workers_from_env("main")
+    # uvicorn can't reload and run several workers at once
+    uvicorn.run("upsonic.server.api:app", host="0.0.0.0", port=7541,
+                reload=reload and workers == 1, workers=workers)
 
 def stop_main_server():
     """Stop the main server if it's running."""
@@ -7,6 +7,7 @@ from fastapi import FastAPI, HTTPException, Request, Response
 import asyncio
 from functools import wraps
 from ..exception import TimeoutException
+from ..framing import SUPPORTED_TRANSPORTS
 import inspect
 from starlette.responses import JSONResponse
 import threading
@@ -73,7 +74,8 @@ def handle_server_errors(func):
 
 @app.get("/status")
 async def get_status():
-    return {"status": "Server is running"}
+    # Clients read "transports" to decide whether they can send binary frames
+    return {"status": "Server is running", "transports": SUPPORTED_TRANSPORTS}
 
 
 def timeout(seconds: float):
@@ -1,17 +1,19 @@
 from pydantic import BaseModel
 from pydantic_ai.result import ResultDataT_inv, ResultDataT
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Optional, List
 from pydantic_ai.messages import ImageUrl
 
 from ...storage.configuration import Configuration
 
 from ..level_utilized.utility import (
     agent_creator, 
+    fetch_function_tools_async,
     prepare_message_history, 
     process_error_traceback,
     format_response,
     handle_compression_retry
 )
+from ..level_utilized.streaming import stream_run
 
 import openai
 import traceback
@@ -29,7 +31,8 @@ class CallManager:
         system_prompt: Optional[Any] = None 
     ):
         try:
-            roulette_agent = agent_creator(response_format, tools, context, llm_model, system_prompt)
+            function_tools = await fetch_function_tools_async(tools)
+            roulette_agent = agent_creator(response_format, tools, context, llm_model, system_prompt, function_tools=function_tools)
             if isinstance(roulette_agent, dict) and "status_code" in roulette_agent:
                 return roulette_agent  # Return error from agent_creator
 
@@ -58,4 +61,40 @@ class CallManager:
         except Exception as e:
             return process_error_traceback(e)
 
+    async def gpt_4o_stream(
+        self,
+        prompt: str,
+        images: Optional[List[str]] = None,
+        response_format: BaseModel = str,
+        tools: list[str] = [],
+        context: Any = None,
+        llm_model: str = "openai/gpt-4o",
+        system_prompt: Optional[Any] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming version of gpt_4o, yielding the events of the run as they happen.
+
+        The prompt isn't compressed and retried on a context overflow, since
+        part of the answer may already have been sent.
+
+        Yields:
+            The events of stream_run, with the last one holding the response of gpt_4o
+        """
+        try:
+            function_tools = await fetch_function_tools_async(tools)
+            roulette_agent = agent_creator(response_format, tools, context, llm_model, system_prompt, function_tools=function_tools)
+            if isinstance(roulette_agent, dict) and "status_code" in roulette_agent:
+                yield {"type": "error", "result": roulette_agent}
+                return
+
+            message_history = prepare_message_history(prompt, images, llm_model, tools)
+
+            async for event in stream_run(roulette_agent, message_history):
+                if event["type"] == "result":
+                    event = {"type": "result", "result": format_response(event["result"])}
+                yield event
+        except Exception as e:
+            traceback.print_exc()
+            yield {"type": "error", "result": process_error_traceback(e)}
+
 Call = CallManager()
@@ -1,9 +1,14 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
 import traceback
 from ...api import app, timeout, handle_server_errors
 from ..call import Call
+from ...level_utilized.serialization import load_cached_payload, load_payload, dump_payload
+from ...level_utilized.streaming import sse_stream, SSE_CONTENT_TYPE
+from ....framing import dumps_frames, loads_frames, FRAMES_CONTENT_TYPE
 import asyncio
 import cloudpickle
 cloudpickle.DEFAULT_PROTOCOL = 2
@@ -36,45 +41,92 @@ async def call_gpt4o(request: GPT4ORequest):
     Returns:
         The response from the AI model
     """
-    try:
-        # Handle pickled response format
-        if request.response_format != "str":
-            try:
-                # Decode and unpickle the response format
-                pickled_data = base64.b64decode(request.response_format)
-                response_format = cloudpickle.loads(pickled_data)
-            except Exception as e:
-                tb = traceback.extract_tb(e.__traceback__)
-                file_path = tb[-1].filename
-                if "Upsonic/src/" in file_path:
-                    file_path = file_path.split("Upsonic/src/")[1]
-                line_number = tb[-1].lineno
-                traceback.print_exc()
-                # Fallback to basic type mapping if unpickling fails
-                type_mapping = {
-                    "str": str,
-                    "int": int,
-                    "float": float,
-                    "bool": bool,
-                }
-                response_format = type_mapping.get(request.response_format, str)
-        else:
-            response_format = str
-
-        if request.context is not None:
-            try:
-                pickled_context = base64.b64decode(request.context)
-                context = cloudpickle.loads(pickled_context)
-            except Exception as e:
-                tb = traceback.extract_tb(e.__traceback__)
-                file_path = tb[-1].filename
-                if "Upsonic/src/" in file_path:
-                    file_path = file_path.split("Upsonic/src/")[1]
-                line_number = tb[-1].lineno
-                traceback.print_exc()
-                context = None
-        else:
+    return await _call_gpt4o(request)
+
+
+@app.post(f"{prefix}/gpt4o/frames")
+@handle_server_errors
+async def call_gpt4o_frames(request: Request):
+    """
+    Binary framed variant of the endpoint above.
+
+    The request and response carry the pickled context, response format and
+    result as raw frame parts instead of base64 inside JSON.
+    """
+    payload = loads_frames(await request.body())
+    result = await _call_gpt4o(GPT4ORequest(**payload), raw_result=True)
+    return Response(content=dumps_frames(result, default=jsonable_encoder), media_type=FRAMES_CONTENT_TYPE)
+
+
+@app.post(f"{prefix}/gpt4o/stream")
+async def call_gpt4o_stream(request: GPT4ORequest):
+    """
+    Streaming variant of the gpt4o endpoint.
+
+    Args:
+        request: GPT4ORequest containing prompt and optional parameters
+
+    Returns:
+        A server-sent event stream of text deltas, tool calls, tool results
+        and the final result, see level_utilized.streaming
+    """
+    response_format, context = _load_request(request)
+    events = Call.gpt_4o_stream(
+        prompt=request.prompt,
+        images=request.images,
+        response_format=response_format,
+        tools=request.tools,
+        context=context,
+        llm_model=request.llm_model,
+        system_prompt=request.system_prompt
+    )
+    return StreamingResponse(sse_stream(events, request.response_format != "str"), media_type=SSE_CONTENT_TYPE)
+
+
+def _load_request(request: GPT4ORequest):
+    # Handle pickled response format
+    if request.response_format != "str":
+        try:
+            # Decode and unpickle the response format, reusing classes already seen
+            response_format = load_cached_payload(request.response_format)
+        except Exception as e:
+            tb = traceback.extract_tb(e.__traceback__)
+            file_path = tb[-1].filename
+            if "Upsonic/src/" in file_path:
+                file_path = file_path.split("Upsonic/src/")[1]
+            line_number = tb[-1].lineno
+            traceback.print_exc()
+            # Fallback to basic type mapping if unpickling fails
+            type_mapping = {
+                "str": str,
+                "int": int,
+                "float": float,
+                "bool": bool,
+            }
+            response_format = type_mapping.get(request.response_format, str)
+    else:
+        response_format = str
+
+    if request.context is not None:
+        try:
+            context = load_payload(request.context)
+        except Exception as e:
+            tb = traceback.extract_tb(e.__traceback__)
+            file_path = tb[-1].filename
+            if "Upsonic/src/" in file_path:
+                file_path = file_path.split("Upsonic/src/")[1]
+            line_number = tb[-1].lineno
+            traceback.print_exc()
             context = None
+    else:
+        context = None
+
+    return response_format, context
+
+
+async def _call_gpt4o(request: GPT4ORequest, raw_result: bool = False):
+    try:
+        response_format, context = _load_request(request)
 
         result = await Call.gpt_4o(
             prompt=request.prompt,
@@ -87,8 +139,7 @@ async def call_gpt4o(request: GPT4ORequest):
         )
 
         if request.response_format != "str" and result["status_code"] == 200:
-            result["result"] = cloudpickle.dumps(result["result"])
-            result["result"] = base64.b64encode(result["result"]).decode('utf-8')
+            result["result"] = dump_payload(result["result"], raw=raw_result)
         return {"result": result, "status_code": 200}
     except Exception as e:
         tb = traceback.extract_tb(e.__traceback__)
@@ -5,15 +5,21 @@ from pydantic import BaseModel
 import os
 from pydantic_ai.messages import ImageUrl
 
-from typing import Any, Optional, List
+import asyncio
+from typing import Any, AsyncIterator, Optional, List, Tuple
 
 from ...storage.configuration import Configuration
 
-from ..level_utilized.memory import save_temporary_memory, get_temporary_memory
+from ..level_utilized.memory import append_temporary_memory
+from ..level_utilized.memory_window import windowed_memory
+from ..level_utilized.streaming import stream_run
 
 from ..level_utilized.utility import (
     agent_creator, 
+    fetch_function_tools_async,
+    _create_model_from_registry,
     prepare_message_history,
+    prepare_context_string,
     process_error_traceback,
     format_response,
     handle_compression_retry
@@ -69,16 +75,27 @@ class AgentManager:
         llm_model: str = "openai/gpt-4o",
         system_prompt: Optional[Any] = None,
         context_compress: bool = False,
-        memory: bool = False
+        memory: bool = False,
+        model: Any = None,
+        function_tools: Optional[list] = None,
+        parallel_tool_calls: bool = False,
+        memory_budget: Optional[int] = None
     ):
         try:
+            if function_tools is None:
+                function_tools = await fetch_function_tools_async(tools)
+            context_string = await prepare_context_string(context, llm_model, context_compress, model=model)
             roulette_agent = agent_creator(
                 response_format=response_format, 
                 tools=tools, 
                 context=context, 
                 llm_model=llm_model, 
                 system_prompt=system_prompt,
-                context_compress=context_compress
+                context_compress=context_compress,
+                model=model,
+                function_tools=function_tools,
+                parallel_tool_calls=parallel_tool_calls,
+                context_string=context_string
             )
             
             if isinstance(roulette_agent, dict) and "status_code" in roulette_agent:
@@ -86,7 +103,8 @@ class AgentManager:
 
             agent_memory = []
             if memory:
-                agent_memory = get_temporary_memory(agent_id)
+                # Older turns are folded into a summary once the history is over the budget
+                agent_memory = await windowed_memory(agent_id, llm_model, memory_budget, model=model)
 
             message_history = prepare_message_history(prompt, images, llm_model, tools)
                 
@@ -112,7 +130,8 @@ class AgentManager:
             total_response_tokens += result.usage().response_tokens
 
             if memory:
-                save_temporary_memory(result.all_messages(), agent_id)
+                # Only the messages of this turn are written, earlier ones are already stored
+                append_temporary_memory(result.new_messages(), agent_id)
 
             # Extract tool usage from the latest interaction only
             tool_usage = extract_latest_tool_usage(result.all_messages())
@@ -130,5 +149,169 @@ class AgentManager:
         except Exception as e:
             return process_error_traceback(e)
 
+    async def agent_stream(
+        self,
+        agent_id: str,
+        prompt: str,
+        images: Optional[List[str]] = None,
+        response_format: BaseModel = str,
+        tools: list[str] = [],
+        context: Any = None,
+        llm_model: str = "openai/gpt-4o",
+        system_prompt: Optional[Any] = None,
+        context_compress: bool = False,
+        memory: bool = False,
+        parallel_tool_calls: bool = False,
+        memory_budget: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming version of agent, yielding the events of the run as they happen.
+
+        The memory is only written once the run completes. Unlike agent, an
+        overflow isn't retried with a compressed prompt, since part of the
+        answer may already have been sent.
+
+        Args:
+            agent_id: The agent the task belongs to
+            prompt: The task prompt
+            images: Optional base64 encoded images
+            response_format: The type of the final result
+            tools: Tool names
+            context: Optional context
+            llm_model: The model to use
+            system_prompt: Optional system prompt
+            context_compress: Whether to compress a long context before the run
+            memory: Whether to use the agent's temporary memory
+            parallel_tool_calls: Whether the model may run several tool calls of a turn at once
+            memory_budget: Tokens the memory may take, by default half the model's context window
+
+        Yields:
+            The events of stream_run, with the last one holding the response of agent
+        """
+        try:
+            function_tools = await fetch_function_tools_async(tools)
+            context_string = await prepare_context_string(context, llm_model, context_compress)
+            roulette_agent = agent_creator(
+                response_format=response_format,
+                tools=tools,
+                context=context,
+                llm_model=llm_model,
+                system_prompt=system_prompt,
+                context_compress=context_compress,
+                function_tools=function_tools,
+                parallel_tool_calls=parallel_tool_calls,
+                context_string=context_string
+            )
+            if isinstance(roulette_agent, dict) and "status_code" in roulette_agent:
+                yield {"type": "error", "result": roulette_agent}
+                return
+
+            agent_memory = []
+            if memory:
+                agent_memory = await windowed_memory(agent_id, llm_model, memory_budget)
+
+            message_history = prepare_message_history(prompt, images, llm_model, tools)
+
+            async for event in stream_run(roulette_agent, message_history, agent_memory):
+                if event["type"] == "result":
+                    result = event["result"]
+                    if memory:
+                        append_temporary_memory(result.new_messages(), agent_id)
+                    event = {
+                        "type": "result",
+                        "result": {
+                            "status_code": 200,
+                            "result": result.data,
+                            "usage": {
+                                "input_tokens": result.usage().request_tokens,
+                                "output_tokens": result.usage().response_tokens
+                            },
+                            "tool_usage": extract_latest_tool_usage(result.all_messages())
+                        }
+                    }
+                yield event
+        except Exception as e:
+            traceback.print_exc()
+            yield {"type": "error", "result": process_error_traceback(e)}
+
+    async def agent_batch(
+        self,
+        agent_id: str,
+        tasks: List[dict],
+        tools: list[str] = [],
+        llm_model: str = "openai/gpt-4o",
+        system_prompt: Optional[Any] = None,
+        context_compress: bool = False,
+        memory: bool = False,
+        max_concurrency: int = 8,
+        parallel_tool_calls: bool = False,
+        memory_budget: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Run many tasks for one agent configuration, yielding results as they complete.
+
+        The model and the function tools are built once and shared by every task.
+
+        Args:
+            agent_id: The agent the tasks belong to
+            tasks: Dicts with the prompt, images, response_format and context of each task
+            tools: Tool names shared by all tasks
+            llm_model: The model to use
+            system_prompt: Optional system prompt
+            context_compress: Whether to compress the context on overflow
+            memory: Whether to use the agent's temporary memory
+            max_concurrency: Maximum number of tasks running at once
+            parallel_tool_calls: Whether the model may run several tool calls of a turn at once
+            memory_budget: Tokens the memory may take, by default half the model's context window
+
+        Yields:
+            (index, result) tuples in completion order
+        """
+        model, error = _create_model_from_registry(llm_model)
+        if error:
+            for index in range(len(tasks)):
+                yield index, error
+            return
+
+        try:
+            function_tools = await fetch_function_tools_async(tools)
+        except Exception as e:
+            error = process_error_traceback(e)
+            for index in range(len(tasks)):
+                yield index, error
+            return
+
+        # Tasks sharing one memory would overwrite each other's history
+        semaphore = asyncio.Semaphore(1 if memory else max(1, max_concurrency))
+
+        async def run_task(index, task):
+            async with semaphore:
+                result = await self.agent(
+                    agent_id=agent_id,
+                    prompt=task["prompt"],
+                    images=task.get("images"),
+                    response_format=task.get("response_format", str),
+                    tools=tools,
+                    context=task.get("context"),
+                    llm_model=llm_model,
+                    system_prompt=system_prompt,
+                    context_compress=context_compress,
+                    memory=memory,
+                    model=model,
+                    function_tools=function_tools,
+                    parallel_tool_calls=parallel_tool_calls,
+                    memory_budget=memory_budget
+                )
+                return index, result
+
+        running = [asyncio.create_task(run_task(index, task)) for index, task in enumerate(tasks)]
+        try:
+            for completed in asyncio.as_completed(running):
+                yield await completed
+        finally:
+            # Stop the remaining tasks if the caller goes away early
+            for each in running:
+                each.cancel()
+
 
 Agent = AgentManager()
\ No newline at end of file
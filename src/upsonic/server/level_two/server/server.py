@@ -1,4 +1,6 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
 import traceback
@@ -6,10 +8,14 @@ import traceback
 import pydantic_ai
 from ...api import app, timeout, handle_server_errors
 from ..agent import Agent
+from ...level_utilized.serialization import load_cached_payload, load_payload, dump_payload
+from ...level_utilized.streaming import sse_stream, SSE_CONTENT_TYPE
+from ....framing import dumps_frames, loads_frames, FRAMES_CONTENT_TYPE
 import asyncio
 import cloudpickle
 cloudpickle.DEFAULT_PROTOCOL = 2
 import base64
+import json
 
 
 prefix = "/level_two"
@@ -26,6 +32,8 @@ class AgentRequest(BaseModel):
     system_prompt: Optional[Any] = None
     context_compress: Optional[Any] = False
     memory: Optional[Any] = False
+    parallel_tool_calls: bool = False
+    memory_budget: Optional[int] = None
 
 
 @app.post(f"{prefix}/agent")
@@ -40,33 +48,83 @@ async def call_agent(request: AgentRequest):
     Returns:
         The response from the AI model
     """
+    return await _call_agent(request)
+
+
+@app.post(f"{prefix}/agent/frames")
+@handle_server_errors
+async def call_agent_frames(request: Request):
+    """
+    Binary framed variant of the endpoint above.
+
+    The request and response carry the pickled context, response format and
+    result as raw frame parts instead of base64 inside JSON.
+    """
+    payload = loads_frames(await request.body())
+    result = await _call_agent(AgentRequest(**payload), raw_result=True)
+    return Response(content=dumps_frames(result, default=jsonable_encoder), media_type=FRAMES_CONTENT_TYPE)
+
+
+@app.post(f"{prefix}/agent/stream")
+async def call_agent_stream(request: AgentRequest):
+    """
+    Streaming variant of the agent endpoint.
+
+    Args:
+        request: AgentRequest containing prompt and optional parameters
+
+    Returns:
+        A server-sent event stream of text deltas, tool calls, tool results
+        and the final result, see level_utilized.streaming
+    """
+    events = Agent.agent_stream(
+        agent_id=request.agent_id,
+        prompt=request.prompt,
+        images=request.images,
+        response_format=_load_response_format(request.response_format),
+        tools=request.tools,
+        context=_load_context(request.context),
+        llm_model=request.llm_model,
+        system_prompt=request.system_prompt,
+        context_compress=request.context_compress,
+        memory=request.memory,
+        parallel_tool_calls=request.parallel_tool_calls,
+        memory_budget=request.memory_budget
+    )
+    return StreamingResponse(sse_stream(events, request.response_format != "str"), media_type=SSE_CONTENT_TYPE)
+
+
+def _load_response_format(response_format_str):
+    # Handle pickled response format
+    if response_format_str != "str":
+        try:
+            # Decode and unpickle the response format, reusing classes already seen
+            return load_cached_payload(response_format_str)
+        except Exception as e:
+            # Fallback to basic type mapping if unpickling fails
+            type_mapping = {
+                "str": str,
+                "int": int,
+                "float": float,
+                "bool": bool,
+            }
+            return type_mapping.get(response_format_str, str)
+    return str
+
+
+def _load_context(context_str):
+    if context_str is None:
+        return None
     try:
-        # Handle pickled response format
-        if request.response_format != "str":
-            try:
-                # Decode and unpickle the response format
-                pickled_data = base64.b64decode(request.response_format)
-                response_format = cloudpickle.loads(pickled_data)
-            except Exception as e:
-                # Fallback to basic type mapping if unpickling fails
-                type_mapping = {
-                    "str": str,
-                    "int": int,
-                    "float": float,
-                    "bool": bool,
-                }
-                response_format = type_mapping.get(request.response_format, str)
-        else:
-            response_format = str
-
-        if request.context is not None:
-            try:
-                pickled_context = base64.b64decode(request.context)
-                context = cloudpickle.loads(pickled_context)
-            except Exception as e:
-                context = None
-        else:
-            context = None
+        return load_payload(context_str)
+    except Exception as e:
+        return None
+
+
+async def _call_agent(request: AgentRequest, raw_result: bool = False):
+    try:
+        response_format = _load_response_format(request.response_format)
+        context = _load_context(request.context)
 
         result = await Agent.agent(
             agent_id=request.agent_id,
@@ -78,12 +136,13 @@ async def call_agent(request: AgentRequest):
             llm_model=request.llm_model,
             system_prompt=request.system_prompt,
             context_compress=request.context_compress,
-            memory=request.memory
+            memory=request.memory,
+            parallel_tool_calls=request.parallel_tool_calls,
+            memory_budget=request.memory_budget
         )
 
         if request.response_format != "str" and result["status_code"] == 200:
-            result["result"] = cloudpickle.dumps(result["result"])
-            result["result"] = base64.b64encode(result["result"]).decode('utf-8')
+            result["result"] = dump_payload(result["result"], raw=raw_result)
         return {"result": result, "status_code": 200}
 
     except pydantic_ai.exceptions.UnexpectedModelBehavior as e:
@@ -92,3 +151,73 @@ async def call_agent(request: AgentRequest):
     except Exception as e:
         traceback.print_exc()
         return {"result": {"status_code": 500, "detail": f"Error processing Agent request: {str(e)}"}, "status_code": 500}
+
+
+class AgentBatchTask(BaseModel):
+    prompt: str
+    images: Optional[List[str]] = None
+    response_format: Optional[Any] = []
+    context: Optional[Any] = None
+
+
+class AgentBatchRequest(BaseModel):
+    agent_id: str
+    tasks: List[AgentBatchTask]
+    tools: Optional[Any] = []
+    llm_model: Optional[Any] = "openai/gpt-4o"
+    system_prompt: Optional[Any] = None
+    context_compress: Optional[Any] = False
+    memory: Optional[Any] = False
+    parallel_tool_calls: bool = False
+    memory_budget: Optional[int] = None
+    max_concurrency: int = 8
+
+
+@app.post(f"{prefix}/agent/batch")
+async def call_agent_batch(request: AgentBatchRequest):
+    """
+    Endpoint to run many tasks for one agent in a single request.
+
+    The model and tools are built once, the tasks run concurrently up to
+    max_concurrency, and each result is streamed back as one JSON line as
+    soon as it completes.
+
+    Args:
+        request: AgentBatchRequest containing the tasks and the shared agent settings
+
+    Returns:
+        A newline delimited JSON stream of {"index", "result"} objects
+    """
+    tasks = [
+        {
+            "prompt": each.prompt,
+            "images": each.images,
+            "response_format": _load_response_format(each.response_format),
+            "context": _load_context(each.context),
+        }
+        for each in request.tasks
+    ]
+
+    async def stream_results():
+        async for index, result in Agent.agent_batch(
+            agent_id=request.agent_id,
+            tasks=tasks,
+            tools=request.tools,
+            llm_model=request.llm_model,
+            system_prompt=request.system_prompt,
+            context_compress=request.context_compress,
+            memory=request.memory,
+            max_concurrency=request.max_concurrency,
+            parallel_tool_calls=request.parallel_tool_calls,
+            memory_budget=request.memory_budget
+        ):
+            try:
+                if request.tasks[index].response_format != "str" and result["status_code"] == 200:
+                    result["result"] = dump_payload(result["result"])
+                line = json.dumps({"index": index, "result": jsonable_encoder(result)})
+            except Exception as e:
+                traceback.print_exc()
+                line = json.dumps({"index": index, "result": {"status_code": 500, "detail": f"Error processing Agent request: {str(e)}"}})
+            yield line + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
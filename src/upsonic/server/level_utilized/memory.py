@@ -1,38 +1,292 @@
 """
 Module for handling temporary memory storage of agent messages.
+
+Messages are stored in an append-only list per agent, with their token
+counts in a second list, so a turn only appends the messages it added
+instead of rewriting the whole history. Messages are stored as raw pickles. Both lists live in the configured
+storage backend, so every server replica sees the same memory.
 """
 
 import pickle
 import base64
+import threading
+from typing import Any, List, Optional, Tuple
+
+from pydantic_ai.messages import ModelRequest, SystemPromptPart, UserPromptPart
+
+from ...storage.backends import StorageBackend
 from ...storage.configuration import Configuration
 
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Return a tiktoken encoding when tiktoken is installed and usable, False otherwise."""
+    global _encoding
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Not installed, or its vocabulary can't be downloaded
+                    _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text with tiktoken, or estimate them at four characters a token.
+
+    Args:
+        text: The text to count
+
+    Returns:
+        The token count
+    """
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def message_text(message) -> str:
+    """
+    Flatten a message into text, for counting tokens and summarizing.
+
+    Args:
+        message: A pydantic-ai ModelRequest or ModelResponse
+
+    Returns:
+        One line per part, prefixed with the part kind
+    """
+    lines = []
+    for part in getattr(message, "parts", []):
+        content = getattr(part, "content", None)
+        if content is None:
+            content = getattr(part, "args", None)
+        if content is None:
+            continue
+        if not isinstance(content, str):
+            content = str(content)
+        lines.append(f"{getattr(part, 'part_kind', 'part')}: {content}")
+    return "\n".join(lines)
+
+
+def estimate_tokens(message) -> int:
+    """
+    Estimate the number of tokens a message costs in a prompt.
+
+    Args:
+        message: A pydantic-ai ModelRequest or ModelResponse
+
+    Returns:
+        The token count of its content plus a small per-message overhead
+    """
+    return count_tokens(message_text(message)) + 4
+
+
+def _starts_turn(message) -> bool:
+    return isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts)
+
+
+def with_system_parts(message, system_parts: list):
+    """Return a request with system prompt parts put in front of its own, unless it has some already."""
+    if not system_parts or any(isinstance(part, SystemPromptPart) for part in message.parts):
+        return message
+    return ModelRequest(parts=[*system_parts, *message.parts])
+
+
+def _messages_key(agent_id: str) -> str:
+    return f"agent_memory_{agent_id}"
+
+
+def _tokens_key(agent_id: str) -> str:
+    return f"agent_memory_tokens_{agent_id}"
+
+
+def _dump_message(message) -> bytes:
+    return pickle.dumps(message)
+
+
+def _load_message(data: bytes):
+    return pickle.loads(data)
+
+
+class MemoryStore:
+    """
+    Append-only store of agent messages in a storage backend.
+
+    The position of a message in its agent's list is its sequence number.
+    """
+
+    def __init__(self, config: StorageBackend):
+        self.config = config
+
+    def append(self, agent_id: str, messages: list) -> None:
+        """
+        Append messages to the end of an agent's history.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            messages: The messages added by the latest turn
+        """
+        if not messages:
+            return
+        self._migrate_legacy(agent_id)
+        # One atomic append for both lists keeps them aligned when replicas append at once
+        self.config.append_many({
+            _messages_key(agent_id): [_dump_message(message) for message in messages],
+            _tokens_key(agent_id): [estimate_tokens(message) for message in messages],
+        })
+
+    def window(self, agent_id: str, last_n: Optional[int] = None, token_budget: Optional[int] = None, after_seq: int = -1) -> List[Tuple[int, Any]]:
+        """
+        Read the most recent messages of an agent with their sequence numbers.
+
+        A shortened window starts at a user prompt, so tool calls are never
+        separated from their results.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            last_n: Return at most this many of the latest messages
+            token_budget: Return the latest messages whose token counts fit in this budget
+            after_seq: Only consider messages after this sequence number
+
+        Returns:
+            (seq, message) tuples, oldest first
+        """
+        self._migrate_legacy(agent_id)
+        # Pick the window from the token counts alone, then load only its messages
+        sizes = self.config.get_range(_tokens_key(agent_id), after_seq + 1, -1)
+        total = len(sizes)
+        if last_n is not None:
+            sizes = sizes[-last_n:] if last_n > 0 else []
+        kept = 0
+        used = 0
+        for tokens in reversed(sizes):
+            if token_budget is not None and used + tokens > token_budget:
+                break
+            kept += 1
+            used += tokens
+        if not kept:
+            return []
+        start = after_seq + 1 + total - kept
+        rows = self.config.get_range(_messages_key(agent_id), start, start + kept - 1)
+
+        entries = [(start + index, _load_message(data)) for index, data in enumerate(rows)]
+        if len(entries) < total:
+            # Drop the partial turn at the start of the window
+            while entries and not _starts_turn(entries[0][1]):
+                entries.pop(0)
+        return entries
+
+    def get(self, agent_id: str, last_n: Optional[int] = None, token_budget: Optional[int] = None) -> List:
+        """
+        Read an agent's history, optionally only its most recent part.
+
+        A shortened history keeps the system prompt of the first turn, which
+        pydantic-ai doesn't add again once there is history.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            last_n: Return at most this many of the latest messages
+            token_budget: Return the latest messages whose token counts fit in this budget
+
+        Returns:
+            The messages, oldest first
+        """
+        entries = self.window(agent_id, last_n=last_n, token_budget=token_budget)
+        messages = [message for _, message in entries]
+        if entries and entries[0][0] != 0:
+            messages[0] = with_system_parts(messages[0], self.system_parts(agent_id))
+        return messages
+
+    def between(self, agent_id: str, after_seq: int, before_seq: Optional[int] = None) -> List[Tuple[int, Any]]:
+        """Return the (seq, message) tuples with sequence numbers strictly between two bounds."""
+        end = -1 if before_seq is None else before_seq - 1
+        if end != -1 and end <= after_seq:
+            return []
+        rows = self.config.get_range(_messages_key(agent_id), after_seq + 1, end)
+        return [(after_seq + 1 + index, _load_message(data)) for index, data in enumerate(rows)]
+
+    def size(self, agent_id: str, after_seq: int = -1) -> Tuple[int, int]:
+        """Return the number of messages after a sequence number and their total tokens."""
+        self._migrate_legacy(agent_id)
+        sizes = self.config.get_range(_tokens_key(agent_id), after_seq + 1, -1)
+        return len(sizes), sum(sizes)
+
+    def first_seq(self, agent_id: str) -> Optional[int]:
+        """Return the sequence number of an agent's oldest stored message."""
+        return 0 if self.config.length(_tokens_key(agent_id)) else None
+
+    def system_parts(self, agent_id: str) -> list:
+        """Return the system prompt parts of an agent's first message."""
+        first = self.config.get_range(_messages_key(agent_id), 0, 0)
+        if not first:
+            return []
+        return [part for part in _load_message(first[0]).parts if isinstance(part, SystemPromptPart)]
+
+    def clear(self, agent_id: str) -> None:
+        """Delete an agent's history."""
+        self.config.delete_many([
+            _messages_key(agent_id),
+            _tokens_key(agent_id),
+            f"temp_memory_{agent_id}",
+            f"memory_summary_{agent_id}",
+        ])
+
+    def _migrate_legacy(self, agent_id: str) -> None:
+        """Move a history saved as one pickled list by older versions into the lists."""
+        legacy = self.config.get(f"temp_memory_{agent_id}")
+        if legacy is None:
+            return
+        self.config.delete(f"temp_memory_{agent_id}")
+        messages = pickle.loads(base64.b64decode(legacy))
+        self.clear(agent_id)
+        self.append(agent_id, messages)
+
+
+Memory = MemoryStore(Configuration)
+
+
 def save_temporary_memory(messages: list, agent_id: str) -> None:
     """
-    Save messages for a specific agent ID in temporary memory.
-    
+    Replace the stored messages of a specific agent ID.
+
     Args:
         messages: List of messages to store
         agent_id: Unique identifier for the agent
     """
-    # Serialize messages using pickle and base64 encode for storage
-    serialized_messages = base64.b64encode(pickle.dumps(messages)).decode('utf-8')
-    Configuration.set(f"temp_memory_{agent_id}", serialized_messages)
+    Memory.clear(agent_id)
+    Memory.append(agent_id, messages)
 
 
-def get_temporary_memory(agent_id: str) -> list:
+def append_temporary_memory(messages: list, agent_id: str) -> None:
+    """
+    Append the messages of a new turn to the memory of a specific agent ID.
+
+    Args:
+        messages: The messages added by the turn, e.g. result.new_messages()
+        agent_id: Unique identifier for the agent
+    """
+    Memory.append(agent_id, messages)
+
+
+def get_temporary_memory(agent_id: str, last_n: Optional[int] = None, token_budget: Optional[int] = None) -> list:
     """
     Retrieve messages for a specific agent ID from temporary memory.
-    
+
     Args:
         agent_id: Unique identifier for the agent
-        
+        last_n: Optionally return only this many of the latest messages
+        token_budget: Optionally return only the latest messages fitting in this many tokens
+
     Returns:
         List of messages if found, None if not found
     """
-    serialized_messages = Configuration.get(f"temp_memory_{agent_id}")
-    if serialized_messages is None:
-        return None
-    
-    # Deserialize messages from base64 encoded pickle
-    messages = pickle.loads(base64.b64decode(serialized_messages))
-    return messages
+    messages = Memory.get(agent_id, last_n=last_n, token_budget=token_budget)
+    return messages or None
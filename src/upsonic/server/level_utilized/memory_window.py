@@ -0,0 +1,155 @@
+"""
+Token-budgeted memory window for long-lived agents.
+
+The latest turns of an agent are sent as they are. When they no longer fit
+in the memory budget, the oldest of them are folded into a rolling summary,
+so each turn only summarizes the messages that fell out of the window since
+the previous fold instead of the whole history.
+"""
+
+import traceback
+from typing import Any, List, Optional, Tuple
+
+from pydantic_ai.messages import ModelRequest, SystemPromptPart
+
+from ...model_registry import get_context_window
+from ...storage.configuration import Configuration
+from .utility import agent_creator
+from .memory import Memory, count_tokens, message_text, with_system_parts, _starts_turn
+
+
+# Share of the model's context window the history may take by default
+MEMORY_BUDGET_RATIO = 0.5
+# Share of the memory budget kept as whole turns after a fold, so a fold isn't needed every turn
+LOW_WATER_RATIO = 0.6
+
+SUMMARY_PROMPT = (
+    "You maintain the memory of a long conversation between a user and an assistant. "
+    "Update the summary below with the new messages. Keep every fact, decision, name, "
+    "number and open task that later turns may need, drop small talk, and answer only "
+    "with the updated summary.\n\n"
+)
+
+
+def _summary_key(agent_id: str) -> str:
+    return f"memory_summary_{agent_id}"
+
+
+def get_memory_summary(agent_id: str) -> dict:
+    """
+    Get the rolling summary of an agent.
+
+    Args:
+        agent_id: Unique identifier for the agent
+
+    Returns:
+        A dict with the summary text, the seq of the last message it covers and its token count
+    """
+    return Configuration.get(_summary_key(agent_id)) or {"summary": "", "through_seq": -1, "tokens": 0}
+
+
+async def summarize_messages(summary: str, messages: list, llm_model: str, max_tokens: int, model: Any = None) -> Tuple[str, bool]:
+    """
+    Fold messages into a summary with the agent's model.
+
+    Falls back to keeping the end of the transcript when the model can't be used,
+    so a failing summary never fails the turn. The fallback is only meant for
+    this turn: it is not saved, so the next turn tries to summarize again.
+
+    Args:
+        summary: The summary so far
+        messages: The messages to add to it, oldest first
+        llm_model: The model to summarize with
+        max_tokens: Token limit of the new summary
+        model: An already created model to use instead of llm_model
+
+    Returns:
+        The updated summary, and whether the model wrote it rather than the fallback
+    """
+    transcript = "\n".join(message_text(message) for message in messages)
+    previous = summary or "(empty)"
+    try:
+        agent = agent_creator(response_format=str, tools=[], llm_model=llm_model, model=model, function_tools=[])
+        if isinstance(agent, dict) and "status_code" in agent:
+            raise ValueError(f"Error creating model: {agent}")
+        result = await agent.run(
+            SUMMARY_PROMPT
+            + f"Keep it under {max_tokens} tokens.\n\n"
+            + f"Summary so far:\n{previous}\n\nNew messages:\n{transcript}"
+        )
+        new_summary = str(result.data)
+        ok = True
+    except Exception as e:
+        traceback.print_exc()
+        print(f"Error summarizing memory: {str(e)}")
+        new_summary = f"{summary}\n{transcript}".strip()
+        ok = False
+
+    if count_tokens(new_summary) > max_tokens:
+        # Roughly four characters a token, keeping the most recent part
+        new_summary = new_summary[-max_tokens * 4:]
+    return new_summary, ok
+
+
+async def windowed_memory(agent_id: str, llm_model: str, memory_budget: Optional[int] = None, model: Any = None) -> List:
+    """
+    Get the message history of an agent, kept within a token budget.
+
+    Args:
+        agent_id: Unique identifier for the agent
+        llm_model: The model the history is sent to, which sets the default budget
+        memory_budget: Tokens the history may take, by default half the model's context window
+        model: An already created model to summarize with instead of llm_model
+
+    Returns:
+        The messages to pass as message_history, oldest first
+    """
+    if memory_budget is None:
+        memory_budget = int(get_context_window(llm_model) * MEMORY_BUDGET_RATIO)
+
+    state = get_memory_summary(agent_id)
+    through_seq = state["through_seq"]
+    count, tokens = Memory.size(agent_id, through_seq)
+    if not count and not state["summary"]:
+        return []
+
+    if state["tokens"] + tokens <= memory_budget:
+        window = Memory.window(agent_id, after_seq=through_seq)
+    else:
+        low_water = int(memory_budget * LOW_WATER_RATIO)
+        window = Memory.window(agent_id, token_budget=low_water, after_seq=through_seq)
+        pending = Memory.between(agent_id, through_seq, window[0][0] if window else None)
+        if not window:
+            # The latest turn alone is over the low water mark, keep it whole anyway
+            starts = [index for index, (_, message) in enumerate(pending) if _starts_turn(message)]
+            split = starts[-1] if starts else len(pending)
+            pending, window = pending[:split], pending[split:]
+
+        if pending:
+            summary, ok = await summarize_messages(
+                state["summary"],
+                [message for _, message in pending],
+                llm_model,
+                max_tokens=max(memory_budget - low_water, 1),
+                model=model,
+            )
+            state = {"summary": summary, "through_seq": pending[-1][0], "tokens": count_tokens(summary)}
+            if ok:
+                Configuration.set(_summary_key(agent_id), state)
+
+    messages = [message for _, message in window]
+    if not messages and not state["summary"]:
+        return []
+
+    system_parts = Memory.system_parts(agent_id)
+    if state["summary"]:
+        summary_part = SystemPromptPart(content=f"Summary of the earlier conversation:\n{state['summary']}")
+        if not messages:
+            # Everything was folded into the summary, which is then the whole history
+            return [ModelRequest(parts=[*system_parts, summary_part])]
+        first = messages[0]
+        own_parts = [part for part in first.parts if not isinstance(part, SystemPromptPart)]
+        messages[0] = ModelRequest(parts=[*system_parts, summary_part, *own_parts])
+    elif window[0][0] != Memory.first_seq(agent_id):
+        messages[0] = with_system_parts(messages[0], system_parts)
+    return messages
@@ -0,0 +1,95 @@
+"""
+Module for encoding and decoding the cloudpickled payloads exchanged with the client.
+"""
+
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Union
+
+import cloudpickle
+cloudpickle.DEFAULT_PROTOCOL = 2
+
+
+MAX_CACHED_PAYLOADS = 256
+
+_loaded_payloads = OrderedDict()
+_loaded_payloads_lock = threading.Lock()
+
+
+def _decode(payload: Union[str, bytes]) -> bytes:
+    # Framed requests carry raw pickles, JSON requests carry them base64 encoded
+    if isinstance(payload, (bytes, bytearray)):
+        return payload
+    return base64.b64decode(payload)
+
+
+def load_payload(payload: Union[str, bytes]) -> Any:
+    """
+    Unpickle a cloudpickle payload sent either raw or base64 encoded.
+
+    Args:
+        payload: The raw pickle, or its base64 encoding
+
+    Returns:
+        The unpickled object
+    """
+    return cloudpickle.loads(_decode(payload))
+
+
+def dump_payload(obj: Any, raw: bool = False) -> Union[str, bytes]:
+    """
+    Cloudpickle an object for the response, base64 encoding it unless raw.
+
+    Args:
+        obj: The object to pickle
+        raw: Whether to return the raw pickle for a framed response
+
+    Returns:
+        The raw pickle, or its base64 encoding
+    """
+    pickled = cloudpickle.dumps(obj)
+    if raw:
+        return pickled
+    return base64.b64encode(pickled).decode("utf-8")
+
+
+def load_cached_payload(encoded: Union[str, bytes]) -> Any:
+    """
+    Unpickle a cloudpickle payload sent raw or base64 encoded, caching the result.
+
+    The client sends the same blob for the same response format on every
+    request, so repeated blobs are served from a small LRU keyed by their
+    content hash instead of being unpickled again. Only use this for payloads
+    that are safe to share between requests, such as classes.
+
+    Args:
+        encoded: The raw pickle, or its base64 encoding
+
+    Returns:
+        The unpickled object
+    """
+    data = encoded if isinstance(encoded, (bytes, bytearray)) else encoded.encode("utf-8")
+    key = hashlib.sha256(data).hexdigest()
+
+    with _loaded_payloads_lock:
+        if key in _loaded_payloads:
+            _loaded_payloads.move_to_end(key)
+            return _loaded_payloads[key]
+
+    loaded = load_payload(encoded)
+
+    with _loaded_payloads_lock:
+        _loaded_payloads[key] = loaded
+        _loaded_payloads.move_to_end(key)
+        while len(_loaded_payloads) > MAX_CACHED_PAYLOADS:
+            _loaded_payloads.popitem(last=False)
+
+    return loaded
+
+
+def clear_payload_cache() -> None:
+    """Drop every cached payload."""
+    with _loaded_payloads_lock:
+        _loaded_payloads.clear()
@@ -0,0 +1,116 @@
+"""
+Streaming of agent runs as server-sent events.
+
+A run is driven node by node with pydantic-ai's Agent.iter, so text is
+forwarded while the model writes it and every tool call and tool result as
+soon as it happens, ahead of the final structured result.
+
+Each event is a dict with a "type":
+    text_delta: {"delta"} a piece of the model's text answer
+    tool_call: {"tool_name", "args", "tool_call_id"} a function tool is called
+    tool_result: {"tool_name", "content", "tool_call_id", "retry"} it returned,
+        or asked the model to retry when "retry" is true
+    result: {"result"} the final response, in the shape of the regular endpoints
+    error: {"result"} the run failed, with the usual error payload
+"""
+
+import json
+import traceback
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    RetryPromptPart,
+    TextPart,
+    TextPartDelta,
+)
+
+from .serialization import dump_payload
+
+
+SSE_CONTENT_TYPE = "text/event-stream"
+
+
+async def stream_run(agent: Any, user_prompt: Any, message_history: list = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run an agent and yield its events as they happen.
+
+    Args:
+        agent: The pydantic-ai agent to run
+        user_prompt: The prompt, a string or a list of parts with images
+        message_history: Optional messages of earlier turns
+
+    Yields:
+        Event dicts, ending with {"type": "result", "result": AgentRunResult}
+        which the caller formats like a regular run
+    """
+    async with agent.iter(user_prompt, message_history=message_history) as run:
+        async for node in run:
+            if Agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as request_stream:
+                    async for event in request_stream:
+                        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                            if event.part.content:
+                                yield {"type": "text_delta", "delta": event.part.content}
+                        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                            if event.delta.content_delta:
+                                yield {"type": "text_delta", "delta": event.delta.content_delta}
+            elif Agent.is_call_tools_node(node):
+                async with node.stream(run.ctx) as tools_stream:
+                    async for event in tools_stream:
+                        if isinstance(event, FunctionToolCallEvent):
+                            yield {
+                                "type": "tool_call",
+                                "tool_name": event.part.tool_name,
+                                "args": event.part.args,
+                                "tool_call_id": event.call_id,
+                            }
+                        elif isinstance(event, FunctionToolResultEvent):
+                            yield {
+                                "type": "tool_result",
+                                "tool_name": event.result.tool_name,
+                                "content": event.result.content,
+                                "tool_call_id": event.tool_call_id,
+                                "retry": isinstance(event.result, RetryPromptPart),
+                            }
+        yield {"type": "result", "result": run.result}
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """
+    Encode an event as a server-sent event, named after its type.
+
+    Args:
+        event: The event dict
+
+    Returns:
+        The "event:" and "data:" lines with the blank line that ends the event
+    """
+    return f"event: {event['type']}\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[Dict[str, Any]], pickled_result: bool) -> AsyncIterator[str]:
+    """
+    Encode the events of a run for a StreamingResponse.
+
+    Args:
+        events: The events of CallManager.gpt_4o_stream or AgentManager.agent_stream
+        pickled_result: Whether the final result is a response format object to pickle
+
+    Yields:
+        Each event encoded with sse_event
+    """
+    async for event in events:
+        try:
+            if event["type"] == "result" and pickled_result and event["result"]["status_code"] == 200:
+                event["result"]["result"] = dump_payload(event["result"]["result"])
+            line = sse_event(event)
+        except Exception as e:
+            traceback.print_exc()
+            line = sse_event({"type": "error", "result": {"status_code": 500, "detail": f"Error processing stream event: {str(e)}"}})
+        yield line
@@ -1,6 +1,10 @@
+import asyncio
+import concurrent.futures
 import inspect
+import threading
 import traceback
 import types
+import weakref
 from itertools import chain
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIModel
@@ -30,7 +34,7 @@ from openai import AsyncStream
 
 
 from ...storage.configuration import Configuration
-from ...storage.caching import save_to_cache_with_expiry, get_from_cache_with_expiry
+from ...storage.caching import get_or_compute_with_expiry_async
 
 from ...tools_server.function_client import FunctionToolManager
 
@@ -46,6 +50,18 @@ from ...model_registry import (
 )
 
 def tool_wrapper(func: Callable) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        # Async tools stay async so pydantic-ai awaits them on the event loop
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                print("Tool call failed:", e)
+                return {"status_code": 500, "detail": f"Tool call failed: {e}"}
+
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         # Log the tool call
@@ -62,12 +78,118 @@ def tool_wrapper(func: Callable) -> Callable:
     
     return wrapper
 
+
+# Locks serializing stateful tools that share one resource, per event loop and group
+_exclusive_tool_locks = weakref.WeakKeyDictionary()
+_exclusive_tool_locks_lock = threading.Lock()
+
+
+def _get_exclusive_tool_lock(group: str) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    with _exclusive_tool_locks_lock:
+        locks = _exclusive_tool_locks.setdefault(loop, {})
+        if group not in locks:
+            locks[group] = asyncio.Lock()
+        return locks[group]
+
+
+def exclusive_tool(func: Callable, group: str) -> Callable:
+    """
+    Wrap an async tool so calls sharing a group never overlap, even when the
+    model requests several of them in one turn or several agents run at once.
+
+    Args:
+        func: The async tool to wrap
+        group: The name of the resource the tool drives, e.g. "ComputerUse"
+
+    Returns:
+        The wrapped tool
+    """
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        async with _get_exclusive_tool_lock(group):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+# Chunk summaries running at once per summarize_text call
+SUMMARY_CONCURRENCY = 8
+# Shortest summary a chunk or group is asked for, however many there are
+MIN_PIECE_SUMMARY = 2000
+
+SUMMARY_PROMPT = (
+    "Please provide an extremely concise summary of the following text. "
+    "Focus only on the most important points and key information. "
+    "Be as brief as possible while retaining critical meaning"
+)
+REDUCE_PROMPT = (
+    "Please merge the following partial summaries of one long text into a single "
+    "extremely concise summary. Keep the most important points and key information "
+    "from every part"
+)
+
+
+class _PartialSummary(Exception):
+    """Carries a summary in which some pieces fell back to their truncated text, so it isn't cached."""
+
+    def __init__(self, summary: str):
+        super().__init__("Some pieces of the text could not be summarized")
+        self.summary = summary
+
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code, even when called on a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # A loop is running in this thread, so run the coroutine on a loop of its own thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 def summarize_text(text: str, llm_model: Any, chunk_size: int = 100000, max_size: int = 300000) -> str:
-    """Base function to summarize any text by splitting into chunks and summarizing each."""
+    """
+    Synchronous version of summarize_text_async.
+
+    It blocks the caller until the summary is done, so async code should
+    await summarize_text_async instead.
+    """
+    return _run_coroutine_sync(summarize_text_async(text, llm_model, chunk_size, max_size))
+
+
+async def summarize_text_async(
+    text: str,
+    llm_model: Any,
+    chunk_size: int = 100000,
+    max_size: int = 300000,
+    max_concurrency: int = SUMMARY_CONCURRENCY,
+    model: Any = None,
+) -> str:
+    """
+    Summarize a text longer than max_size with a map-reduce over its chunks.
+
+    The chunks are summarized concurrently, up to max_concurrency at a time,
+    and each chunk summary is cached on its own, so a text that shares chunks
+    with an earlier one only summarizes the new chunks. While the chunk
+    summaries together are still over max_size, consecutive summaries are
+    grouped and merged, level by level.
+
+    Args:
+        text: The text to summarize
+        llm_model: The model to summarize with
+        chunk_size: Characters per chunk
+        max_size: Length the summary has to fit in; shorter texts are returned as they are
+        max_concurrency: Maximum number of model calls running at once
+        model: An already created model to use instead of llm_model
+
+    Returns:
+        The summary, or the start of the text if it can't be summarized
+    """
     # Return early if text is None or empty
     if text is None:
         return ""
-    
+
     if not isinstance(text, str):
         try:
             text = str(text)
@@ -83,162 +205,161 @@ def summarize_text(text: str, llm_model: Any, chunk_size: int = 100000, max_size
 
     # Generate a cache key based on text content and parameters
     cache_key = hashlib.md5(f"{text}{llm_model}{chunk_size}{max_size}".encode()).hexdigest()
-    
-    # Try to get from cache first
-    cached_result = get_from_cache_with_expiry(cache_key)
-    if cached_result is not None:
-        print("Using cached summary")
-        return cached_result
 
-    # Adjust chunk size based on model
-    if "gpt" in str(llm_model).lower():
-        # OpenAI has a 1M character limit, we'll use a much smaller chunk size to be safe
-        chunk_size = min(chunk_size, 100000)  # 100K per chunk for OpenAI
-    elif "claude" in str(llm_model).lower():
-        chunk_size = min(chunk_size, 200000)  # 200K per chunk for Claude
-    
     try:
-        print(f"Original text length: {len(text)}")
-        
-        # If text is extremely long, do an initial aggressive truncation
-        if len(text) > 2000000:  # If over 2M characters
-            text = text[:2000000]  # Take first 2M characters
-            print("Text was extremely long, truncated to 2M characters")
-        
-        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
-        print(f"Number of chunks: {len(chunks)}")
-        
-        model = agent_creator(response_format=str, tools=[], context=None, llm_model=llm_model, system_prompt=None)
-        if isinstance(model, dict) and "status_code" in model:
-            print(f"Error creating model: {model}")
-            return text[:max_size]
-        
-        # Process chunks in smaller batches if there are too many
-        batch_size = 5
-        summarized_chunks = []
-        
-        for batch_start in range(0, len(chunks), batch_size):
-            batch_end = min(batch_start + batch_size, len(chunks))
-            batch = chunks[batch_start:batch_end]
-            
-            for i, chunk in enumerate(batch):
-                chunk_num = batch_start + i + 1
-                try:
-                    print(f"Processing chunk {chunk_num}/{len(chunks)}, length: {len(chunk)}")
-                    
-                    # Create a more focused prompt for better summarization
-                    prompt = (
-                        "Please provide an extremely concise summary of the following text. "
-                        "Focus only on the most important points and key information. "
-                        "Be as brief as possible while retaining critical meaning:\n\n"
-                    )
-                    
-                    message = [{"type": "text", "text": prompt + chunk}]
-                    result = model.run_sync(message)
-                    
-                    if result and hasattr(result, 'data') and result.data:
-                        # Ensure the summary isn't too long
-                        summary = result.data[:max_size//len(chunks)]
-                        summarized_chunks.append(summary)
-                    else:
-                        print(f"Warning: Empty or invalid result for chunk {chunk_num}")
-                        # Include a shorter truncated version as fallback
-                        summarized_chunks.append(chunk[:500] + "...")
-                except Exception as e:
-                    print(f"Error summarizing chunk {chunk_num}: {str(e)}")
-                    # Include a shorter truncated version as fallback
-                    summarized_chunks.append(chunk[:500] + "...")
-
-        # Combine all summarized chunks
-        combined_summary = "\n\n".join(summarized_chunks)
-        
-        # If still too long, recursively summarize with smaller chunks
-        if len(combined_summary) > max_size:
-            print(f"Combined summary still too long ({len(combined_summary)} chars), recursively summarizing...")
-            return summarize_text(
-                combined_summary, 
-                llm_model, 
-                chunk_size=max(5000, chunk_size//4),  # Reduce chunk size more aggressively
-                max_size=max_size
-            )
-            
-        print(f"Final summary length: {len(combined_summary)}")
-        
-        # Cache the result for 1 hour (3600 seconds)
-        save_to_cache_with_expiry(combined_summary, cache_key, 3600)
-        
-        return combined_summary
+        # Concurrent requests for the same text wait on one summary, cached for 1 hour
+        return await get_or_compute_with_expiry_async(
+            cache_key,
+            lambda: _summarize_chunks(text, llm_model, chunk_size, max_size, max_concurrency, model),
+            3600,
+        )
+    except _PartialSummary as e:
+        # Used this time, and summarized again next time
+        return e.summary
     except Exception as e:
         traceback.print_exc()
         print(f"Error in summarize_text: {str(e)}")
         # If all else fails, return a truncated version
         return text[:max_size]
 
-def summarize_message_prompt(message_prompt: str, llm_model: Any) -> str:
-    """Summarizes the message prompt to reduce its length while preserving key information."""
-    print("\n\n\n****************Summarizing message prompt****************\n\n\n")
-    if message_prompt is None:
-        return ""
-    
+
+async def _summarize_piece(agent: Agent, prompt: str, piece: str, llm_model: Any, limit: int, semaphore: asyncio.Semaphore, cache: bool = True) -> tuple:
+    """
+    Summarize one chunk or group of summaries, falling back to its start if the model fails.
+
+    Returns:
+        The summary, and whether the model made it rather than it being the fallback
+    """
+    cache_key = "summary_" + hashlib.md5(f"{prompt}{piece}{llm_model}{limit}".encode()).hexdigest()
+
+    async def compute():
+        async with semaphore:
+            result = await agent.run(f"{prompt} (at most {limit} characters):\n\n{piece}")
+        if not result or not result.data:
+            raise ValueError("Empty summary")
+        return result.data[:limit]
+
     try:
-        # Use a smaller max size for message prompts
-        max_size = 50000  # 100K for messages
-        summarized_message_prompt = summarize_text(message_prompt, llm_model, max_size=max_size)
-        if summarized_message_prompt is None:
-            return ""
-        print("Before summarize_message_prompt length: ", len(message_prompt))
-        print(f"Summarized message prompt length: {len(summarized_message_prompt)}")
-        return summarized_message_prompt
+        if cache:
+            return await get_or_compute_with_expiry_async(cache_key, compute, 3600), True
+        return await compute(), True
     except Exception as e:
-        print(f"Error in summarize_message_prompt: {str(e)}")
-        try:
-            return str(message_prompt)[:50000] if message_prompt else ""
-        except:
-            return ""
+        print(f"Error summarizing a piece of {len(piece)} characters: {str(e)}")
+        # Include a shorter truncated version as fallback
+        return piece[:min(500, limit)] + "...", False
+
+
+def _group_summaries(summaries: list, group_size: int) -> list:
+    """Join consecutive summaries into groups of about group_size characters."""
+    groups = []
+    current = []
+    current_size = 0
+    for summary in summaries:
+        if current and current_size + len(summary) > group_size:
+            groups.append("\n\n".join(current))
+            current = []
+            current_size = 0
+        current.append(summary)
+        current_size += len(summary) + 2
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+async def _summarize_chunks(text: str, llm_model: Any, chunk_size: int, max_size: int, max_concurrency: int, model: Any = None) -> str:
+    """
+    Summarize text chunk by chunk, raising if no model can be created.
+
+    Raises _PartialSummary with the summary if a piece had to fall back to its
+    truncated text. Merged summaries built on such a piece aren't cached either.
+    """
+    # Adjust chunk size based on model
+    if "gpt" in str(llm_model).lower():
+        # OpenAI has a 1M character limit, we'll use a much smaller chunk size to be safe
+        chunk_size = min(chunk_size, 100000)  # 100K per chunk for OpenAI
+    elif "claude" in str(llm_model).lower():
+        chunk_size = min(chunk_size, 200000)  # 200K per chunk for Claude
 
-def summarize_system_prompt(system_prompt: str, llm_model: Any) -> str:
-    """Summarizes the system prompt to reduce its length while preserving key information."""
-    print("\n\n\n****************Summarizing system prompt****************\n\n\n")
-    if system_prompt is None:
+    print(f"Original text length: {len(text)}")
+
+    # If text is extremely long, do an initial aggressive truncation
+    if len(text) > 2000000:  # If over 2M characters
+        text = text[:2000000]  # Take first 2M characters
+        print("Text was extremely long, truncated to 2M characters")
+
+    agent = agent_creator(response_format=str, tools=[], context=None, llm_model=llm_model, system_prompt=None, model=model, function_tools=[])
+    if isinstance(agent, dict) and "status_code" in agent:
+        raise ValueError(f"Error creating model: {agent}")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    pieces = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    prompt = SUMMARY_PROMPT
+    print(f"Number of chunks: {len(pieces)}")
+    complete = True
+
+    while True:
+        # Leave room for the separators the summaries are joined with
+        limit = max((max_size - 2 * (len(pieces) - 1)) // len(pieces), MIN_PIECE_SUMMARY)
+        results = await asyncio.gather(*[
+            _summarize_piece(agent, prompt, piece, llm_model, limit, semaphore, cache=complete) for piece in pieces
+        ])
+        summaries = [summary for summary, _ in results]
+        complete = complete and all(summarized for _, summarized in results)
+        combined_summary = "\n\n".join(summaries)
+        if len(combined_summary) <= max_size:
+            break
+
+        groups = _group_summaries(summaries, chunk_size)
+        if len(groups) >= len(pieces):
+            # Merging wouldn't shrink the summary any further
+            combined_summary = combined_summary[:max_size]
+            break
+        print(f"Combined summary still too long ({len(combined_summary)} chars), merging {len(summaries)} summaries into {len(groups)}")
+        pieces = groups
+        prompt = REDUCE_PROMPT
+
+    print(f"Final summary length: {len(combined_summary)}")
+
+    if not complete:
+        raise _PartialSummary(combined_summary)
+    return combined_summary
+
+
+async def _summarize_prompt_part(name: str, text: Any, llm_model: Any, max_size: int, model: Any = None) -> str:
+    """Summarize a prompt part down to max_size, falling back to its start on errors."""
+    print(f"\n\n\n****************Summarizing {name}****************\n\n\n")
+    if text is None or text == "":
         return ""
-    
+
     try:
-        # Use a smaller max size for system prompts
-        max_size = 50000  # 100K for system prompts
-        summarized_system_prompt = summarize_text(system_prompt, llm_model, max_size=max_size)
-        if summarized_system_prompt is None:
+        summarized = await summarize_text_async(text, llm_model, max_size=max_size, model=model)
+        if summarized is None:
             return ""
-        print("Before summarize_system_prompt length: ", len(system_prompt))
-        print(f"Summarized system prompt length: {len(summarized_system_prompt)}")
-        return summarized_system_prompt
+        print(f"Before summarize {name} length: ", len(text))
+        print(f"Summarized {name} length: {len(summarized)}")
+        return summarized
     except Exception as e:
-        print(f"Error in summarize_system_prompt: {str(e)}")
+        print(f"Error in summarizing {name}: {str(e)}")
         try:
-            return str(system_prompt)[:50000] if system_prompt else ""
+            return str(text)[:max_size] if text else ""
         except:
             return ""
 
-def summarize_context_string(context_string: str, llm_model: Any) -> str:
+
+async def summarize_message_prompt(message_prompt: str, llm_model: Any, model: Any = None) -> str:
+    """Summarizes the message prompt to reduce its length while preserving key information."""
+    return await _summarize_prompt_part("message prompt", message_prompt, llm_model, 50000, model)
+
+
+async def summarize_system_prompt(system_prompt: str, llm_model: Any, model: Any = None) -> str:
+    """Summarizes the system prompt to reduce its length while preserving key information."""
+    return await _summarize_prompt_part("system prompt", system_prompt, llm_model, 50000, model)
+
+
+async def summarize_context_string(context_string: str, llm_model: Any, model: Any = None) -> str:
     """Summarizes the context string to reduce its length while preserving key information."""
-    print("\n\n\n****************Summarizing context string****************\n\n\n")
-    if context_string is None or context_string == "":
-        return ""
-    
-    try:
-        # Use a smaller max size for context strings
-        max_size = 50000  # 50K for context strings
-        summarized_context = summarize_text(context_string, llm_model, max_size=max_size)
-        if summarized_context is None:
-            return ""
-        print("Before summarize_context_string length: ", len(context_string))
-        print(f"Summarized context string length: {len(summarized_context)}")
-        return summarized_context
-    except Exception as e:
-        print(f"Error in summarize_context_string: {str(e)}")
-        try:
-            return str(context_string)[:50000] if context_string else ""
-        except:
-            return ""
+    return await _summarize_prompt_part("context string", context_string, llm_model, 50000, model)
+
 
 def process_error_traceback(e):
     """Extract and format error traceback information consistently."""
@@ -313,8 +434,8 @@ async def handle_compression_retry(prompt, images, tools, llm_model, response_fo
     """Handle compression and retry when facing token limit issues."""
     try:
         # Compress prompts
-        compressed_system_prompt = summarize_system_prompt(system_prompt, llm_model) if system_prompt else None
-        compressed_message = summarize_message_prompt(prompt, llm_model)
+        compressed_system_prompt = await summarize_system_prompt(system_prompt, llm_model) if system_prompt else None
+        compressed_message = await summarize_message_prompt(prompt, llm_model)
         
         # Prepare new message history
         message_history = prepare_message_history(compressed_message, images, llm_model, tools)
@@ -326,7 +447,8 @@ async def handle_compression_retry(prompt, images, tools, llm_model, response_fo
             context=context,
             llm_model=llm_model,
             system_prompt=compressed_system_prompt,
-            context_compress=False
+            context_compress=False,
+            function_tools=await fetch_function_tools_async(tools)
         )
         
         # Run the agent with compressed inputs
@@ -512,8 +634,41 @@ def _process_context(context):
             
     return context_string
 
-def _setup_tools(roulette_agent, tools, llm_model):
-    """Set up the tools for the agent."""
+async def prepare_context_string(context: Any, llm_model: str, context_compress: bool = False, model: Any = None) -> str:
+    """
+    Turn a context into the string agent_creator puts in the system prompt, compressing it if asked.
+
+    Compressing here, before agent_creator, summarizes the chunks of a long
+    context concurrently without blocking the event loop.
+
+    Args:
+        context: The context of the task
+        llm_model: The model the context is sent to, and summarized with
+        context_compress: Whether to summarize a long context
+        model: An already created model to summarize with instead of llm_model
+
+    Returns:
+        The context string, to pass to agent_creator as context_string
+    """
+    context_string = _process_context(context)
+    if context_compress and context_string:
+        context_string = await summarize_context_string(context_string, llm_model, model=model)
+    return context_string
+
+def fetch_function_tools(tools):
+    """Fetch the function tools matching the requested tool names from the tools server."""
+    with FunctionToolManager() as function_client:
+        return function_client.get_tools_by_name(tools)
+
+
+async def fetch_function_tools_async(tools):
+    """Asynchronous version of fetch_function_tools, for use inside request handlers."""
+    with FunctionToolManager() as function_client:
+        return await function_client.get_tools_by_name_async(tools)
+
+
+def _setup_tools(roulette_agent, tools, llm_model, function_tools=None):
+    """Set up the tools for the agent, reusing already fetched function tools if given."""
     the_wrapped_tools = []
 
     # First check for ComputerUse tools compatibility
@@ -525,12 +680,11 @@ def _setup_tools(roulette_agent, tools, llm_model):
             }
 
     # Set up function tools
-    with FunctionToolManager() as function_client:
-        the_list_of_tools = function_client.get_tools_by_name(tools)
+    the_list_of_tools = function_tools if function_tools is not None else fetch_function_tools(tools)
 
-        for each in the_list_of_tools:
-            wrapped_tool = tool_wrapper(each)
-            the_wrapped_tools.append(wrapped_tool)
+    for each in the_list_of_tools:
+        wrapped_tool = tool_wrapper(each)
+        the_wrapped_tools.append(wrapped_tool)
         
     for each in the_wrapped_tools:
         signature = inspect.signature(each)
@@ -540,8 +694,9 @@ def _setup_tools(roulette_agent, tools, llm_model):
     if "ComputerUse.*" in tools:
         try:
             from .cu import ComputerUse_tools
+            # There is one screen, mouse and keyboard, so computer actions run one at a time
             for each in ComputerUse_tools:
-                roulette_agent.tool_plain(each, retries=5)
+                roulette_agent.tool_plain(exclusive_tool(each, "ComputerUse"), retries=5)
         except Exception as e:
             print(f"Error setting up ComputerUse tools: {e}")
 
@@ -559,12 +714,69 @@ def _setup_tools(roulette_agent, tools, llm_model):
             
     return roulette_agent
 
+# Configuration keys holding the credentials each provider's client is built from
+PROVIDER_CREDENTIAL_KEYS = {
+    "azure_openai": ["AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_VERSION", "AZURE_OPENAI_API_KEY"],
+    "deepseek": ["DEEPSEEK_API_KEY"],
+    "anthropic": ["ANTHROPIC_API_KEY"],
+    "bedrock_anthropic": ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION"],
+    "ollama": ["OLLAMA_BASE_URL"],
+    "openrouter": ["OPENROUTER_API_KEY"],
+    "gemini": ["GOOGLE_GLA_API_KEY"],
+}
+
+# Built models per event loop, keyed by (provider, model_name, credential fingerprint).
+# Reusing a model reuses its provider client and the upstream connections it keeps open.
+_model_cache = weakref.WeakKeyDictionary()
+_model_cache_lock = threading.Lock()
+
+
+def _credential_fingerprint(registry_entry: dict) -> str:
+    """Hash the stored credentials a model is built from, so changed keys build a new one."""
+    provider = registry_entry["provider"]
+    if provider == "openai":
+        keys = [registry_entry.get("api_key", "OPENAI_API_KEY")]
+    else:
+        keys = PROVIDER_CREDENTIAL_KEYS.get(provider, [])
+    values = [f"{key}={Configuration.get(key)}" for key in keys]
+    return hashlib.sha256("\0".join(values).encode("utf-8")).hexdigest()
+
+
+def invalidate_model_cache() -> None:
+    """Drop every cached model, e.g. after a stored credential changed."""
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
 def _create_model_from_registry(llm_model: str):
-    """Create a model instance based on the registry entry."""
+    """Create a model instance based on the registry entry, reusing one already built."""
     registry_entry = get_model_registry_entry(llm_model)
     if not registry_entry:
         return None, {"status_code": 400, "detail": f"Unsupported LLM model: {llm_model}"}
-    
+
+    try:
+        # Provider clients hold connections bound to the loop they are used on
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _build_model_from_registry(registry_entry)
+
+    cache_key = (registry_entry["provider"], registry_entry["model_name"], _credential_fingerprint(registry_entry))
+    with _model_cache_lock:
+        model = _model_cache.get(loop, {}).get(cache_key)
+    if model is not None:
+        return model, None
+
+    model, error = _build_model_from_registry(registry_entry)
+    if error:
+        return model, error
+
+    with _model_cache_lock:
+        _model_cache.setdefault(loop, {})[cache_key] = model
+    return model, None
+
+
+def _build_model_from_registry(registry_entry: dict):
+    """Build a new model instance for a registry entry."""
     provider = registry_entry["provider"]
     model_name = registry_entry["model_name"]
     
@@ -594,24 +806,27 @@ def agent_creator(
         context: Any = None,
         llm_model: str = None,
         system_prompt: Optional[Any] = None,
-        context_compress: bool = False
+        context_compress: bool = False,
+        model: Any = None,
+        function_tools: Optional[list] = None,
+        parallel_tool_calls: bool = False,
+        context_string: Optional[str] = None
     ):
         # Use default model if none provided
         if llm_model is None:
             llm_model = "openai/gpt-4o"
             print(f"No model specified, using default: {llm_model}")
         
-        # Get the model from registry
-        model, error = _create_model_from_registry(llm_model)
-        if error:
-            return error
-
-        # Process context
-        context_string = _process_context(context)
+        # Get the model from registry unless the caller already built one
+        if model is None:
+            model, error = _create_model_from_registry(llm_model)
+            if error:
+                return error
 
-        # Compress context string if enabled
-        if context_compress and context_string:
-            context_string = summarize_context_string(context_string, llm_model)
+        # Process context, unless the caller already did with prepare_context_string,
+        # which is where a context is compressed when context_compress is set
+        if context_string is None:
+            context_string = _process_context(context)
 
         # Prepare system prompt
         system_prompt_ = ()
@@ -621,7 +836,7 @@ def agent_creator(
             system_prompt_ = f"You are a helpful assistant. User want to add an context to the task. The context is: {context_string}"
         
         # Get the appropriate model settings based on the model type
-        model_settings = get_model_settings(llm_model, tools)
+        model_settings = get_model_settings(llm_model, tools, parallel_tool_calls)
 
         # Create the agent
         roulette_agent = Agent(
@@ -633,7 +848,7 @@ def agent_creator(
         )
 
         # Set up tools and check for errors
-        result = _setup_tools(roulette_agent, tools, llm_model)
+        result = _setup_tools(roulette_agent, tools, llm_model, function_tools)
         
         # If result is a dict, it means there was an error
         if isinstance(result, dict) and "status_code" in result:
@@ -10,6 +10,7 @@ import cloudpickle
 cloudpickle.DEFAULT_PROTOCOL = 2
 import base64
 from ....storage.configuration import Configuration
+from ...level_utilized.utility import invalidate_model_cache
 
 
 prefix = "/storage"
@@ -55,6 +56,8 @@ async def set_config(request: ConfigSetRequest):
         A success message
     """
     Configuration.set(request.key, request.value)
+    # Models are cached per credential, so drop them when a stored key changes
+    invalidate_model_cache()
     return {"message": "Configuration updated successfully"}
 
 @app.post(f"{prefix}/config/bulk_set")
@@ -68,7 +71,8 @@ async def bulk_set_config(request: BulkConfigSetRequest):
     Returns:
         A success message
     """
-    for key, value in request.configs.items():
-        Configuration.set(key, value)
+    # One transaction for the whole batch instead of a commit per key
+    Configuration.set_many(request.configs)
+    invalidate_model_cache()
     return {"message": "Bulk configuration updated successfully"}
 
@@ -1,9 +1,10 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
 import traceback
 from ..api import app, timeout
 from ...tools_server.tools_client import ToolManager
+from ...framing import loads_frames
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import cloudpickle
@@ -51,6 +52,9 @@ async def uninstall_library(request: InstallLibraryRequest):
 
 class AddToolRequest(BaseModel):
     function: Any
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = 30.0
+    executor: str = "thread"
 
 @app.post(f"{prefix}/add_tool")
 async def add_tool(request: AddToolRequest):
@@ -58,7 +62,23 @@ async def add_tool(request: AddToolRequest):
     Endpoint to add a tool.
     """
     with ToolManager() as tool_client:
-        tool_client.add_tool(request.function)
+        tool_client.add_tool(request.function, max_concurrency=request.max_concurrency, timeout=request.timeout, executor=request.executor)
+    return {"message": "Tool added successfully"}
+
+
+@app.post(f"{prefix}/add_tool/frames")
+async def add_tool_frames(request: Request):
+    """
+    Endpoint to add a tool sent as a binary frame with the raw pickled function.
+    """
+    payload = loads_frames(await request.body())
+    with ToolManager() as tool_client:
+        tool_client.add_tool(
+            payload["function"],
+            max_concurrency=payload.get("max_concurrency"),
+            timeout=payload.get("timeout", 30.0),
+            executor=payload.get("executor", "thread"),
+        )
     return {"message": "Tool added successfully"}
 
 
@@ -6,14 +6,25 @@ import socket
 import subprocess
 import psutil
 from contextlib import closing
-from typing import Optional
+from typing import Dict, Optional
+
+
+def workers_from_env(name: str) -> int:
+    """Read the number of worker processes of a server from UPSONIC_<NAME>_WORKERS, 1 by default."""
+    try:
+        return max(1, int(os.getenv(f"UPSONIC_{name.upper()}_WORKERS", "1")))
+    except ValueError:
+        return 1
+
 
 class ServerManager:
-    def __init__(self, app_path: str, host: str, port: int, name: str):
+    def __init__(self, app_path: str, host: str, port: int, name: str, workers: Optional[int] = None):
         self.app_path = app_path
         self.host = host
         self.port = port
         self.name = name
+        # Several workers need their shared state in the storage backend, see upsonic.storage.backends
+        self.workers = workers if workers is not None else workers_from_env(name)
         self._process: Optional[subprocess.Popen] = None
         self._pid_file = os.path.join(os.path.expanduser("~"), f".upsonic_{name}_server.pid")
 
@@ -104,8 +115,16 @@ class ServerManager:
         
         return not self._is_port_in_use()
 
-    def start(self, redirect_output: bool = False, force: bool = False):
-        """Start the server if it's not already running."""
+    def start(self, redirect_output: bool = False, force: bool = False, workers: Optional[int] = None, env: Optional[Dict[str, str]] = None):
+        """
+        Start the server if it's not already running.
+
+        Args:
+            redirect_output: Whether to write the output to log files
+            force: Whether to start even if the port could not be freed
+            workers: Number of worker processes, by default the one the manager was created with
+            env: Extra environment variables for the server processes
+        """
         if self.is_running():
             return
             
@@ -131,9 +150,13 @@ class ServerManager:
                 "--log-level", "error",
                 "--no-access-log"
             ]
+            workers = workers or self.workers
+            if workers > 1:
+                cmd += ["--workers", str(workers)]
             
             self._process = subprocess.Popen(
-                cmd, stdout=stdout, stderr=stderr, start_new_session=True
+                cmd, stdout=stdout, stderr=stderr, start_new_session=True,
+                env={**os.environ, **env} if env else None
             )
             self._manage_pid_file("write")
 
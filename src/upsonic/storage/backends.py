@@ -0,0 +1,306 @@
+"""
+Storage backends shared by the configuration, cache and memory stores.
+
+The SQLite backend (ConfigManager) keeps everything in a file next to the
+package, which is only shared by the processes of one machine. The Redis
+backend keeps it on a server, so several server replicas behind a load
+balancer see the same configuration, cache and agent memory.
+
+The backend is picked with the UPSONIC_STORAGE_BACKEND environment variable,
+"sqlite" (the default) or "redis", with UPSONIC_REDIS_URL pointing at the
+Redis server.
+"""
+
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+try:
+    import redis
+    RedisError = redis.RedisError
+except ImportError:
+    redis = None
+    RedisError = Exception
+
+
+BACKEND_SQLITE = "sqlite"
+BACKEND_REDIS = "redis"
+SUPPORTED_BACKENDS = [BACKEND_SQLITE, BACKEND_REDIS]
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+
+# Marks a Redis list item holding raw bytes, which no JSON text starts with
+_RAW_PREFIX = b"\x00"
+
+
+class StorageBackend(ABC):
+    """
+    Key/value store of JSON values, with expiring keys and append-only lists.
+
+    Lists are indexed from 0 in append order and only shrink when the whole
+    key is deleted, so an index is a stable sequence number. List items may
+    also be bytes, which are stored as they are and read back as bytes.
+    """
+
+    @abstractmethod
+    def get(self, key, default=None):
+        """Get the value of a key, or the default if it is not set or has expired."""
+
+    @abstractmethod
+    def set(self, key, value, ttl: Optional[float] = None) -> bool:
+        """
+        Set the value of a key.
+
+        Args:
+            key: The key to set
+            value: Any JSON serializable value
+            ttl: Optional number of seconds after which the key expires
+
+        Returns:
+            True if the value was stored
+        """
+
+    @abstractmethod
+    def delete(self, key) -> bool:
+        """Delete a key, value or list, returning whether it existed."""
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with a prefix, returning how many there were."""
+
+    @abstractmethod
+    def append(self, key, values: list) -> int:
+        """
+        Atomically append values to the end of a list.
+
+        Args:
+            key: The key of the list
+            values: JSON serializable values or bytes to append
+
+        Returns:
+            The length of the list afterwards
+        """
+
+    @abstractmethod
+    def get_range(self, key, start: int = 0, end: int = -1) -> list:
+        """Get the list items from start to end, both included, where negative indexes count from the end."""
+
+    @abstractmethod
+    def length(self, key) -> int:
+        """Get the length of a list, 0 if it doesn't exist."""
+
+    def get_many(self, keys, default=None) -> Dict[str, Any]:
+        """Get several values, as a dict with every requested key."""
+        return {key: self.get(key, default) for key in keys}
+
+    def set_many(self, items, ttl: Optional[float] = None) -> bool:
+        """Set several values, returning True if every value was stored."""
+        return all([self.set(key, value, ttl) for key, value in items.items()])
+
+    def delete_many(self, keys) -> int:
+        """Delete several keys, returning the number that existed."""
+        return sum(1 for key in keys if self.delete(key))
+
+    def append_many(self, lists: Dict[str, list]) -> Dict[str, int]:
+        """
+        Append values to several lists, all or none of them.
+
+        Args:
+            lists: A dict of list keys and the values to append to each
+
+        Returns:
+            The length of each list afterwards
+        """
+        return {key: self.append(key, values) for key, values in lists.items()}
+
+    def initialize(self, key):
+        """Copy a value from the environment, or the .env file, into the store."""
+        load_dotenv()
+        value = os.getenv(key)
+        if value is not None:
+            self.set(key, value)
+
+    def clear_cache(self):
+        """Drop values cached in this process, for backends that cache reads."""
+
+    def flush(self):
+        """Write out anything the backend buffers."""
+
+    def dump(self):
+        self.flush()
+        return True
+
+    def close_all_connections(self):
+        """Close the connections of this process."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all_connections()
+
+
+class RedisBackend(StorageBackend):
+    """
+    Storage on a Redis server, shared by every process that uses the same URL and namespace.
+
+    Expiry uses Redis' own key TTLs and appends use RPUSH, so both are atomic
+    across replicas. Reads always go to the server; there is no local cache
+    that could go stale.
+    """
+
+    def __init__(self, url: str = DEFAULT_REDIS_URL, namespace: str = "upsonic", client: Any = None):
+        """
+        Args:
+            url: The Redis URL, e.g. redis://localhost:6379/0
+            namespace: Prefix of every key, so several stores can share one database
+            client: An already created redis.Redis compatible client to use instead of the URL
+        """
+        if client is None:
+            if redis is None:
+                raise ImportError(
+                    "The redis storage backend needs the redis package. Install it with: pip install 'upsonic[redis]'"
+                )
+            client = redis.Redis.from_url(url)
+        self.url = url
+        self.namespace = namespace
+        self._client = client
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    @staticmethod
+    def _dump_item(value) -> bytes:
+        if isinstance(value, bytes):
+            return _RAW_PREFIX + value
+        return json.dumps(value).encode("utf-8")
+
+    @staticmethod
+    def _load_item(value):
+        if value.startswith(_RAW_PREFIX):
+            return bytes(value[len(_RAW_PREFIX):])
+        return json.loads(value)
+
+    def get(self, key, default=None):
+        try:
+            value = self._client.get(self._key(key))
+            return json.loads(value) if value is not None else default
+        except (RedisError, json.JSONDecodeError) as e:
+            logging.error(f"Error retrieving key {key}: {e}")
+            return default
+
+    def get_many(self, keys, default=None):
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = self._client.mget([self._key(key) for key in keys])
+            return {key: json.loads(value) if value is not None else default for key, value in zip(keys, values)}
+        except (RedisError, json.JSONDecodeError) as e:
+            logging.error(f"Error retrieving keys {keys}: {e}")
+            return {key: default for key in keys}
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        try:
+            self._client.set(self._key(key), json.dumps(value), px=int(ttl * 1000) if ttl else None)
+            return True
+        except (RedisError, TypeError, ValueError) as e:
+            logging.error(f"Error setting key {key}: {e}")
+            return False
+
+    def set_many(self, items, ttl: Optional[float] = None):
+        try:
+            rows = [(self._key(key), json.dumps(value)) for key, value in items.items()]
+            with self._client.pipeline(transaction=True) as pipe:
+                for key, value_json in rows:
+                    pipe.set(key, value_json, px=int(ttl * 1000) if ttl else None)
+                pipe.execute()
+            return True
+        except (RedisError, TypeError, ValueError) as e:
+            logging.error(f"Error setting keys: {e}")
+            return False
+
+    def delete(self, key):
+        try:
+            return self._client.delete(self._key(key)) > 0
+        except RedisError as e:
+            logging.error(f"Error deleting key {key}: {e}")
+            return False
+
+    def delete_many(self, keys):
+        keys = [self._key(key) for key in keys]
+        if not keys:
+            return 0
+        try:
+            return self._client.delete(*keys)
+        except RedisError as e:
+            logging.error(f"Error deleting keys: {e}")
+            return 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        # Escape glob characters so the prefix is matched literally
+        pattern = "".join("\\" + char if char in "*?[]\\" else char for char in self._key(prefix)) + "*"
+        deleted = 0
+        batch = []
+        for key in self._client.scan_iter(match=pattern, count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                deleted += self._client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self._client.delete(*batch)
+        return deleted
+
+    def append(self, key, values: list) -> int:
+        if not values:
+            return self.length(key)
+        return self._client.rpush(self._key(key), *[self._dump_item(value) for value in values])
+
+    def append_many(self, lists: Dict[str, list]) -> Dict[str, int]:
+        lists = {key: values for key, values in lists.items() if values}
+        with self._client.pipeline(transaction=True) as pipe:
+            for key, values in lists.items():
+                pipe.rpush(self._key(key), *[self._dump_item(value) for value in values])
+            lengths = pipe.execute()
+        return dict(zip(lists, lengths))
+
+    def get_range(self, key, start: int = 0, end: int = -1) -> list:
+        return [self._load_item(value) for value in self._client.lrange(self._key(key), start, end)]
+
+    def length(self, key) -> int:
+        return self._client.llen(self._key(key))
+
+    def close_all_connections(self):
+        try:
+            self._client.close()
+        except RedisError as e:
+            logging.error(f"Error closing connection: {e}")
+
+
+def create_backend(name: str, backend: Optional[str] = None) -> StorageBackend:
+    """
+    Create the storage backend configured for this process.
+
+    Args:
+        name: Name of the store, the SQLite file name without extension or the Redis namespace
+        backend: "sqlite" or "redis", by default the UPSONIC_STORAGE_BACKEND environment variable
+
+    Returns:
+        The backend
+    """
+    load_dotenv()
+    backend = (backend or os.getenv("UPSONIC_STORAGE_BACKEND", BACKEND_SQLITE)).lower()
+    if backend == BACKEND_REDIS:
+        return RedisBackend(
+            url=os.getenv("UPSONIC_REDIS_URL", DEFAULT_REDIS_URL),
+            namespace=f"upsonic:{name}",
+        )
+    if backend == BACKEND_SQLITE:
+        # Imported here because the SQLite backend is built on this module's base class
+        from .configuration import ConfigManager
+        return ConfigManager(db_name=f"{name}.sqlite")
+    raise ValueError(f"Unsupported storage backend: {backend}. Use one of {SUPPORTED_BACKENDS}")
@@ -1,73 +1,529 @@
 """
-Module for handling caching of data using SQLite.
+Module for handling caching of data in the storage backend.
 """
 
 import cloudpickle
 cloudpickle.DEFAULT_PROTOCOL = 2
-import dill
+import asyncio
 import base64
+import dill
+import logging
+import sqlite3
+import threading
 import time
-from typing import Optional, Any
-from .configuration import ClientConfiguration
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict
+from .backends import StorageBackend
+from .configuration import ConfigManager, ClientConfiguration
+
+
+_SELECT_SQL = 'SELECT value, expiry_time, last_access FROM cache_store WHERE key = ?'
+_REPLACE_SQL = '''
+    REPLACE INTO cache_store (key, value, size, expiry_time, created_at, last_access)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_TOUCH_SQL = 'UPDATE cache_store SET last_access = ? WHERE key = ?'
+_DELETE_SQL = 'DELETE FROM cache_store WHERE key = ?'
+_DELETE_EXPIRED_SQL = 'DELETE FROM cache_store WHERE expiry_time < ?'
+_TOTALS_SQL = 'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_store'
+# Entries of older versions: "cache_" and the cache key in the config table, holding a JSON
+# string of a base64 cloudpickle, which starts with "gAJ" for protocol 2
+_DELETE_LEGACY_SQL = '''
+    DELETE FROM config_store
+    WHERE key LIKE 'cache\\_%' ESCAPE '\\' AND key NOT LIKE 'cache\\_store\\_%' ESCAPE '\\' AND value LIKE '"gAJ%'
+'''
+
+# Version of the cache table's schema, kept in cache_store_meta
+_SCHEMA_VERSION = 1
+
+# Key prefix of the entries on backends other than SQLite
+_KEY_PREFIX = "cache_store_"
+
+
+class CacheStore:
+    """
+    Expiring cache kept in its own table next to a ConfigManager's store.
+
+    Values are stored as raw cloudpickle BLOBs. Expired entries are purged
+    periodically by a background thread, and each set evicts the least
+    recently used entries once the table grows past max_entries or max_bytes.
+
+    On other storage backends, entries are keys with the backend's own
+    expiry, and size limits are left to the backend (e.g. Redis' maxmemory
+    policy).
+
+    A small in-process LRU sits in front of the table, and get_or_compute
+    makes concurrent misses for one key wait on a single computation.
+    Values served from memory are shared, so treat them as read only. On
+    SQLite the in-process tier is dropped whenever the ConfigManager's read
+    cache sees another process write to the database, so it serves entries
+    another process replaced or deleted for at most the ConfigManager's
+    cache_check_interval. It is off by default on other backends, which
+    have no such check.
+    """
+
+    def __init__(
+        self,
+        config: StorageBackend,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        purge_interval: float = 300.0,
+        touch_interval: float = 60.0,
+        memory_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            config: The storage backend, a ConfigManager holds the entries in a cache table
+            max_entries: Number of entries kept before the least recently used are evicted
+            max_bytes: Total size of the stored values kept before eviction
+            purge_interval: Seconds between background purges
+            touch_interval: Minimum seconds between last access updates of an entry,
+                so reads don't turn into a write every time
+            memory_entries: Number of entries kept in the in-process tier, 0 to disable it.
+                By default 256 on a ConfigManager and 0 on shared backends
+        """
+        self.config = config
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.purge_interval = purge_interval
+        self.touch_interval = touch_interval
+        self._table = isinstance(config, ConfigManager)
+        if memory_entries is None:
+            memory_entries = 256 if self._table else 0
+        self.memory_entries = memory_entries
+
+        # key -> [expiry_time, data, last time the table's last_access was updated], most recently used last
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        # The ConfigManager's cache generation the memory tier was filled in
+        self._memory_generation = None
+        # Computations in progress, for get_or_compute and get_or_compute_async
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._inflight_tasks = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "memory_hits": 0, "misses": 0, "expired": 0, "evictions": 0, "deduplicated": 0}
+        self._purger = None
+        self._purger_lock = threading.Lock()
+        if self._table:
+            self._setup_database()
+
+    def _setup_database(self):
+        with self.config._writing() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_store (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expiry_time INTEGER NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_store_expiry ON cache_store (expiry_time)')
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_store_last_access ON cache_store (last_access)')
+            # Lets set read the table's totals from an index instead of going through the values
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_store_size ON cache_store (size)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_store_meta (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+            row = conn.execute("SELECT value FROM cache_store_meta WHERE name = 'schema_version'").fetchone()
+            migrate = row is None or row[0] < _SCHEMA_VERSION
+            if migrate:
+                # Entries written by older versions live in the config table and never expired there
+                conn.execute(_DELETE_LEGACY_SQL)
+                conn.execute("REPLACE INTO cache_store_meta (name, value) VALUES ('schema_version', ?)", (_SCHEMA_VERSION,))
+        self.config.flush()
+        if migrate:
+            self.config.clear_cache()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _remember(self, cache_key: str, data: Any, expiry_time: int, touched: float):
+        if self.memory_entries <= 0:
+            return
+        with self._memory_lock:
+            self._memory[cache_key] = [expiry_time, data, touched]
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _check_memory(self):
+        """Drop the memory tier if another process wrote to the database since it was filled."""
+        if not self._table:
+            return
+        self.config._check_cache()
+        generation = self.config._cache_generation
+        if generation != self._memory_generation:
+            with self._memory_lock:
+                self._memory.clear()
+                self._memory_generation = generation
+
+    def _recall(self, cache_key: str):
+        """Return the entry of a key from the memory tier, or None."""
+        if self.memory_entries <= 0:
+            return None
+        self._check_memory()
+        with self._memory_lock:
+            entry = self._memory.get(cache_key)
+            if entry is None:
+                return None
+            if int(time.time()) > entry[0]:
+                del self._memory[cache_key]
+                return None
+            self._memory.move_to_end(cache_key)
+            return entry
+
+    def _forget(self, cache_key: Optional[str] = None):
+        with self._memory_lock:
+            if cache_key is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(cache_key, None)
+
+    def _ensure_purger(self):
+        """Start the background purge thread on first use."""
+        if not self._table or self.purge_interval <= 0 or (self._purger is not None and self._purger.is_alive()):
+            return
+        with self._purger_lock:
+            if self._purger is not None and self._purger.is_alive():
+                return
+
+            def run():
+                while True:
+                    time.sleep(self.purge_interval)
+                    try:
+                        self.purge()
+                    except Exception as e:
+                        logging.error(f"Error purging cache: {e}")
+
+            self._purger = threading.Thread(target=run, name="upsonic-cache-purge", daemon=True)
+            self._purger.start()
+
+    def set(self, cache_key: str, data: Any, expiry_seconds: int) -> None:
+        """
+        Store a value until it expires.
+
+        Args:
+            cache_key: Unique identifier for the cached data
+            data: Any picklable data
+            expiry_seconds: Number of seconds until the entry expires
+        """
+        self._ensure_purger()
+        the_module = dill.detect.getmodule(data)
+        if the_module is not None:
+            cloudpickle.register_pickle_by_value(the_module)
+
+        value = cloudpickle.dumps(data)
+        now = time.time()
+        if self._table:
+            with self.config._writing() as conn:
+                conn.execute(_REPLACE_SQL, (cache_key, value, len(value), int(now) + expiry_seconds, int(now), now))
+                evicted = self._evict(conn)
+            self._evicted(evicted)
+        else:
+            self.config.set(
+                _KEY_PREFIX + cache_key,
+                {"value": base64.b64encode(value).decode('utf-8'), "expiry_time": int(now) + expiry_seconds},
+                ttl=expiry_seconds,
+            )
+        self._remember(cache_key, data, int(now) + expiry_seconds, now)
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        """
+        Get a value if it is stored and has not expired.
+
+        Args:
+            cache_key: Unique identifier for the cached data
+
+        Returns:
+            The cached data, or None
+        """
+        self._ensure_purger()
+        entry = self._recall(cache_key)
+        if entry is not None:
+            self._count("hits")
+            self._count("memory_hits")
+            # Keep the table's LRU order in step with reads served from memory
+            self._touch(cache_key, entry[2])
+            return entry[1]
+
+        row = self._load(cache_key)
+        if row is None:
+            self._count("misses")
+            return None
+
+        value, expiry_time, last_access = row
+        now = time.time()
+        if int(now) > expiry_time:
+            self._count("misses")
+            self._count("expired")
+            self.delete(cache_key)
+            return None
+
+        try:
+            data = cloudpickle.loads(value)
+        except Exception:
+            self._count("misses")
+            self.delete(cache_key)
+            return None
+
+        self._count("hits")
+        self._remember(cache_key, data, expiry_time, last_access)
+        self._touch(cache_key, last_access)
+        return data
+
+    def _load(self, cache_key: str):
+        """Return the pickled value, expiry time and last access time of an entry, or None."""
+        if self._table:
+            with self.config._get_connection() as conn:
+                return conn.execute(_SELECT_SQL, (cache_key,)).fetchone()
+        entry = self.config.get(_KEY_PREFIX + cache_key)
+        if entry is None:
+            return None
+        # The backend expires the key itself, so it has no last access time to keep up to date
+        return base64.b64decode(entry["value"]), entry["expiry_time"], float("inf")
+
+    def _touch(self, cache_key: str, last_access: float):
+        """Update the last access time of an entry if it is older than touch_interval."""
+        now = time.time()
+        if not self._table or now - last_access < self.touch_interval:
+            return
+        with self.config._writing() as conn:
+            conn.execute(_TOUCH_SQL, (now, cache_key))
+        with self._memory_lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                entry[2] = now
+
+    def get_or_compute(self, cache_key: str, compute: Callable[[], Any], expiry_seconds: int) -> Any:
+        """
+        Get a value, computing and storing it on a miss.
+
+        Threads that miss the same key while it is being computed wait for
+        that computation instead of starting their own.
+
+        Args:
+            cache_key: Unique identifier for the cached data
+            compute: Called without arguments to produce the value
+            expiry_seconds: Number of seconds until the entry expires
+
+        Returns:
+            The cached or computed value
+        """
+        data = self.get(cache_key)
+        if data is not None:
+            return data
+
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = {"done": threading.Event()}
+                self._inflight[cache_key] = flight
+
+        if not leader:
+            self._count("deduplicated")
+            flight["done"].wait()
+            if "error" in flight:
+                raise flight["error"]
+            return flight["result"]
+
+        try:
+            # The previous leader may have stored the value between our miss and taking its place
+            data = self.get(cache_key)
+            if data is not None:
+                flight["result"] = data
+                return data
+            flight["result"] = compute()
+            if flight["result"] is not None:
+                self.set(cache_key, flight["result"], expiry_seconds)
+            return flight["result"]
+        except BaseException as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            flight["done"].set()
+
+    async def get_or_compute_async(self, cache_key: str, compute: Callable[[], Awaitable[Any]], expiry_seconds: int) -> Any:
+        """
+        Asynchronous version of get_or_compute for coroutine computations.
+
+        Coroutines on the same event loop that miss the same key share one
+        task; a waiter that gets cancelled doesn't cancel the computation.
+
+        Args:
+            cache_key: Unique identifier for the cached data
+            compute: Called without arguments to produce an awaitable of the value
+            expiry_seconds: Number of seconds until the entry expires
+
+        Returns:
+            The cached or computed value
+        """
+        data = self.get(cache_key)
+        if data is not None:
+            return data
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), cache_key)
+        with self._inflight_lock:
+            task = self._inflight_tasks.get(flight_key)
+            if task is None:
+                async def run():
+                    try:
+                        result = await compute()
+                        if result is not None:
+                            self.set(cache_key, result, expiry_seconds)
+                        return result
+                    finally:
+                        with self._inflight_lock:
+                            self._inflight_tasks.pop(flight_key, None)
+
+                task = loop.create_task(run())
+                self._inflight_tasks[flight_key] = task
+            else:
+                self._count("deduplicated")
+
+        return await asyncio.shield(task)
+
+    def delete(self, cache_key: str) -> None:
+        """Remove an entry."""
+        self._forget(cache_key)
+        if not self._table:
+            self.config.delete(_KEY_PREFIX + cache_key)
+            return
+        with self.config._writing() as conn:
+            conn.execute(_DELETE_SQL, (cache_key,))
+
+    def purge(self) -> int:
+        """
+        Delete expired entries, then evict the least recently used ones over the limits.
+
+        Returns:
+            The number of entries removed
+        """
+        if not self._table:
+            return 0
+        with self.config._writing() as conn:
+            expired = conn.execute(_DELETE_EXPIRED_SQL, (int(time.time()),)).rowcount
+            evicted = self._evict(conn)
+
+        self._evicted(evicted)
+        self._count("expired", expired)
+        return expired + len(evicted)
+
+    def _evict(self, conn) -> list:
+        """Delete the least recently used entries while the table is over max_entries or max_bytes."""
+        count, total_size = conn.execute(_TOTALS_SQL).fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return []
+        evict = []
+        for key, size in conn.execute('SELECT key, size FROM cache_store ORDER BY last_access').fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            evict.append((key,))
+            count -= 1
+            total_size -= size
+        conn.executemany(_DELETE_SQL, evict)
+        return evict
+
+    def _evicted(self, evicted: list):
+        """Drop evicted entries from the memory tier and count them."""
+        if not evicted:
+            return
+        with self._memory_lock:
+            for (key,) in evicted:
+                self._memory.pop(key, None)
+        self._count("evictions", len(evicted))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._forget()
+        if not self._table:
+            self.config.delete_prefix(_KEY_PREFIX)
+            return
+        with self.config._writing() as conn:
+            conn.execute('DELETE FROM cache_store')
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit, miss, expiry and eviction counters of this process,
+        with the current number of entries and their total size when the
+        backend keeps track of them.
+        """
+        entries = total_size = None
+        if self._table:
+            with self.config._get_connection() as conn:
+                entries, total_size = conn.execute(_TOTALS_SQL).fetchone()
+        with self._stats_lock:
+            return {**self._stats, "entries": entries, "bytes": total_size}
+
+
+Cache = CacheStore(ClientConfiguration)
 
 
 def save_to_cache_with_expiry(data: Any, cache_key: str, expiry_seconds: int) -> None:
     """
     Save data to cache with expiration time.
-    
+
     Args:
         data: Any data to store in cache
         cache_key: Unique identifier for the cached data
         expiry_seconds: Number of seconds until the cache expires
     """
-    the_module = dill.detect.getmodule(data)
-    if the_module is not None:
-        cloudpickle.register_pickle_by_value(the_module)
-        
-    current_time = int(time.time())
-    expiry_time = current_time + expiry_seconds
-    cache_key_full = f"cache_{cache_key}"
-    
-    cache_data = {
-        'data': data,
-        'expiry_time': expiry_time,
-        'created_at': current_time
-    }
-    
-    try:
-        ClientConfiguration.delete(cache_key_full)
-        serialized_data = base64.b64encode(cloudpickle.dumps(cache_data)).decode('utf-8')
-        ClientConfiguration.set(cache_key_full, serialized_data)
-    except Exception:
-        ClientConfiguration.delete(cache_key_full)
-        raise
+    Cache.set(cache_key, data, expiry_seconds)
 
 
 def get_from_cache_with_expiry(cache_key: str) -> Optional[Any]:
     """
     Retrieve data from cache if not expired.
-    
+
     Args:
         cache_key: Unique identifier for the cached data
-        
+
     Returns:
         Cached data if found and not expired, None otherwise
     """
-    cache_key_full = f"cache_{cache_key}"
-    serialized_data = ClientConfiguration.get(cache_key_full)
-
-    if serialized_data is None:
-        return None
-    
     try:
-        cache_data = cloudpickle.loads(base64.b64decode(serialized_data))
-        current_time = int(time.time())
-        
-        if current_time > cache_data['expiry_time']:
-            ClientConfiguration.delete(cache_key_full)
-            return None
+        return Cache.get(cache_key)
+    except sqlite3.Error as e:
+        logging.error(f"Error reading cache key {cache_key}: {e}")
+        return None
+
+
+def get_or_compute_with_expiry(cache_key: str, compute: Callable[[], Any], expiry_seconds: int) -> Any:
+    """
+    Get data from cache, computing it once on a miss even if several threads miss together.
+
+    Args:
+        cache_key: Unique identifier for the cached data
+        compute: Called without arguments to produce the data
+        expiry_seconds: Number of seconds until the cache expires
 
-        return cache_data['data']
-    except Exception:
-        ClientConfiguration.delete(cache_key_full)
-        return None
\ No newline at end of file
+    Returns:
+        The cached or computed data
+    """
+    return Cache.get_or_compute(cache_key, compute, expiry_seconds)
+
+
+async def get_or_compute_with_expiry_async(cache_key: str, compute: Callable[[], Awaitable[Any]], expiry_seconds: int) -> Any:
+    """
+    Asynchronous version of get_or_compute_with_expiry for coroutine computations.
+
+    Args:
+        cache_key: Unique identifier for the cached data
+        compute: Called without arguments to produce an awaitable of the data
+        expiry_seconds: Number of seconds until the cache expires
+
+    Returns:
+        The cached or computed data
+    """
+    return await Cache.get_or_compute_async(cache_key, compute, expiry_seconds)
@@ -1,19 +1,74 @@
 import os
 import sqlite3
 import json
-from dotenv import load_dotenv
 import signal
 import sys
 import threading
 import logging
+import time
 from contextlib import contextmanager
+from typing import Optional
 from .folder import BASE_PATH
+from .backends import StorageBackend, create_backend
 
 
-class ConfigManager:
-    def __init__(self, db_name="config.sqlite"):
+# Statements are kept as constants so sqlite3's statement cache prepares each one once per connection
+_SELECT_SQL = 'SELECT value, expires_at FROM config_store WHERE key = ?'
+_REPLACE_SQL = 'REPLACE INTO config_store (key, value, expires_at) VALUES (?, ?, ?)'
+_DELETE_SQL = 'DELETE FROM config_store WHERE key = ?'
+_APPEND_SQL = '''
+    INSERT INTO storage_lists (key, seq, value)
+    SELECT ?, COALESCE(MAX(seq), -1) + 1, ? FROM storage_lists WHERE key = ?
+'''
+_RANGE_SQL = 'SELECT value FROM storage_lists WHERE key = ? AND seq >= ? AND seq <= ? ORDER BY seq'
+_LENGTH_SQL = 'SELECT COALESCE(MAX(seq), -1) + 1 FROM storage_lists WHERE key = ?'
+_DELETE_LIST_SQL = 'DELETE FROM storage_lists WHERE key = ?'
+
+# Cached marker for keys known to be absent
+_MISSING = object()
+# Values that are safe to hand out from the cache without copying
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+class ConfigManager(StorageBackend):
+    def __init__(self, db_name="config.sqlite", commit_interval: float = 0.0, cache_check_interval: float = 0.5):
+        """
+        Storage backend on SQLite in WAL mode, shared by the processes of one machine.
+
+        Reads use a connection per thread, which WAL lets run alongside writes.
+        Writes go through one shared connection so threads never fight over
+        the write lock.
+
+        Reads are cached in the process. Its own writes update the cache, and
+        writes from other processes clear it when they are noticed, at most
+        cache_check_interval seconds later: until then a read may return a
+        value another process has already replaced or deleted.
+
+        Args:
+            db_name: File name of the database, relative to the storage folder
+            commit_interval: Seconds to group writes into one commit. With 0 every
+                write is committed at once; with more, writes from other
+                connections and processes become visible when the group commits.
+            cache_check_interval: Seconds between checks for writes made by other
+                processes, which clear the read cache. With 0 every read checks.
+        """
         self.db_path = os.path.join(BASE_PATH, db_name)
+        self.commit_interval = commit_interval
         self._local = threading.local()
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._flush_timer = None
+
+        # Read-through cache. Writes made here update it directly; writes from
+        # other connections change the writer's PRAGMA data_version, which clears it.
+        self.cache_check_interval = cache_check_interval
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._data_version = None
+        self._next_cache_check = 0.0
+        # Bumped whenever writes from elsewhere clear the cache, for caches layered on this one
+        self._cache_generation = 0
+
         self._setup_database()
         
         # Only set up signal handlers if we're in the main thread
@@ -25,20 +80,42 @@ class ConfigManager:
                 # Ignore signal handling errors if we can't set them up
                 pass
 
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        # WAL lets readers run during a write and turns a commit into an append,
+        # and with NORMAL it is only synced at checkpoints instead of on every commit.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
     def _setup_database(self):
-        with self._get_connection() as conn:
+        with self._writing() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS config_store (
                     key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
+                    value TEXT NOT NULL,
+                    expires_at REAL
                 )
             ''')
-            conn.commit()
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(config_store)')]
+            if 'expires_at' not in columns:
+                # Databases created by older versions have no expiry
+                conn.execute('ALTER TABLE config_store ADD COLUMN expires_at REAL')
+            conn.execute('DELETE FROM config_store WHERE expires_at < ?', (time.time(),))
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS storage_lists (
+                    key TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (key, seq)
+                ) WITHOUT ROWID
+            ''')
+        self.flush()
 
     @contextmanager
     def _get_connection(self):
         if not hasattr(self._local, 'conn'):
-            self._local.conn = sqlite3.connect(self.db_path)
+            self._local.conn = self._connect()
         try:
             yield self._local.conn
         except sqlite3.Error as e:
@@ -48,6 +125,115 @@ class ConfigManager:
             logging.error(f"Unexpected error: {e}")
             raise
 
+    @contextmanager
+    def _reading(self):
+        """
+        Yield a connection to read with.
+
+        While a group commit is pending that is the writer, the only connection
+        that sees this process's uncommitted writes; otherwise the thread's own.
+        """
+        if self._flush_timer is not None:
+            with self._write_lock:
+                if self._flush_timer is not None and self._writer is not None:
+                    yield self._writer
+                    return
+        with self._get_connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _writing(self):
+        """Hold the shared write connection, committing or scheduling a group commit afterwards."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            grouped = self.commit_interval > 0
+            if grouped:
+                # A savepoint per block, so a failed block is undone without
+                # dropping the other writes waiting for the group commit
+                if not self._writer.in_transaction:
+                    self._writer.execute('BEGIN')
+                self._writer.execute('SAVEPOINT write_block')
+            try:
+                yield self._writer
+            except Exception as e:
+                logging.error(f"Database error: {e}")
+                if grouped:
+                    self._writer.execute('ROLLBACK TO write_block')
+                    self._writer.execute('RELEASE write_block')
+                else:
+                    self._writer.rollback()
+                raise
+            if grouped:
+                self._writer.execute('RELEASE write_block')
+
+            if self.commit_interval <= 0:
+                self._writer.commit()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.commit_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _check_cache(self):
+        """Clear the cache if another connection committed since the last check."""
+        now = time.monotonic()
+        if now < self._next_cache_check:
+            return
+        # The write lock comes first, as in _writing, which updates the cache while holding it
+        with self._write_lock, self._cache_lock:
+            if now < self._next_cache_check:
+                return
+            if self._writer is None:
+                self._writer = self._connect()
+            # The writer's data_version changes whenever any other connection, in
+            # this or another process, commits, but not when the writer itself
+            # does, so this process's own writes keep the entries they updated
+            version = self._writer.execute('PRAGMA data_version').fetchone()[0]
+            if version != self._data_version:
+                self._cache.clear()
+                self._cache_generation += 1
+                self._data_version = version
+            self._next_cache_check = now + self.cache_check_interval
+
+    def _cache_get(self, key, default):
+        """Return the cached value of a key, the default if it is cached as absent, or _MISSING."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            return _MISSING
+        kind, value, expires_at = cached
+        if kind == "absent" or (expires_at is not None and expires_at <= time.time()):
+            return default
+        if kind == "json":
+            # Containers are cached encoded so callers can't mutate the cached copy
+            return json.loads(value)
+        return value
+
+    def _cache_put(self, key, value_json, expires_at=None):
+        """Cache the stored JSON of a key and its expiry time, or None if the key is absent."""
+        if value_json is None:
+            entry = ("absent", None, None)
+        else:
+            value = json.loads(value_json)
+            kind = "value" if isinstance(value, _IMMUTABLE_TYPES) else "json"
+            entry = (kind, value if kind == "value" else value_json, expires_at)
+        with self._cache_lock:
+            self._cache[key] = entry
+
+    def clear_cache(self):
+        """Drop every cached value."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def flush(self):
+        """Commit any writes waiting for the group commit."""
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._writer is not None:
+                self._writer.commit()
+
     def _handle_signal(self, signum, frame):
         self.close_all_connections()
         try:
@@ -56,76 +242,213 @@ class ConfigManager:
             os._exit(0)
 
     def close_all_connections(self):
+        with self._write_lock:
+            try:
+                self.flush()
+                if self._writer is not None:
+                    self._writer.close()
+            except Exception as e:
+                logging.error(f"Error committing pending writes: {e}")
+            self._writer = None
+        with self._cache_lock:
+            self._data_version = None
+            self._next_cache_check = 0.0
         if hasattr(self._local, 'conn'):
             try:
-                self._local.conn.commit()
                 self._local.conn.close()
                 del self._local.conn
             except Exception as e:
                 logging.error(f"Error closing connection: {e}")
 
-    def initialize(self, key):
-        load_dotenv()
-        value = os.getenv(key)
-        if value is not None:
-            self.set(key, value)
-
     def get(self, key, default=None):
+        self._check_cache()
+        value = self._cache_get(key, default)
+        if value is not _MISSING:
+            return value
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT value FROM config_store WHERE key = ?', (key,))
-                result = cursor.fetchone()
-                return json.loads(result[0]) if result else default
+            with self._reading() as conn:
+                result = conn.execute(_SELECT_SQL, (key,)).fetchone()
+            self._cache_put(key, *(result or (None,)))
+            if result is None or (result[1] is not None and result[1] <= time.time()):
+                return default
+            return json.loads(result[0])
         except (sqlite3.Error, json.JSONDecodeError) as e:
             logging.error(f"Error retrieving key {key}: {e}")
             return default
 
+    def get_many(self, keys, default=None):
+        """
+        Get several values in one query.
+
+        Args:
+            keys: The keys to look up
+            default: Value used for keys that are not set
+
+        Returns:
+            A dict with every requested key
+        """
+        self._check_cache()
+        values = {}
+        uncached = []
+        for key in keys:
+            values[key] = self._cache_get(key, default)
+            if values[key] is _MISSING:
+                values[key] = default
+                uncached.append(key)
+        if not uncached:
+            return values
+        try:
+            with self._reading() as conn:
+                placeholders = ", ".join("?" * len(uncached))
+                rows = {
+                    key: (value, expires_at) for key, value, expires_at in conn.execute(
+                        f'SELECT key, value, expires_at FROM config_store WHERE key IN ({placeholders})', uncached
+                    ).fetchall()
+                }
+            now = time.time()
+            for key in uncached:
+                value_json, expires_at = rows.get(key, (None, None))
+                self._cache_put(key, value_json, expires_at)
+                if value_json is not None and (expires_at is None or expires_at > now):
+                    values[key] = json.loads(value_json)
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logging.error(f"Error retrieving keys {uncached}: {e}")
+        return values
+
     def delete(self, key):
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM config_store WHERE key = ?', (key,))
-                conn.commit()
-                return cursor.rowcount > 0
+            with self._writing() as conn:
+                cursor = conn.execute(_DELETE_SQL, (key,))
+                list_cursor = conn.execute(_DELETE_LIST_SQL, (key,))
+                self._cache_put(key, None)
+            return cursor.rowcount > 0 or list_cursor.rowcount > 0
         except sqlite3.Error as e:
             logging.error(f"Error deleting key {key}: {e}")
             return False
 
-    def set(self, key, value):
+    def delete_many(self, keys):
+        """
+        Delete several keys in one transaction.
+
+        Args:
+            keys: The keys to delete
+
+        Returns:
+            The number of keys that existed
+        """
+        keys = list(keys)
+        try:
+            with self._writing() as conn:
+                cursor = conn.executemany(_DELETE_SQL, [(key,) for key in keys])
+                conn.executemany(_DELETE_LIST_SQL, [(key,) for key in keys])
+                for key in keys:
+                    self._cache_put(key, None)
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logging.error(f"Error deleting keys: {e}")
+            return 0
+
+    def set(self, key, value, ttl: Optional[float] = None):
         try:
             value_json = json.dumps(value)
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('REPLACE INTO config_store (key, value) VALUES (?, ?)',
-                          (key, value_json))
-                conn.commit()
-                return True
-        except (sqlite3.Error, json.JSONEncodeError) as e:
+            expires_at = time.time() + ttl if ttl else None
+            with self._writing() as conn:
+                conn.execute(_REPLACE_SQL, (key, value_json, expires_at))
+                self._cache_put(key, value_json, expires_at)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
             logging.error(f"Error setting key {key}: {e}")
             return False
 
+    def set_many(self, items, ttl: Optional[float] = None):
+        """
+        Set several values in one transaction.
+
+        Args:
+            items: A dict of keys and values
+            ttl: Optional number of seconds after which the keys expire
+
+        Returns:
+            True if every value was stored, False if none were
+        """
+        try:
+            expires_at = time.time() + ttl if ttl else None
+            rows = [(key, json.dumps(value), expires_at) for key, value in items.items()]
+            with self._writing() as conn:
+                conn.executemany(_REPLACE_SQL, rows)
+                for key, value_json, _ in rows:
+                    self._cache_put(key, value_json, expires_at)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logging.error(f"Error setting keys: {e}")
+            return False
+
+    def delete_prefix(self, prefix):
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        with self._writing() as conn:
+            deleted = conn.execute("DELETE FROM config_store WHERE key LIKE ? ESCAPE '\\'", (pattern,)).rowcount
+            deleted += conn.execute(
+                "SELECT COUNT(DISTINCT key) FROM storage_lists WHERE key LIKE ? ESCAPE '\\'", (pattern,)
+            ).fetchone()[0]
+            conn.execute("DELETE FROM storage_lists WHERE key LIKE ? ESCAPE '\\'", (pattern,))
+        self.clear_cache()
+        return deleted
+
+    def append(self, key, values):
+        if not values:
+            return self.length(key)
+        return self.append_many({key: values})[key]
+
+    def append_many(self, lists):
+        """
+        Append values to several lists in one transaction.
+
+        Args:
+            lists: A dict of list keys and the values to append to each
+
+        Returns:
+            The length of each list afterwards
+        """
+        # Bytes are stored as BLOBs, everything else as JSON text
+        rows = [
+            (key, value if isinstance(value, bytes) else json.dumps(value), key)
+            for key, values in lists.items() for value in values
+        ]
+        with self._writing() as conn:
+            conn.executemany(_APPEND_SQL, rows)
+            return {key: conn.execute(_LENGTH_SQL, (key,)).fetchone()[0] for key in lists}
+
+    def get_range(self, key, start=0, end=-1):
+        if start < 0 or end < 0:
+            length = self.length(key)
+            start = max(start + length, 0) if start < 0 else start
+            end = end + length if end < 0 else end
+        with self._reading() as conn:
+            rows = conn.execute(_RANGE_SQL, (key, start, end)).fetchall()
+        return [value if isinstance(value, bytes) else json.loads(value) for value, in rows]
+
+    def length(self, key):
+        with self._reading() as conn:
+            return conn.execute(_LENGTH_SQL, (key,)).fetchone()[0]
+
     def dump(self):
         try:
-            with self._get_connection() as conn:
-                conn.commit()
-                return True
+            self.flush()
+            return True
         except sqlite3.Error as e:
             logging.error(f"Error dumping database: {e}")
             return False
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close_all_connections()
-
     def __del__(self):
-        self.close_all_connections()
+        if hasattr(self, '_write_lock'):
+            self.close_all_connections()
+
 
+# The SQLite backend
+SQLiteBackend = ConfigManager
 
-# Create a single instance of ConfigManager
-Configuration = ConfigManager()
+# Create a single instance of the configured storage backend
+Configuration = create_backend("config")
 
 Configuration.initialize("OPENAI_API_KEY")
 Configuration.initialize("ANTHROPIC_API_KEY")
@@ -139,4 +462,4 @@ Configuration.initialize("DEEPSEEK_API_KEY")
 Configuration.initialize("GOOGLE_GLA_API_KEY")
 Configuration.initialize("OPENROUTER_API_KEY")
 
-ClientConfiguration = ConfigManager(db_name="client_config.sqlite")
\ No newline at end of file
+ClientConfiguration = create_backend("client_config")
\ No newline at end of file
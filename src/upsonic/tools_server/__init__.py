@@ -1,4 +1,7 @@
-from ..server_manager import ServerManager
+import os
+from typing import Optional
+
+from ..server_manager import ServerManager, workers_from_env
 from multiprocessing import freeze_support
 
 _server_manager = ServerManager(
@@ -8,18 +11,47 @@ _server_manager = ServerManager(
     name="tools"
 )
 
-def run_tools_server(redirect_output: bool = False):
+# Registry created for the tools server started by this process, dropped when it is stopped
+_launched_registry = None
+
+def _registry_env() -> dict:
+    """Environment giving every worker of a new tools server the same, empty tool registry."""
+    global _launched_registry
+    from .server.registry import REGISTRY_ENV, new_registry
+    # A fixed registry name keeps registrations across restarts, e.g. for replicas sharing Redis
+    if os.getenv(REGISTRY_ENV):
+        return {REGISTRY_ENV: os.getenv(REGISTRY_ENV)}
+    _launched_registry = new_registry()
+    return {REGISTRY_ENV: _launched_registry}
+
+def _workers_env(workers: int) -> dict:
+    """Environment telling the workers how many of them there are, e.g. to reject limits they can't enforce."""
+    return {"UPSONIC_TOOLS_WORKERS": str(workers)}
+
+def run_tools_server(redirect_output: bool = False, workers: Optional[int] = None):
     """Start the tools server if it's not already running."""
-    _server_manager.start(redirect_output=redirect_output)
+    if _server_manager.is_running():
+        return
+    workers = workers or _server_manager.workers
+    _server_manager.start(redirect_output=redirect_output, workers=workers, env={**_registry_env(), **_workers_env(workers)})
 
-def run_tools_server_internal(reload: bool = True):
-    """Run the tools server directly (for development)"""
+def run_tools_server_internal(reload: bool = True, workers: Optional[int] = None):
+    """Run the tools server directly (for development), with several worker processes if workers > 1"""
     import uvicorn
-    uvicorn.run("upsonic.tools_server.server.api:app", host="localhost", port=8086, reload=reload)
+    workers = workers or workers_from_env("tools")
+    os.environ.update({**_registry_env(), **_workers_env(workers)})
+    # uvicorn can't reload and run several workers at once
+    uvicorn.run("upsonic.tools_server.server.api:app", host="localhost", port=8086,
+                reload=reload and workers == 1, workers=workers)
 
 def stop_tools_server():
     """Stop the tools server if it's running."""
+    global _launched_registry
     _server_manager.stop()
+    if _launched_registry is not None:
+        from .server.registry import drop_current_registry
+        drop_current_registry(_launched_registry)
+        _launched_registry = None
 
 def is_tools_server_running() -> bool:
     """Check if the tools server is currently running."""
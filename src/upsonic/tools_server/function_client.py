@@ -1,12 +1,46 @@
+import asyncio
 import httpx
-from typing import Dict, List, Any, Callable, Optional
+import logging
+import threading
+import weakref
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from functools import wraps
 import inspect
 
 
+logger = logging.getLogger(__name__)
+
+
+# Pooled async clients for talking to the tools server, one per event loop
+# since httpx.AsyncClient connections are bound to the loop that opened them.
+_async_http_clients = weakref.WeakKeyDictionary()
+_async_http_clients_lock = threading.Lock()
+
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _async_http_clients_lock:
+        client = _async_http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=600.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+            _async_http_clients[loop] = client
+        return client
+
+
 class FunctionToolManager:
     """Client for interacting with the Upsonic Functions API."""
 
+    # Tool functions built from the catalog, shared by every manager and kept
+    # until the tools server reports a different catalog version.
+    _catalog_version: Optional[Tuple[str, int]] = None
+    _catalog_tools: List[Callable[..., Dict[str, Any]]] = []
+    _catalog_async_tools: List[Callable[..., Any]] = []
+    _catalog_lock = threading.Lock()
+
     def __init__(self):
         """Initialize the Upsonic Function client."""
         self.base_url = "http://localhost:8086"
@@ -21,8 +55,32 @@ class FunctionToolManager:
         Returns:
             List of matching tools
         """
+        if not name:
+            return []
+        return self._match_tools(self.cached_tools(), name)
+
+    async def get_tools_by_name_async(self, name: list[str]):
+        """
+        Asynchronous version of get_tools_by_name.
+
+        The returned tools are coroutine functions that call the tools server
+        through the shared pooled client, so concurrent agent runs don't wait
+        on each other's tool calls.
+
+        Args:
+            name: List of tool names or patterns (e.g. ["FileSystem.*", "MyTools.*"])
+
+        Returns:
+            List of matching tools
+        """
+        if not name:
+            return []
+        return self._match_tools(await self.cached_tools_async(), name)
+
+    @staticmethod
+    def _match_tools(tools: List[Callable], name: list[str]):
         matching_tools = []
-        for tool in self.tools():
+        for tool in tools:
             tool_name = tool.__name__
             for pattern in name:
                 # Handle wildcard pattern
@@ -54,6 +112,54 @@ class FunctionToolManager:
             response.raise_for_status()
             return response.json()
 
+    async def list_tools_async(self) -> Dict[str, Any]:
+        """List all available tools asynchronously."""
+        response = await _get_async_http_client().post(f"{self.base_url}/functions/tools")
+        response.raise_for_status()
+        return response.json()
+
+    def catalog_version(self) -> Tuple[str, int]:
+        """Get the (instance, generation) version of the tools server's catalog."""
+        with httpx.Client(timeout=600.0) as session:
+            response = session.post(f"{self.base_url}/functions/generation")
+            response.raise_for_status()
+            version = response.json()
+            return version["instance"], version["generation"]
+
+    async def catalog_version_async(self) -> Tuple[str, int]:
+        """Get the (instance, generation) version of the tools server's catalog asynchronously."""
+        response = await _get_async_http_client().post(f"{self.base_url}/functions/generation")
+        response.raise_for_status()
+        version = response.json()
+        return version["instance"], version["generation"]
+
+    def cached_tools(self) -> List[Callable[..., Dict[str, Any]]]:
+        """Return the tool functions, downloading the catalog only when its version changed."""
+        version = self.catalog_version()
+        with self._catalog_lock:
+            if version == FunctionToolManager._catalog_version:
+                return list(FunctionToolManager._catalog_tools)
+        return self._store_catalog(self.list_tools())
+
+    async def cached_tools_async(self) -> List[Callable[..., Any]]:
+        """Asynchronous version of cached_tools, returning coroutine tool functions."""
+        version = await self.catalog_version_async()
+        with self._catalog_lock:
+            if version == FunctionToolManager._catalog_version:
+                return list(FunctionToolManager._catalog_async_tools)
+        self._store_catalog(await self.list_tools_async())
+        with self._catalog_lock:
+            return list(FunctionToolManager._catalog_async_tools)
+
+    def _store_catalog(self, tools_response: Dict[str, Any]) -> List[Callable[..., Dict[str, Any]]]:
+        functions = self._build_tools(tools_response)
+        async_functions = self._build_tools(tools_response, use_async=True)
+        with self._catalog_lock:
+            FunctionToolManager._catalog_version = (tools_response.get("instance"), tools_response.get("generation"))
+            FunctionToolManager._catalog_tools = functions
+            FunctionToolManager._catalog_async_tools = async_functions
+        return list(functions)
+
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
         Call a specific tool with the given arguments.
@@ -65,25 +171,46 @@ class FunctionToolManager:
         Returns:
             Tool execution results
         """
-        print("Tool Calling")
-        print(tool_name)
-        print(arguments)
+        logger.debug("Calling tool %s with %s", tool_name, arguments)
         with httpx.Client(timeout=600.0) as session:
             response = session.post(
                 f"{self.base_url}/functions/call_tool",
                 json={"tool_name": tool_name, "arguments": arguments},
             )
             response.raise_for_status()
-            print("return")
-            print(response.json())
             return response.json()
 
+    async def call_tool_async(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asynchronous version of call_tool using the shared pooled client.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Dictionary of arguments to pass to the tool
+
+        Returns:
+            Tool execution results
+        """
+        logger.debug("Calling tool %s with %s", tool_name, arguments)
+        response = await _get_async_http_client().post(
+            f"{self.base_url}/functions/call_tool",
+            json={"tool_name": tool_name, "arguments": arguments},
+        )
+        response.raise_for_status()
+        return response.json()
+
     def tools(self) -> List[Callable[..., Dict[str, Any]]]:
         """Initialize tool-specific methods based on available tools."""
-        tools_response = self.list_tools()
-
+        return self._build_tools(self.list_tools())
 
+    def _build_tools(self, tools_response: Dict[str, Any], use_async: bool = False) -> List[Callable[..., Any]]:
+        """
+        Build a tool function for every tool in a /functions/tools response.
 
+        Args:
+            tools_response: The /functions/tools response
+            use_async: Whether to build coroutine functions that use call_tool_async
+        """
         tools = tools_response.get("available_tools", {}).get("tools", [])
 
         functions: List[Callable[..., Dict[str, Any]]] = []
@@ -144,7 +271,7 @@ class FunctionToolManager:
                             )
                         )
 
-                def tool_function(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+                def collect_arguments(args, kwargs) -> Dict[str, Any]:
                     all_kwargs = kwargs.copy()
                     for i, arg in enumerate(args):
                         if i < len(required):
@@ -154,7 +281,14 @@ class FunctionToolManager:
                         if param not in all_kwargs:
                             all_kwargs[param] = default
 
-                    return self.call_tool(tool_name, all_kwargs)
+                    return all_kwargs
+
+                if use_async:
+                    async def tool_function(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+                        return await self.call_tool_async(tool_name, collect_arguments(args, kwargs))
+                else:
+                    def tool_function(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+                        return self.call_tool(tool_name, collect_arguments(args, kwargs))
 
                 # Create a signature object and apply it to the function
                 sig = inspect.Signature(parameters=parameters, return_annotation=Dict[str, Any])
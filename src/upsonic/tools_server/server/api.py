@@ -25,6 +25,7 @@ async def exception_handler(request: Request, exc: Exception):
 
 # Import the cleanup function from server_utils instead of tools
 from .server_utils import cleanup_all_servers
+from .executor import tool_executor
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -32,6 +33,7 @@ async def shutdown_event():
     Clean up all server instances when the application shuts down.
     """
     await cleanup_all_servers()
+    tool_executor.shutdown()
 
 
 async def timeout_handler(duration: float, coro):
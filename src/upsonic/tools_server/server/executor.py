@@ -0,0 +1,182 @@
+"""
+Executor layer running registered tools off the tools server's event loop.
+
+Async tools run on the loop and are cancelled when they time out. Sync tools
+run in a bounded thread pool, or each in a process of its own when registered
+with ``executor="process"``; a process that runs past its timeout is
+terminated on its own, so CPU-heavy tools can really be stopped without
+touching the other calls.
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+import cloudpickle
+cloudpickle.DEFAULT_PROTOCOL = 2
+
+from ...exception import TimeoutException
+
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+SUPPORTED_EXECUTORS = [EXECUTOR_THREAD, EXECUTOR_PROCESS]
+
+DEFAULT_TOOL_TIMEOUT = 30.0
+DEFAULT_THREAD_WORKERS = int(os.getenv("UPSONIC_TOOL_THREADS", "32"))
+DEFAULT_PROCESS_WORKERS = int(os.getenv("UPSONIC_TOOL_PROCESSES", str(min(4, os.cpu_count() or 1))))
+
+
+def _run_pickled(payload: bytes) -> Any:
+    # Registered tools are often closures or come from the client, so they are
+    # cloudpickled instead of relying on multiprocessing's own pickling.
+    func, arguments = cloudpickle.loads(payload)
+    if inspect.iscoroutinefunction(func):
+        return asyncio.run(func(**arguments))
+    return func(**arguments)
+
+
+def _run_in_child(connection, payload: bytes) -> None:
+    """Entry point of a tool call's process, sending back ("ok", result) or ("error", exception)."""
+    try:
+        outcome = ("ok", _run_pickled(payload))
+    except BaseException as e:
+        outcome = ("error", e)
+    try:
+        data = cloudpickle.dumps(outcome)
+    except Exception as e:
+        data = cloudpickle.dumps(("error", RuntimeError(f"Could not send back the result of the tool: {e}")))
+    connection.send_bytes(data)
+    connection.close()
+
+
+class ToolExecutor:
+    """
+    Runs tool calls with a timeout, keeping blocking work off the event loop.
+
+    Threads can't be stopped from the outside, so a timed out thread call is
+    not cancelled: it is dropped from the queue if it hasn't started yet,
+    otherwise it keeps running, and holding its slot of the thread pool, until
+    the function returns. Process calls each get a process of their own, which
+    is terminated when it times out.
+    """
+
+    def __init__(self, max_threads: int = DEFAULT_THREAD_WORKERS, max_processes: int = DEFAULT_PROCESS_WORKERS):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._thread_pool = None
+        # Each thread of this pool watches one tool process, so it bounds how many run at once
+        self._process_slots = None
+        self._processes: Set[multiprocessing.Process] = set()
+        self._lock = threading.Lock()
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="upsonic-tool"
+                )
+            return self._thread_pool
+
+    def _get_process_slots(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._process_slots is None:
+                self._process_slots = ThreadPoolExecutor(
+                    max_workers=self.max_processes, thread_name_prefix="upsonic-tool-process"
+                )
+            return self._process_slots
+
+    async def run(
+        self,
+        name: str,
+        func: Callable,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+        executor: str = EXECUTOR_THREAD,
+    ) -> Any:
+        """
+        Run a tool call and return its result.
+
+        Args:
+            name: The registered name of the tool
+            func: The tool function
+            arguments: Keyword arguments for the call
+            timeout: Seconds the call may run, or None for no limit
+            executor: "thread" or "process", for sync tools
+
+        Returns:
+            The result of the tool
+
+        Raises:
+            TimeoutException: If the call ran longer than the timeout
+        """
+        if executor == EXECUTOR_PROCESS:
+            payload = cloudpickle.dumps((func, arguments))
+            future = self._get_process_slots().submit(self._call_in_process, name, payload, timeout)
+            return await asyncio.wrap_future(future)
+
+        if inspect.iscoroutinefunction(func):
+            # wait_for cancels the coroutine when the timeout expires
+            awaitable = func(**arguments)
+            future = None
+        else:
+            future = self._get_thread_pool().submit(func, **arguments)
+            awaitable = asyncio.wrap_future(future)
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            if future is not None and not future.cancel():
+                logger.warning("Tool %s is still running in its thread after timing out", name)
+            raise TimeoutException(f"Tool {name} timed out after {timeout} seconds")
+
+    def _call_in_process(self, name: str, payload: bytes, timeout: Optional[float]) -> Any:
+        """Run one call in a new process, terminating that process if it runs past the timeout."""
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_in_child, args=(sender, payload), daemon=True)
+        with self._lock:
+            self._processes.add(process)
+        try:
+            process.start()
+            sender.close()
+            if not receiver.poll(timeout):
+                process.terminate()
+                raise TimeoutException(f"Tool {name} timed out after {timeout} seconds")
+            try:
+                status, value = cloudpickle.loads(receiver.recv_bytes())
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"The process of tool {name} exited with code {process.exitcode}")
+        finally:
+            receiver.close()
+            process.join(timeout=5)
+            with self._lock:
+                self._processes.discard(process)
+        if status == "error":
+            raise value
+        return value
+
+    def shutdown(self) -> None:
+        """Stop both pools, terminating running process calls."""
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_slots, self._process_slots = self._process_slots, None
+            processes = list(self._processes)
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=False, cancel_futures=True)
+        if process_slots is not None:
+            process_slots.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+tool_executor = ToolExecutor()
@@ -1,17 +1,79 @@
+import asyncio
+import contextlib
 import traceback
 from fastapi import HTTPException
 from pydantic import BaseModel
 import inspect
-from typing import Any, Dict, List, Type, Callable
+from typing import Any, Dict, List, Optional, Type, Callable
 from functools import wraps
 
 from .api import app, timeout
+from .executor import tool_executor, DEFAULT_TOOL_TIMEOUT, EXECUTOR_THREAD, SUPPORTED_EXECUTORS
+from .registry import registry_name, sync_registrations, SYNC_INTERVAL
+from ...exception import TimeoutException
+from ...server_manager import workers_from_env
 
 prefix = "/functions"
 
 # Registry to store decorated functions
 registered_functions: Dict[str, Dict[str, Any]] = {}
 
+# Version of the registry. Bumped on every registration so clients can keep a
+# catalog until it changes; the instance id tells a restarted server apart.
+# Workers sharing a registry replay the same registrations, so they agree on both.
+catalog_instance = registry_name
+catalog_generation = 0
+
+
+def bump_catalog_generation() -> int:
+    """Mark the tool catalog as changed and return the new generation."""
+    global catalog_generation
+    catalog_generation += 1
+    return catalog_generation
+
+
+# Semaphores enforcing the max_concurrency of each tool, with the limit they were made for
+_tool_semaphores: Dict[str, Any] = {}
+
+
+def check_max_concurrency(max_concurrency: Optional[int]) -> None:
+    """
+    Make sure a tool's concurrency limit can be enforced by this tools server.
+
+    The limit is a semaphore in the worker process, which can't see the calls
+    running in the other workers.
+
+    Args:
+        max_concurrency: The limit the tool is registered with, None for unlimited
+
+    Raises:
+        ValueError: If the tool is limited and the server runs several workers
+    """
+    workers = workers_from_env("tools")
+    if max_concurrency and workers > 1:
+        raise ValueError(
+            f"max_concurrency can't be enforced across the {workers} workers of the tools server, "
+            "run it with a single worker to limit a tool"
+        )
+
+
+def _get_tool_semaphore(name: str) -> Optional[asyncio.Semaphore]:
+    """Return the semaphore limiting concurrent calls of a tool, or None if it is unlimited."""
+    limit = registered_functions[name].get("max_concurrency")
+    if not limit:
+        return None
+    current = _tool_semaphores.get(name)
+    if current is None or current[0] != limit:
+        # A re-registration may change the limit, calls already running keep the old one
+        current = (limit, asyncio.Semaphore(limit))
+        _tool_semaphores[name] = current
+    return current[1]
+
+
+def get_catalog_version() -> Dict[str, Any]:
+    """Return the identifiers clients use to tell whether their catalog is current."""
+    return {"instance": catalog_instance, "generation": catalog_generation}
+
 
 def _get_json_type(python_type: Type) -> str:
     """Convert Python type to JSON schema type."""
@@ -26,13 +88,27 @@ def _get_json_type(python_type: Type) -> str:
     return type_mapping.get(python_type, "string")
 
 
-def tool(description: str = "", custom_properties: Dict[str, Any] = None, custom_required: List[str] = None):
+def tool(description: str = "", custom_properties: Dict[str, Any] = None, custom_required: List[str] = None, max_concurrency: Optional[int] = None,
+         timeout: Optional[float] = DEFAULT_TOOL_TIMEOUT, executor: str = EXECUTOR_THREAD):
     """
     Decorator to register a function as a tool.
 
     Args:
         description: Optional description of the tool. If not provided, function's docstring will be used.
+        max_concurrency: Maximum number of calls of this tool running at once, across every agent.
+            Use 1 for tools that are not safe to call concurrently. Unlimited if not given.
+            Only supported by a tools server with a single worker.
+        timeout: Seconds a call may run before it fails with a timeout, or None for no limit.
+            Async tools are cancelled and process calls are terminated, but thread-mode
+            timeouts do not cancel: the sync function keeps running, and holding its
+            thread, until it returns.
+        executor: "thread" to run sync tools in the shared thread pool, or "process" to run
+            each call of a CPU-heavy tool in a process of its own, which is terminated
+            when it times out. Starting the process adds a fraction of a second per call.
     """
+    if executor not in SUPPORTED_EXECUTORS:
+        raise ValueError(f"Unsupported executor {executor}, use one of {SUPPORTED_EXECUTORS}")
+    check_max_concurrency(max_concurrency)
 
     def decorator(func: Callable):
         sig = inspect.signature(func)
@@ -83,7 +159,11 @@ def tool(description: str = "", custom_properties: Dict[str, Any] = None, custom
             "description": tool_description,
             "properties": properties,
             "required": required,
+            "max_concurrency": max_concurrency,
+            "timeout": timeout,
+            "executor": executor,
         }
+        bump_catalog_generation()
 
         # Check if the function is async
         is_async = inspect.iscoroutinefunction(func)
@@ -110,6 +190,7 @@ class ToolRequest(BaseModel):
 @app.post(f"{prefix}/tools")
 @timeout(30.0)
 async def list_tools():
+    await sync_registrations()
 
     tools = []
     for name, info in registered_functions.items():
@@ -130,16 +211,26 @@ async def list_tools():
             }
         )
 
-    print(tools)    
-    return {"available_tools": {"tools": tools}}
+    return {"available_tools": {"tools": tools}, **get_catalog_version()}
+
+
+@app.post(f"{prefix}/generation")
+async def catalog_generation_endpoint():
+    """
+    Endpoint to get the version of the tool catalog without downloading it.
+    """
+    await sync_registrations()
+    return get_catalog_version()
 
 
 @app.post(f"{prefix}/call_tool")
-@timeout(30.0)
 async def call_tool(request: ToolRequest):
-
-    print("Calling tool")
-    print(request)
+    # Each tool carries its own timeout, enforced by the executor.
+    # Calls only look for registrations of other workers every SYNC_INTERVAL
+    # seconds, or when they ask for a tool this worker doesn't know yet.
+    await sync_registrations(max_age=SYNC_INTERVAL)
+    if request.tool_name not in registered_functions:
+        await sync_registrations()
 
     if request.tool_name not in registered_functions:
         raise HTTPException(
@@ -147,19 +238,22 @@ async def call_tool(request: ToolRequest):
         )
 
     try:
-        func = registered_functions[request.tool_name]["function"]
-        # Check if the function is async
-        is_async = inspect.iscoroutinefunction(func)
-        
-        if is_async:
-            result = await func(**request.arguments)
-        else:
-            result = func(**request.arguments)
-            
-        print("Tool result")
-        print(result)
+        info = registered_functions[request.tool_name]
+
+        semaphore = _get_tool_semaphore(request.tool_name)
+        async with semaphore or contextlib.nullcontext():
+            # Sync tools run in a pool so a slow one can't freeze the server
+            result = await tool_executor.run(
+                request.tool_name,
+                info["function"],
+                request.arguments,
+                timeout=info.get("timeout", DEFAULT_TOOL_TIMEOUT),
+                executor=info.get("executor", EXECUTOR_THREAD),
+            )
 
         return {"result": result}
+    except TimeoutException as e:
+        raise HTTPException(status_code=408, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         return {"status_code": 500, "detail": f"Failed to call tool: {str(e)}"}
@@ -0,0 +1,179 @@
+"""
+Tool registrations shared by the workers of the tools server.
+
+Each uvicorn worker is its own process with its own registered_functions and
+MCP sessions, so a registration is recorded in the storage backend and every
+worker replays the ones it hasn't seen before answering a request. Functions
+are replayed from their pickle and MCP servers are started again in each
+worker, since their sessions can't be shared between processes.
+
+Workers started together share one registry through the UPSONIC_TOOL_REGISTRY
+environment variable, set by the launcher, which drops it when it stops the
+server. A process started without it gets a registry of its own, which is the
+single worker behaviour, and drops it when it exits.
+
+Entries are stored as binary frames, so pickled functions are kept as the
+raw bytes they arrived as.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import time
+import uuid
+import weakref
+from typing import Any, Dict, Optional
+
+from ...framing import dumps_frames, loads_frames
+from ...storage.configuration import Configuration
+
+
+REGISTRY_ENV = "UPSONIC_TOOL_REGISTRY"
+
+registry_name = os.getenv(REGISTRY_ENV) or uuid.uuid4().hex
+
+# Seconds a tool call may go without checking for registrations of other workers
+SYNC_INTERVAL = 0.5
+
+# Number of registrations replayed by this worker, and the ones it recorded itself
+applied_registrations = 0
+_own_registrations = set()
+_registry_locks = weakref.WeakKeyDictionary()
+# time.monotonic() of the last check for new registrations
+_last_sync = float("-inf")
+
+
+def _registry_key(name: str) -> str:
+    return f"tool_registry_{name}"
+
+
+def drop_registry(name: str) -> None:
+    """Delete the recorded registrations of a registry."""
+    try:
+        Configuration.delete(_registry_key(name))
+    except Exception as e:
+        logging.error(f"Error dropping tool registry {name}: {e}")
+
+
+if not os.getenv(REGISTRY_ENV):
+    # Nobody else knows this registry, so nobody else would ever delete it
+    atexit.register(drop_registry, registry_name)
+
+
+def new_registry() -> str:
+    """
+    Start an empty registry for a newly launched tools server, dropping the previous one.
+
+    Returns:
+        The name to pass to the workers in UPSONIC_TOOL_REGISTRY
+    """
+    drop_current_registry()
+    name = uuid.uuid4().hex
+    Configuration.set("tool_registry_current", name)
+    return name
+
+
+def drop_current_registry(name: Optional[str] = None) -> None:
+    """
+    Drop the registry of the last launched tools server.
+
+    Args:
+        name: Only drop it if it is still this one, so a stopped server doesn't drop the registry of a newer one
+    """
+    current = Configuration.get("tool_registry_current")
+    if not current or (name is not None and current != name):
+        return
+    drop_registry(current)
+    Configuration.delete("tool_registry_current")
+
+
+def _get_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    if loop not in _registry_locks:
+        _registry_locks[loop] = asyncio.Lock()
+    return _registry_locks[loop]
+
+
+async def _apply(entry: Dict[str, Any]) -> None:
+    # Imported here because both modules register their endpoints through this one
+    from .tools import add_tool_, add_mcp_tool_, add_sse_mcp_, _load_function
+
+    kind = entry["kind"]
+    if kind == "function":
+        add_tool_(
+            _load_function(entry["function"]),
+            max_concurrency=entry.get("max_concurrency"),
+            timeout=entry.get("timeout", 30.0),
+            executor=entry.get("executor", "thread"),
+        )
+    elif kind == "mcp":
+        await add_mcp_tool_(entry["name"], entry["command"], entry["args"], entry["env"])
+    elif kind == "sse_mcp":
+        await add_sse_mcp_(entry["name"], entry["url"])
+    else:
+        raise ValueError(f"Unknown tool registration kind: {kind}")
+
+
+async def _replay(until: Optional[int] = None) -> None:
+    """Apply the registrations this worker hasn't seen yet, those before index until if it is given."""
+    global applied_registrations
+    key = _registry_key(registry_name)
+    length = Configuration.length(key) if until is None else until
+    if length < applied_registrations:
+        # The registry was dropped, start over with whatever was recorded since
+        applied_registrations = 0
+        _own_registrations.clear()
+    if length <= applied_registrations:
+        return
+    for item in Configuration.get_range(key, applied_registrations, length - 1):
+        # Registries recorded by earlier versions hold plain JSON entries
+        entry = loads_frames(item) if isinstance(item, bytes) else item
+        index = applied_registrations
+        applied_registrations += 1
+        if index in _own_registrations:
+            continue
+        try:
+            await _apply(entry)
+        except Exception as e:
+            logging.error(f"Error replaying tool registration {index} ({entry['kind']}): {e}")
+
+
+async def sync_registrations(max_age: float = 0.0) -> None:
+    """
+    Replay the registrations other workers recorded since the last call.
+
+    Args:
+        max_age: Skip the check if the last one was less than this many seconds ago
+    """
+    global _last_sync
+    if max_age and time.monotonic() - _last_sync < max_age:
+        return
+    async with _get_lock():
+        checked = time.monotonic()
+        await _replay()
+        _last_sync = checked
+
+
+async def register(entry: Dict[str, Any]) -> None:
+    """
+    Record a registration for every worker and apply it in this one.
+
+    It is recorded first and applied once the registrations before it in the
+    log are, so registrations of the same name apply in the same order in
+    every worker.
+
+    Args:
+        entry: The registration, a dict with a "kind" of "function", "mcp" or "sse_mcp"
+            and the arguments of that kind, whose values may be bytes
+
+    Raises:
+        Exception: Whatever applying the registration raised; the other workers log the same error when they replay it
+    """
+    global applied_registrations
+    async with _get_lock():
+        index = Configuration.append(_registry_key(registry_name), [dumps_frames(entry)]) - 1
+        await _replay(until=index)
+        applied_registrations = index + 1
+        _own_registrations.add(index)
+        await _apply(entry)
@@ -288,19 +288,23 @@ def uninstall_library_(library):
         return False
     
 
-def add_tool_(function, description: str = "", properties: Dict[str, Any] = None, required: List[str] = None):
+def add_tool_(function, description: str = "", properties: Dict[str, Any] = None, required: List[str] = None, max_concurrency: Optional[int] = None,
+              timeout: Optional[float] = 30.0, executor: str = "thread"):
     """
     Add a tool to the registered functions.
     
     Args:
         function: The function to be registered as a tool
+        max_concurrency: Maximum number of calls of the tool running at once, with a single worker only
+        timeout: Seconds a call may run before it is cancelled
+        executor: "thread" or "process", where sync calls of the tool run
     """
     from ..server.function_tools import tool
     # Apply the tool decorator with empty description
 
 
     
-    decorated_function = tool(description=description, custom_properties=properties, custom_required=required)(function)
+    decorated_function = tool(description=description, custom_properties=properties, custom_required=required, max_concurrency=max_concurrency, timeout=timeout, executor=executor)(function)
     return decorated_function
 
     
@@ -312,7 +316,7 @@ def add_tool_(function, description: str = "", properties: Dict[str, Any] = None
 
 import cloudpickle
 cloudpickle.DEFAULT_PROTOCOL = 2
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from pydantic import BaseModel
 from mcp import ClientSession, StdioServerParameters
 
@@ -321,6 +325,8 @@ from contextlib import asynccontextmanager
 # Create server parameters for stdio connection
 
 from .api import app, timeout
+from .registry import register
+from ...framing import loads_frames
 
 
 prefix = "/tools"
@@ -366,6 +372,25 @@ async def uninstall_library(request: InstallLibraryRequest):
 
 class AddToolRequest(BaseModel):
     function: str
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = 30.0
+    executor: str = "thread"
+
+def _check_settings(max_concurrency: Optional[int]):
+    """Reject a tool this server can't honour before it is recorded for the other workers."""
+    from .function_tools import check_max_concurrency
+    try:
+        check_max_concurrency(max_concurrency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _load_function(function: Union[bytes, str]):
+    """Load a function sent as cloudpickle, raw or base64 encoded."""
+    if isinstance(function, str):
+        function = base64.b64decode(function)
+    return cloudpickle.loads(function)
+
 
 @app.post(f"{prefix}/add_tool")
 @timeout(30.0)
@@ -373,13 +398,33 @@ async def add_tool(request: AddToolRequest):
     """
     Endpoint to add a tool.
     """
-    # Cloudpickle the function
-    decoded_function = base64.b64decode(request.function)
-    deserialized_function = cloudpickle.loads(decoded_function)
-
+    _check_settings(request.max_concurrency)
+    # Recorded so the other workers register it too
+    await register({
+        "kind": "function",
+        "function": request.function,
+        "max_concurrency": request.max_concurrency,
+        "timeout": request.timeout,
+        "executor": request.executor,
+    })
+    return {"message": "Tool added successfully"}
 
 
-    add_tool_(deserialized_function)
+@app.post(f"{prefix}/add_tool/frames")
+@timeout(30.0)
+async def add_tool_frames(request: Request):
+    """
+    Endpoint to add a tool sent as a binary frame with the raw pickled function.
+    """
+    payload = loads_frames(await request.body())
+    _check_settings(payload.get("max_concurrency"))
+    await register({
+        "kind": "function",
+        "function": payload["function"],
+        "max_concurrency": payload.get("max_concurrency"),
+        "timeout": payload.get("timeout", 30.0),
+        "executor": payload.get("executor", "thread"),
+    })
     return {"message": "Tool added successfully"}
 
 
@@ -576,7 +621,7 @@ async def add_mcp_tool(request: AddMCPToolRequest):
     """
     Endpoint to add a tool.
     """
-    await add_mcp_tool_(request.name, request.command, request.args, request.env)
+    await register({"kind": "mcp", "name": request.name, "command": request.command, "args": request.args, "env": request.env})
     return {"message": "Tool added successfully"}
 
 
@@ -587,7 +632,7 @@ async def add_sse_mcp(request: AddSSEMCPToolRequest):
     """
     Endpoint to add a tool.
     """
-    await add_sse_mcp_(request.name, request.url)
+    await register({"kind": "sse_mcp", "name": request.name, "url": request.url})
     return {"message": "Tool added successfully"}
 
 async def add_sse_mcp_(name: str, url: str):
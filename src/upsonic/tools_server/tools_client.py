@@ -2,6 +2,8 @@ import base64
 import httpx
 from typing import Dict, List, Any, Callable, Optional
 
+from ..framing import dumps_frames, FRAMES_CONTENT_TYPE
+
 
 class ToolManager:
     """Client for interacting with the Upsonic Functions API."""
@@ -57,15 +59,31 @@ class ToolManager:
 
 
 
-    def add_tool(self, function) -> Dict[str, Any]:
+    def add_tool(self, function, max_concurrency: Optional[int] = None, timeout: Optional[float] = 30.0, executor: str = "thread") -> Dict[str, Any]:
         """
         Add a tool.
+
+        Args:
+            function: The pickled function, raw bytes or base64 encoded
+            max_concurrency: Maximum number of calls of the tool running at once, only
+                supported when the tools server runs a single worker
+            timeout: Seconds a call may run before it is cancelled
+            executor: "thread" or "process", where sync calls of the tool run
         """
+        settings = {"max_concurrency": max_concurrency, "timeout": timeout, "executor": executor}
         with httpx.Client(timeout=600.0) as session:
-            response = session.post(
-                f"{self.base_url}/tools/add_tool",
-                json={"function": function},
-            )
+            if isinstance(function, bytes):
+                # Raw pickles go as a binary frame instead of being base64 encoded
+                response = session.post(
+                    f"{self.base_url}/tools/add_tool/frames",
+                    content=dumps_frames({"function": function, **settings}),
+                    headers={"Content-Type": FRAMES_CONTENT_TYPE},
+                )
+            else:
+                response = session.post(
+                    f"{self.base_url}/tools/add_tool",
+                    json={"function": function, **settings},
+                )
             response.raise_for_status()
             return response.json()
 
@@ -0,0 +1,338 @@
+import asyncio
+import time
+
+import pytest
+
+from upsonic import Task
+from upsonic.client import graph as graph_module
+from upsonic.client.graph import DecisionFunc, DecisionLLM, DecisionResponse, create_graph, node
+from upsonic.client.graph_checkpoint import GraphCheckpoint
+from upsonic.storage.caching import CacheStore
+from upsonic.storage.configuration import ConfigManager
+
+
+@pytest.fixture
+def local_storage(monkeypatch, tmp_path):
+    """Keeps checkpoints and cached outputs in a database of the test's own."""
+    config = ConfigManager(db_name=str(tmp_path / "test_config.sqlite"))
+    cache = CacheStore(config, purge_interval=0)
+    monkeypatch.setattr(graph_module, "GraphCheckpoint", lambda checkpoint_id: GraphCheckpoint(checkpoint_id, config))
+    monkeypatch.setattr(graph_module, "get_from_cache_with_expiry", cache.get)
+    monkeypatch.setattr(graph_module, "save_to_cache_with_expiry", lambda data, key, expiry: cache.set(key, data, expiry))
+    return config
+
+
+class SleepingAgent:
+    """Stands in for an agent, answering every task after a delay."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.contexts = {}
+
+    def do(self, task):
+        self.contexts[task.description] = task.context
+        return f"{task.description} done"
+
+    async def do_async(self, task):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.contexts[task.description] = task.context
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return f"{task.description} done"
+
+
+def test_independent_nodes_run_in_parallel():
+    agent = SleepingAgent()
+    graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False, max_parallel_tasks=2)
+    start, left, middle, right, end = [node(Task(name)) for name in ("start", "left", "middle", "right", "end")]
+    graph.add(start >> left >> end)
+    graph.add(start >> middle >> end)
+    graph.add(start >> right >> end)
+
+    began = time.time()
+    state = graph.run(verbose=False)
+    elapsed = time.time() - began
+
+    # start, two of the three branches, the third one, end
+    assert 0.75 < elapsed < 1.2
+    assert agent.peak == 2
+    assert agent.contexts["end"] == ["left done", "middle done", "right done"]
+    assert list(state.task_outputs.values()) == ["start done", "left done", "middle done", "right done", "end done"]
+    assert graph.get_output() == "end done"
+
+
+def test_decisions_pick_their_branch():
+    agent = SleepingAgent(delay=0.01)
+    graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False)
+    decision = DecisionFunc("Is it done?", lambda output: "done" in str(output))
+    decision.if_true(Task("yes")).if_false(Task("no"))
+    graph.add(Task("check") >> decision >> Task("after"))
+
+    state = asyncio.run(graph.run_async(verbose=False))
+
+    assert set(agent.contexts) == {"check", "yes", "after"}
+    assert agent.contexts["yes"] == ["check done"]
+    assert agent.contexts["after"] == ["yes done"]
+    assert list(state.task_outputs.values()) == ["check done", "yes done", "after done"]
+
+
+def test_adjacency_is_kept_up_to_date_by_add():
+    graph = create_graph(default_agent=SleepingAgent(delay=0), show_progress=False)
+    first, second, third = [node(Task(name)) for name in ("first", "second", "third")]
+    graph.add(first >> third)
+    graph.add(second >> third)
+    decision = DecisionFunc("Always", lambda output: True)
+    decision.if_true(Task("branch"))
+    graph.add(third >> decision)
+
+    added = (dict(graph._successor_ids), dict(graph._predecessor_ids), dict(graph._branch_owners))
+    graph._compile()
+    assert added == (graph._successor_ids, graph._predecessor_ids, graph._branch_owners)
+    assert graph._get_predecessors(third) == [first, second]
+    assert graph._get_start_nodes() == [first, second, decision]
+
+    state = graph.run(verbose=False)
+    assert sorted(state.task_outputs.values()) == ["branch done", "first done", "second done", "third done"]
+
+
+class FailingAgent(SleepingAgent):
+    def __init__(self, fail_on):
+        super().__init__(delay=0)
+        self.fail_on = fail_on
+
+    def do(self, task):
+        if task.description == self.fail_on:
+            raise RuntimeError("timed out")
+        return super().do(task)
+
+    async def do_async(self, task):
+        return self.do(task)
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "parallel"])
+def test_resume_skips_checkpointed_nodes(parallel, local_storage):
+    decisions = []
+
+    def build(agent):
+        graph = create_graph(default_agent=agent, parallel_execution=parallel, show_progress=False, checkpoint_id=f"test-resume-{parallel}")
+        decision = DecisionFunc("Is it done?", lambda output: decisions.append(output) or True)
+        decision.if_true(node(Task("yes")) >> Task("report"))
+        graph.add(Task("first") >> decision)
+        return graph
+
+    failing = FailingAgent(fail_on="report")
+    with pytest.raises(RuntimeError):
+        build(failing).run(verbose=False)
+    assert set(failing.contexts) == {"first", "yes"}
+
+    agent = SleepingAgent(delay=0)
+    graph = build(agent)
+    state = graph.run(verbose=False, resume=True)
+
+    assert set(agent.contexts) == {"report"}
+    assert len(decisions) == 1
+    assert graph.get_output() == "report done"
+    assert list(state.task_outputs.values()) == ["first done", "yes done", "report done"]
+
+
+def test_caching_reruns_only_tasks_whose_inputs_changed(local_storage):
+
+    class Agent(SleepingAgent):
+        def do(self, task):
+            self.contexts[task.description] = task.context
+            return f"{task.description} after {task.context}"
+
+    def run(*descriptions):
+        agent = Agent(delay=0)
+        graph = create_graph(default_agent=agent, show_progress=False, caching=True)
+        first, second, third = [node(Task(description)) for description in descriptions]
+        graph.add(first >> second >> third)
+        graph.run(verbose=False)
+        return list(agent.contexts), graph.get_output()
+
+    ran, output = run("first", "second", "third")
+    assert ran == ["first", "second", "third"]
+
+    ran, cached = run("first", "second", "third")
+    assert ran == []
+    assert cached == output
+
+    ran, output = run("first", "revised", "third")
+    assert ran == ["revised", "third"]
+    assert "revised" in output
+
+
+class DecidingAgent(SleepingAgent):
+    model = "openai/gpt-4o"
+
+    def __init__(self, delay=0.2, decision_delay=None):
+        super().__init__(delay)
+        self.decision_delay = delay if decision_delay is None else decision_delay
+
+    async def do_async(self, task):
+        if task.response_format is DecisionResponse:
+            await asyncio.sleep(self.decision_delay)
+            return DecisionResponse(result=True)
+        return await super().do_async(task)
+
+
+@pytest.mark.parametrize("budget", [None, 0.0], ids=["speculating", "over-budget"])
+def test_speculative_decisions_start_both_branches(budget):
+    agent = DecidingAgent()
+    graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False, speculative_decisions=True, speculation_budget=budget)
+    decision = DecisionLLM("Is the check fine?")
+    decision.if_true(Task("yes")).if_false(Task("no"))
+    graph.add(Task("check") >> decision)
+
+    began = time.time()
+    state = graph.run(verbose=False)
+    elapsed = time.time() - began
+
+    assert list(state.task_outputs.values()) == ["check done", "yes done"]
+    if budget is None:
+        # The decision and both branches run together
+        assert elapsed < 0.55
+        assert set(agent.contexts) == {"check", "yes", "no"}
+    else:
+        assert elapsed > 0.55
+        assert set(agent.contexts) == {"check", "yes"}
+    assert decision.false_branch.task.context is None
+
+
+def test_caching_follows_tasks_given_as_context(local_storage):
+    class Answer(graph_module.ObjectResponse):
+        text: str
+
+    def lookup(query: str) -> str:
+        return query
+
+    class Agent(SleepingAgent):
+        def do(self, task):
+            self.contexts[task.description] = task.context
+            task._response = f"{task.description} after {[each.response for each in task.context or []]}"
+            return task._response
+
+    def run(upstream_description):
+        agent = Agent(delay=0)
+        graph = create_graph(default_agent=agent, show_progress=False, caching=True)
+        upstream = Task(upstream_description, response_format=Answer, tools=[lookup])
+        downstream = Task("downstream", context=[upstream])
+        graph.add(node(upstream))
+        graph.add(node(downstream))
+        graph.run(verbose=False)
+        return list(agent.contexts), graph.get_output()
+
+    assert run("upstream")[0] == ["upstream", "downstream"]
+    assert run("upstream")[0] == []
+
+    ran, output = run("edited upstream")
+    assert ran == ["edited upstream", "downstream"]
+    assert "edited upstream" in output
+
+
+
+class Search:
+    def __init__(self, engine):
+        self.engine = engine
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "parallel"])
+def test_caching_keys_tasks_before_the_agent_changes_them(parallel, local_storage):
+
+    class Agent(SleepingAgent):
+        """Adds to the task the way an agent adds its characterization and knowledge."""
+        job_title = "Researcher"
+
+        def do(self, task):
+            self.contexts[task.description] = task.context
+            task.context = (task.context or []) + [f"You are a {self.job_title}"]
+            task.tools = task.tools + [Search("added")]
+            return f"{task.description} done"
+
+        async def do_async(self, task):
+            return self.do(task)
+
+    def run(agent=None, engine="web"):
+        agent = agent or Agent(delay=0)
+        graph = create_graph(default_agent=agent, parallel_execution=parallel, show_progress=False, caching=True)
+        graph.add(node(Task("first", tools=[Search(engine)])) >> node(Task("second")))
+        graph.run(verbose=False)
+        return list(agent.contexts)
+
+    assert run() == ["first", "second"]
+    assert run() == []
+
+    # Tool instances are keyed by their attributes, agents by their characterization
+    assert run(engine="news") == ["first"]
+    changed = Agent(delay=0)
+    changed.job_title = "Writer"
+    assert run(changed) == ["first", "second"]
+
+def test_speculation_stops_once_discarded_tasks_spend_the_budget(local_storage):
+    agent = DecidingAgent(delay=0.01, decision_delay=0.1)
+    graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False, checkpoint_id="test-speculation",
+                         caching=True, speculative_decisions=True, speculation_budget=0.001)
+    second = DecisionLLM("Is the answer fine?")
+    second.if_true(Task("yes two")).if_false(Task("no two"))
+    first = DecisionLLM("Is the check fine?")
+    first.if_true(node(Task("yes one")) >> second).if_false(Task("no one"))
+    graph.add(Task("check") >> first)
+
+    state = graph.run(verbose=False)
+
+    assert list(state.task_outputs.values()) == ["check done", "yes one done", "yes two done"]
+    # The discarded task finished before the decision, and its estimated cost used up the budget
+    assert set(agent.contexts) == {"check", "yes one", "no one", "yes two"}
+    assert graph._estimate_cost(first.false_branch.task) > 0.001
+
+    # Nothing of the discarded task was kept
+    checkpointed = GraphCheckpoint("test-speculation", local_storage).load()
+    assert sorted(record["output"] for record in checkpointed.values() if record["kind"] == "task") == ["check done", "yes one done", "yes two done"]
+    discarded = Task("no one", context=["check done"])
+    assert graph._cached_output(node(discarded), graph._task_cache_key(discarded, agent)) is None
+
+
+def test_kept_speculation_is_cached_under_the_key_it_started_with(local_storage):
+
+    class Agent(DecidingAgent):
+        async def do_async(self, task):
+            output = await super().do_async(task)
+            if task.response_format is not DecisionResponse:
+                task.context = (task.context or []) + ["You are a Researcher"]
+            return output
+
+    def run():
+        agent = Agent(delay=0.05)
+        graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False, caching=True, speculative_decisions=True)
+        decision = DecisionLLM("Is the check fine?")
+        decision.if_true(Task("yes")).if_false(Task("no"))
+        graph.add(Task("check") >> decision)
+        graph.run(verbose=False)
+        return set(agent.contexts)
+
+    assert run() == {"check", "yes", "no"}
+    # Only the discarded branch runs again
+    assert run() == {"no"}
+
+
+def test_no_speculation_with_a_single_slot(monkeypatch):
+    speculated = []
+
+    async def speculate(self, node, run):
+        speculated.append(node.task.description)
+
+    monkeypatch.setattr(graph_module.Graph, "_speculate", speculate)
+    agent = DecidingAgent(delay=0.05)
+    graph = create_graph(default_agent=agent, parallel_execution=True, show_progress=False, max_parallel_tasks=1, speculative_decisions=True)
+    decision = DecisionLLM("Is the check fine?")
+    decision.if_true(Task("yes")).if_false(Task("no"))
+    graph.add(Task("check") >> decision)
+
+    state = graph.run(verbose=False)
+
+    assert list(state.task_outputs.values()) == ["check done", "yes done"]
+    assert set(agent.contexts) == {"check", "yes"}
+    assert speculated == []
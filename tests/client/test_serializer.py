@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+
+from upsonic.client.level_utilized.utility import response_format_serializer, serialize_by_value
+
+
+def test_response_format_serializer_reuses_blob():
+    class Human(BaseModel):
+        name: str
+
+    assert response_format_serializer(Human) is response_format_serializer(Human)
+
+
+def test_serialize_by_value_detects_redefinition():
+    def greet():
+        return "hi"
+
+    first = serialize_by_value(greet)
+
+    greet.__code__ = (lambda: "hello").__code__
+
+    assert serialize_by_value(greet) != first
+
+
+def test_serialize_by_value_follows_closures_globals_and_validators():
+    from pydantic import field_validator
+
+    def make_greet(greeting):
+        def greet():
+            return greeting
+        return greet
+
+    greet = make_greet("hi")
+    first = serialize_by_value(greet)
+    greet.__closure__[0].cell_contents = "hello"
+    assert serialize_by_value(greet) != first
+
+    def shout():
+        return LOUDNESS
+
+    globals()["LOUDNESS"] = 1
+    first = serialize_by_value(shout)
+    globals()["LOUDNESS"] = 2
+    assert serialize_by_value(shout) != first
+
+    class Human(BaseModel):
+        name: str
+
+        @field_validator("name")
+        @classmethod
+        def strip(cls, value):
+            return value.strip()
+
+    first = serialize_by_value(Human)
+    Human.__pydantic_decorators__.field_validators["strip"].func.__func__.__code__ = (lambda cls, value: value.lower()).__code__
+    assert serialize_by_value(Human) != first
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from upsonic import Task
+from upsonic.client.level_one.call import Call
+from upsonic.exception import NoAPIKeyException
+
+
+class StreamingCall(Call):
+    """Answers each streamed request with the next of a list of event sequences."""
+
+    default_llm_model = "openai/gpt-4o"
+    debug = False
+
+    def __init__(self, *attempts):
+        self.attempts = list(attempts)
+        self.requests = 0
+
+    async def stream_events_async(self, path, data):
+        self.requests += 1
+        for event in self.attempts.pop(0):
+            yield event
+
+
+def collect(client, task):
+    async def run():
+        return [event async for event in client.call_stream_async(task, retry=3)]
+    return asyncio.run(run())
+
+
+def test_only_retryable_errors_are_retried():
+    server_error = {"type": "error", "result": {"status_code": 500, "detail": "overloaded"}}
+    key_error = {"type": "error", "result": {"status_code": 401, "detail": "no key"}}
+
+    client = StreamingCall([server_error], [key_error], [server_error])
+    with pytest.raises(NoAPIKeyException):
+        collect(client, Task("hello"))
+    assert client.requests == 2
@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import upsonic.server.level_two.agent as agent_module
+from upsonic.server import app
+from upsonic.server.level_two.agent import Agent
+
+
+def test_agent_batch_streams_in_completion_order(monkeypatch):
+    async def no_tools(tools):
+        return []
+
+    monkeypatch.setattr(agent_module, "_create_model_from_registry", lambda llm_model: (object(), None))
+    monkeypatch.setattr(agent_module, "fetch_function_tools_async", no_tools)
+
+    built_with = []
+
+    async def fake_agent(agent_id, prompt, model=None, function_tools=None, **kwargs):
+        built_with.append((model, function_tools))
+        await asyncio.sleep(float(prompt))
+        return {"status_code": 200, "result": prompt, "usage": {"input_tokens": 1, "output_tokens": 1}, "tool_usage": []}
+
+    monkeypatch.setattr(Agent, "agent", fake_agent)
+
+    client = TestClient(app)
+    response = client.post("/level_two/agent/batch", json={
+        "agent_id": "batch",
+        "tasks": [
+            {"prompt": "0.3", "response_format": "str"},
+            {"prompt": "0.0", "response_format": "str"},
+            {"prompt": "0.1", "response_format": "str"},
+        ],
+        "max_concurrency": 3,
+    })
+
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [line["index"] for line in lines] == [1, 2, 0]
+    assert [line["result"]["result"] for line in lines] == ["0.0", "0.1", "0.3"]
+    # One model and one tool list shared by every task
+    assert len({id(model) for model, _ in built_with}) == 1
@@ -0,0 +1,126 @@
+import time
+
+from upsonic.storage.configuration import ConfigManager
+from upsonic.storage.caching import CacheStore
+
+
+def make_store(tmp_path, **kwargs):
+    store = CacheStore(ConfigManager(db_name=str(tmp_path / "test_config.sqlite")), purge_interval=0, **kwargs)
+    store.clear()
+    return store
+
+
+def test_set_and_get_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    store.set("answer", {"value": [1, 2, 3]}, 60)
+    assert store.get("answer") == {"value": [1, 2, 3]}
+    assert store.get("unknown") is None
+
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_purge_removes_expired_entries(tmp_path):
+    store = make_store(tmp_path)
+    store.set("stale", "old", -10)
+    store.set("fresh", "new", 60)
+
+    assert store.purge() == 1
+    assert store.get("stale") is None
+    assert store.get("fresh") == "new"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    store = make_store(tmp_path, max_entries=2, touch_interval=0)
+    store.set("first", 1, 60)
+    time.sleep(0.01)
+    store.set("second", 2, 60)
+    time.sleep(0.01)
+    assert store.get("first") == 1
+    time.sleep(0.01)
+
+    # The set that goes over the limit evicts, without waiting for a purge
+    store.set("third", 3, 60)
+    assert store.get("second") is None
+    assert store.get("first") == 1
+    assert store.get("third") == 3
+    assert store.stats()["evictions"] == 1
+    assert store.purge() == 0
+
+
+def test_entries_of_older_versions_are_removed_once(tmp_path):
+    import base64
+    import cloudpickle
+
+    config = ConfigManager(db_name=str(tmp_path / "test_config.sqlite"))
+    legacy = base64.b64encode(cloudpickle.dumps({"data": "old", "expiry_time": 0, "created_at": 0}, protocol=2)).decode("utf-8")
+    config.set("cache_summary", legacy)
+    config.set("cache_settings", {"size": 10})
+
+    CacheStore(config, purge_interval=0)
+    assert config.get("cache_summary") is None
+    assert config.get("cache_settings") == {"size": 10}
+
+    # Later stores don't scan the config table again
+    config.set("cache_summary", legacy)
+    CacheStore(config, purge_interval=0)
+    assert config.get("cache_summary") == legacy
+
+
+def test_concurrent_misses_compute_once(tmp_path):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = make_store(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "summary"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: store.get_or_compute("sync-key", compute, 60), range(8)))
+    assert results == ["summary"] * 8
+    assert len(calls) == 1
+
+    async def compute_async():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "characterization"
+
+    async def run_all():
+        return await asyncio.gather(*[store.get_or_compute_async("async-key", compute_async, 60) for _ in range(8)])
+
+    assert asyncio.run(run_all()) == ["characterization"] * 8
+    assert len(calls) == 2
+    assert store.stats()["deduplicated"] == 14
+
+
+def test_new_leader_uses_a_value_stored_after_its_miss(tmp_path):
+    store = make_store(tmp_path)
+    get = store.get
+
+    def get_while_the_last_leader_finishes(cache_key):
+        data = get(cache_key)
+        if data is None:
+            store.set(cache_key, "stored by the last leader", 60)
+        return data
+
+    store.get = get_while_the_last_leader_finishes
+    assert store.get_or_compute("key", lambda: "computed again", 60) == "stored by the last leader"
+
+
+def test_memory_tier_sees_writes_of_other_processes(tmp_path):
+    db_name = str(tmp_path / "test_config.sqlite")
+    store = CacheStore(ConfigManager(db_name=db_name, cache_check_interval=0), purge_interval=0)
+    other = CacheStore(ConfigManager(db_name=db_name), purge_interval=0)
+    store.set("shared", "old", 60)
+    assert store.get("shared") == "old"
+
+    other.set("shared", "new", 60)
+    assert store.get("shared") == "new"
+    other.delete("shared")
+    assert store.get("shared") is None
@@ -21,6 +21,79 @@ def test_get_with_default():
     assert config.get("non_existent_key", "default_value") == "default_value"
 
 
+def test_bulk_operations():
+    config = ConfigManager(db_name="test_config.sqlite")
+    assert config.set_many({"bulk1": "a", "bulk2": {"nested": [1, 2]}})
+    assert config.get_many(["bulk1", "bulk2", "bulk3"], "missing") == {
+        "bulk1": "a",
+        "bulk2": {"nested": [1, 2]},
+        "bulk3": "missing",
+    }
+    assert config.delete_many(["bulk1", "bulk2"]) == 2
+    assert config.get("bulk1") is None
+
+
+def test_group_commit_is_visible_after_flush():
+    writer = ConfigManager(db_name="test_config.sqlite", commit_interval=60.0)
+    reader = ConfigManager(db_name="test_config.sqlite")
+    writer.set("grouped", "value")
+    writer.flush()
+    assert reader.get("grouped") == "value"
+
+
+def test_cache_sees_writes_from_other_connections():
+    cached = ConfigManager(db_name="test_config.sqlite", cache_check_interval=0)
+    other = ConfigManager(db_name="test_config.sqlite")
+    cached.set("shared", "old")
+    assert cached.get("shared") == "old"
+
+    other.set("shared", "new")
+    assert cached.get("shared") == "new"
+
+    other.delete("shared")
+    assert cached.get("shared", "gone") == "gone"
+
+
+def test_cached_containers_are_copies():
+    config = ConfigManager(db_name="test_config.sqlite")
+    config.set("history", [1, 2])
+    config.get("history").append(3)
+    assert config.get("history") == [1, 2]
+
+
+def test_group_commit_rolls_back_failed_blocks_and_reads_pending_writes(tmp_path):
+    config = ConfigManager(db_name=str(tmp_path / "test_config.sqlite"), commit_interval=60.0)
+    config.set("kept", "value")
+    try:
+        with config._writing() as conn:
+            conn.execute("REPLACE INTO config_store (key, value) VALUES ('half_done', '1')")
+            raise RuntimeError("failed midway")
+    except RuntimeError:
+        pass
+    config.append("pending_list", [1, 2])
+    assert config.length("pending_list") == 2
+    assert config.get_range("pending_list") == [1, 2]
+
+    config.flush()
+    reader = ConfigManager(db_name=str(tmp_path / "test_config.sqlite"))
+    assert reader.get("kept") == "value"
+    assert reader.get("half_done") is None
+
+
+def test_own_writes_keep_the_cache(tmp_path):
+    config = ConfigManager(db_name=str(tmp_path / "test_config.sqlite"), cache_check_interval=0)
+    config.set("read", "value")
+    assert config.get("read") == "value"
+
+    config.set("written", "other")
+    config.get("written")
+    assert "read" in config._cache
+
+    ConfigManager(db_name=str(tmp_path / "test_config.sqlite")).set("elsewhere", 1)
+    config.get("written")
+    assert "read" not in config._cache
+
+
 def teardown_module(module):
     # Clean up the test database file
     if os.path.exists("test_config.sqlite"):
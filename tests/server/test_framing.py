@@ -0,0 +1,19 @@
+import pytest
+
+from upsonic.framing import dumps_frames, loads_frames, FrameDecodeError
+
+
+def test_frames_round_trip_raw_bytes():
+    payload = {
+        "prompt": "Hi",
+        "context": b"\x80\x02raw pickle",
+        "images": None,
+        "nested": {"parts": [b"a", b"", 3]},
+    }
+
+    assert loads_frames(dumps_frames(payload)) == payload
+
+
+def test_loads_frames_rejects_other_bodies():
+    with pytest.raises(FrameDecodeError):
+        loads_frames(b'{"prompt": "Hi"}')
@@ -0,0 +1,127 @@
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+import asyncio
+
+from pydantic_ai.models.test import TestModel
+
+from upsonic.storage.configuration import ConfigManager
+from upsonic.server.level_utilized import memory_window
+from upsonic.server.level_utilized.memory import MemoryStore, estimate_tokens
+
+
+def turn(prompt, answer, system=None, tool=False):
+    request_parts = [SystemPromptPart(system)] if system else []
+    messages = [ModelRequest(parts=[*request_parts, UserPromptPart(prompt)])]
+    if tool:
+        messages.append(ModelResponse(parts=[ToolCallPart("lookup", {"q": prompt}, "call-1")]))
+        messages.append(ModelRequest(parts=[ToolReturnPart("lookup", "found", "call-1")]))
+    messages.append(ModelResponse(parts=[TextPart(answer)]))
+    return messages
+
+
+def make_store(tmp_path):
+    store = MemoryStore(ConfigManager(db_name=str(tmp_path / "test_config.sqlite")))
+    store.clear("agent-test")
+    return store
+
+
+def test_turns_are_appended_in_order(tmp_path):
+    store = make_store(tmp_path)
+    first = turn("hello", "hi", system="be brief")
+    second = turn("weather?", "sunny", tool=True)
+    store.append("agent-test", first)
+    store.append("agent-test", second)
+
+    assert store.get("agent-test") == first + second
+    # Messages are stored as raw pickles
+    assert all(isinstance(row, bytes) for row in store.config.get_range("agent_memory_agent-test"))
+
+
+def test_window_starts_at_a_turn_and_keeps_the_system_prompt(tmp_path):
+    store = make_store(tmp_path)
+    store.append("agent-test", turn("hello", "hi", system="be brief"))
+    store.append("agent-test", turn("weather?", "sunny", tool=True))
+    last_turn = turn("thanks", "welcome")
+    store.append("agent-test", last_turn)
+
+    # The last five messages would start inside the tool call of the second turn
+    window = store.get("agent-test", last_n=5)
+    assert len(window) == 2
+    assert isinstance(window[0].parts[0], SystemPromptPart)
+    assert window[0].parts[1].content == "thanks"
+
+    budget = sum(estimate_tokens(message) for message in last_turn)
+    assert store.get("agent-test", token_budget=budget) == window
+    assert store.get("agent-test", token_budget=budget - 1) == []
+
+
+def test_windowed_memory_folds_old_turns_into_a_summary(monkeypatch, tmp_path):
+    store = make_store(tmp_path)
+    monkeypatch.setattr(memory_window, "Memory", store)
+    monkeypatch.setattr(memory_window, "Configuration", store.config)
+    turns = [turn("hello", "hi", system="be brief")]
+    turns += [turn(f"question {i} " + "x" * 200, f"answer {i} " + "y" * 200) for i in range(6)]
+    for messages in turns:
+        store.append("agent-test", messages)
+
+    budget = 400
+    model = TestModel(custom_result_text="the user asked six questions")
+    history = asyncio.run(memory_window.windowed_memory("agent-test", "openai/gpt-4o", budget, model=model))
+
+    summary = memory_window.get_memory_summary("agent-test")
+    assert summary["summary"] == "the user asked six questions"
+    assert history[-1] == turns[-1][-1]
+    parts = history[0].parts
+    assert parts[0].content == "be brief"
+    assert "the user asked six questions" in parts[1].content
+    assert summary["tokens"] + sum(estimate_tokens(message) for message in history[1:]) < budget
+
+    # Within the budget again, the next turn reuses the summary without folding
+    history_again = asyncio.run(memory_window.windowed_memory("agent-test", "openai/gpt-4o", budget, model=None))
+    assert history_again[1:] == history[1:]
+    assert [part.content for part in history_again[0].parts] == [part.content for part in parts]
+
+
+def test_windowed_memory_keeps_the_summary_when_everything_is_folded(monkeypatch, tmp_path):
+    store = make_store(tmp_path)
+    monkeypatch.setattr(memory_window, "Memory", store)
+    monkeypatch.setattr(memory_window, "Configuration", store.config)
+    store.append("agent-test", turn("look it up " + "x" * 400, "found " + "y" * 400, system="be brief", tool=True))
+    # An earlier fold stopped after the prompt, so no turn starts in what is left
+    store.config.set("memory_summary_agent-test", {"summary": "the user asked", "through_seq": store.first_seq("agent-test"), "tokens": 3})
+
+    model = TestModel(custom_result_text="the user asked for a lookup")
+    history = asyncio.run(memory_window.windowed_memory("agent-test", "openai/gpt-4o", 100, model=model))
+
+    assert len(history) == 1
+    assert [part.content for part in history[0].parts] == ["be brief", "Summary of the earlier conversation:\nthe user asked for a lookup"]
+    assert memory_window.get_memory_summary("agent-test")["summary"] == "the user asked for a lookup"
+
+
+def test_failed_summaries_are_not_saved(monkeypatch, tmp_path):
+    store = make_store(tmp_path)
+    monkeypatch.setattr(memory_window, "Memory", store)
+    monkeypatch.setattr(memory_window, "Configuration", store.config)
+    turns = [turn("hello", "hi", system="be brief")]
+    turns += [turn(f"question {i} " + "x" * 200, f"answer {i} " + "y" * 200) for i in range(6)]
+    for messages in turns:
+        store.append("agent-test", messages)
+
+    def unavailable(**kwargs):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(memory_window, "agent_creator", unavailable)
+    history = asyncio.run(memory_window.windowed_memory("agent-test", "openai/gpt-4o", 400))
+
+    # This turn gets the end of the transcript in place of a summary, the next one tries again
+    assert history[0].parts[1].content.startswith("Summary of the earlier conversation:\n")
+    assert history[-1] == turns[-1][-1]
+    assert memory_window.get_memory_summary("agent-test")["through_seq"] == -1
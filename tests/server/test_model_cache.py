@@ -0,0 +1,21 @@
+import asyncio
+
+import upsonic.server.level_utilized.utility as utility
+
+
+def test_model_cache_reuses_until_credentials_change(monkeypatch):
+    config = {"OPENAI_API_KEY": "sk-first"}
+    monkeypatch.setattr(utility.Configuration, "get", lambda key, default=None: config.get(key, default))
+    utility.invalidate_model_cache()
+
+    async def build():
+        first, _ = utility._create_model_from_registry("openai/gpt-4o")
+        second, _ = utility._create_model_from_registry("openai/gpt-4o")
+        config["OPENAI_API_KEY"] = "sk-second"
+        third, _ = utility._create_model_from_registry("openai/gpt-4o")
+        return first, second, third
+
+    first, second, third = asyncio.run(build())
+
+    assert first is second
+    assert third is not first
@@ -0,0 +1,22 @@
+import base64
+
+import cloudpickle
+from pydantic import BaseModel
+
+from upsonic.server.level_utilized.serialization import load_cached_payload, clear_payload_cache
+
+
+class Human(BaseModel):
+    name: str
+    surname: str
+
+
+def test_load_cached_payload_reuses_loaded_object():
+    clear_payload_cache()
+    encoded = base64.b64encode(cloudpickle.dumps(Human)).decode("utf-8")
+
+    first = load_cached_payload(encoded)
+    second = load_cached_payload(encoded)
+
+    assert first is second
+    assert first(name="Onur", surname="Ulusoy").name == "Onur"
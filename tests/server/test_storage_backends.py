@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from upsonic.storage.backends import RedisBackend
+from upsonic.storage.caching import CacheStore
+from upsonic.storage.configuration import ConfigManager
+from upsonic.server.level_utilized.memory import MemoryStore
+
+
+def sqlite_backend(tmp_path):
+    return ConfigManager(db_name=str(tmp_path / "test_config.sqlite"))
+
+
+def redis_backend(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(namespace="upsonic-test", client=fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=[sqlite_backend, redis_backend], ids=["sqlite", "redis"])
+def backend(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def test_values_expire(backend):
+    backend.set("backend_test_kept", {"a": 1})
+    backend.set("backend_test_expiring", "soon", ttl=0.05)
+    assert backend.get_many(["backend_test_kept", "backend_test_expiring"]) == {
+        "backend_test_kept": {"a": 1},
+        "backend_test_expiring": "soon",
+    }
+
+    time.sleep(0.1)
+    assert backend.get("backend_test_expiring") is None
+    assert backend.get("backend_test_kept") == {"a": 1}
+
+
+def test_lists_append_atomically_and_read_ranges(backend):
+    assert backend.append("backend_test_list", [1, 2]) == 2
+    assert backend.append_many({"backend_test_list": [3], "backend_test_other": ["x"]}) == {
+        "backend_test_list": 3,
+        "backend_test_other": 1,
+    }
+    assert backend.get_range("backend_test_list") == [1, 2, 3]
+    assert backend.get_range("backend_test_list", 1, 1) == [2]
+    assert backend.get_range("backend_test_list", -2, -1) == [2, 3]
+
+    assert backend.delete_prefix("backend_test_") == 2
+    assert backend.length("backend_test_list") == 0
+
+
+def test_lists_keep_bytes_as_they_are(backend):
+    backend.append("backend_test_raw", [b"\x00\x80pickle", "text", b""])
+    assert backend.get_range("backend_test_raw") == [b"\x00\x80pickle", "text", b""]
+    backend.delete("backend_test_raw")
+
+
+def test_cache_and_memory_share_the_backend(backend):
+    cache = CacheStore(backend, memory_entries=0)
+    cache.set("backend_test_key", {"value": [1, 2]}, 60)
+    assert CacheStore(backend).get("backend_test_key") == {"value": [1, 2]}
+    cache.delete("backend_test_key")
+
+    if not isinstance(backend, ConfigManager):
+        # Another process's writes are seen, the in-process tier is off on shared backends
+        first, second = CacheStore(backend), CacheStore(backend)
+        first.set("backend_test_key", "old", 60)
+        assert second.get("backend_test_key") == "old"
+        first.set("backend_test_key", "new", 60)
+        assert second.get("backend_test_key") == "new"
+        first.delete("backend_test_key")
+        assert second.get("backend_test_key") is None
+
+    first, second = MemoryStore(backend), MemoryStore(backend)
+    first.clear("backend-test")
+    first.append("backend-test", [ModelRequest(parts=[UserPromptPart("hello")])])
+    second.append("backend-test", [ModelResponse(parts=[TextPart("hi")])])
+    assert [message.parts[0].content for message in first.get("backend-test")] == ["hello", "hi"]
+    first.clear("backend-test")
+
+
+def test_memory_tier_is_off_on_shared_backends(tmp_path):
+    assert CacheStore(sqlite_backend(tmp_path), purge_interval=0).memory_entries == 256
+    assert CacheStore(RedisBackend(client=object())).memory_entries == 0
+    assert CacheStore(RedisBackend(client=object()), memory_entries=16).memory_entries == 16
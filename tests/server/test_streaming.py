@@ -0,0 +1,52 @@
+import json
+
+from fastapi.testclient import TestClient
+from pydantic_ai import Agent as PydanticAgent
+from pydantic_ai.models.test import TestModel
+
+import upsonic.server.level_two.agent as agent_module
+from upsonic.server import app
+
+
+def test_agent_stream_sends_events_as_server_sent_events(monkeypatch):
+    async def no_tools(tools):
+        return []
+
+    def test_agent(**kwargs):
+        agent = PydanticAgent(TestModel())
+
+        @agent.tool_plain
+        def get_weather(city: str) -> str:
+            return "sunny"
+
+        return agent
+
+    monkeypatch.setattr(agent_module, "fetch_function_tools_async", no_tools)
+    monkeypatch.setattr(agent_module, "agent_creator", test_agent)
+
+    client = TestClient(app)
+    response = client.post("/level_two/agent/stream", json={
+        "agent_id": "stream",
+        "prompt": "What is the weather?",
+        "response_format": "str",
+    })
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in response.text.split("\n\n"):
+        if block.strip():
+            name, data = block.split("\n")
+            event = json.loads(data[len("data: "):])
+            assert name == f"event: {event['type']}"
+            events.append(event)
+
+    types = [event["type"] for event in events]
+    assert types[:2] == ["tool_call", "tool_result"]
+    assert events[0]["tool_name"] == "get_weather"
+    assert events[1]["content"] == "sunny"
+    assert "text_delta" in types and types[-1] == "result"
+
+    result = events[-1]["result"]
+    assert result["status_code"] == 200
+    assert "".join(event["delta"] for event in events if event["type"] == "text_delta") == result["result"]
+    assert result["tool_usage"][0]["tool_result"] == "sunny"
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+from pydantic_ai import Agent as PydanticAgent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+import upsonic.server.level_utilized.utility as utility
+
+
+def test_chunks_are_summarized_concurrently_and_cached_one_by_one(monkeypatch):
+    calls = []
+    running = [0, 0]
+
+    async def summarize(messages, info):
+        prompt = messages[-1].parts[-1].content
+        calls.append(prompt)
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+        return ModelResponse(parts=[TextPart("s" * 100)])
+
+    monkeypatch.setattr(utility, "agent_creator", lambda **kwargs: PydanticAgent(FunctionModel(summarize)))
+
+    chunks = [uuid.uuid4().hex * 100 for _ in range(6)]
+    summary = asyncio.run(utility.summarize_text_async("".join(chunks), "test", chunk_size=3200, max_size=3000, max_concurrency=4))
+
+    assert running[1] == 4
+    assert len(calls) == 6
+    assert summary == "\n\n".join(["s" * 100] * 6)
+
+    # Only the changed chunk is summarized again
+    chunks[-1] = uuid.uuid4().hex * 100
+    asyncio.run(utility.summarize_text_async("".join(chunks), "test", chunk_size=3200, max_size=3000, max_concurrency=4))
+    assert len(calls) == 7
+
+
+def test_long_chunk_summaries_are_merged_level_by_level(monkeypatch):
+    async def summarize(messages, info):
+        prompt = messages[-1].parts[-1].content
+        return ModelResponse(parts=[TextPart(("merged" if "merge" in prompt else "chunk") + "x" * 2994)])
+
+    monkeypatch.setattr(utility, "agent_creator", lambda **kwargs: PydanticAgent(FunctionModel(summarize)))
+
+    text = "".join(uuid.uuid4().hex * 200 for _ in range(4))
+    summary = asyncio.run(utility.summarize_text_async(text, "test", chunk_size=6400, max_size=5000))
+
+    # Four 2000 character chunk summaries don't fit, so they are merged into two
+    assert summary.startswith("merged") and summary.count("merged") == 2
+    assert len(summary) <= 5000
+
+
+def test_failed_chunks_are_not_cached_as_summaries(monkeypatch):
+    failing = [True]
+    calls = []
+
+    async def summarize(messages, info):
+        prompt = messages[-1].parts[-1].content
+        calls.append(prompt)
+        if failing[0] and "broken" in prompt:
+            raise RuntimeError("model unavailable")
+        return ModelResponse(parts=[TextPart("s" * 100)])
+
+    monkeypatch.setattr(utility, "agent_creator", lambda **kwargs: PydanticAgent(FunctionModel(summarize)))
+
+    chunks = [uuid.uuid4().hex * 100 for _ in range(2)] + [("broken" + uuid.uuid4().hex[:26]) * 100]
+    text = "".join(chunks)
+    summary = asyncio.run(utility.summarize_text_async(text, "test", chunk_size=3200, max_size=3000))
+    assert summary.endswith("...")
+    assert len(calls) == 3
+
+    # The failed chunk and the whole text are summarized again, the others come from the cache
+    failing[0] = False
+    summary = asyncio.run(utility.summarize_text_async(text, "test", chunk_size=3200, max_size=3000))
+    assert summary == "\n\n".join(["s" * 100] * 3)
+    assert len(calls) == 4
@@ -99,3 +99,265 @@ async def test_error_handling(async_client):
             assert "failed to call tool" in error_msg.lower() or "can only concatenate" in error_msg.lower()
     except asyncio.TimeoutError:
         pytest.fail("Test timed out")
+
+@pytest.mark.asyncio
+async def test_catalog_generation_changes_on_registration(async_client):
+    from upsonic.tools_server.server.function_tools import tool, registered_functions
+
+    before = (await async_client.post("/functions/generation")).json()
+
+    @tool()
+    def multiply_numbers(a: int, b: int) -> int:
+        "Multiply two numbers"
+        return a * b
+
+    try:
+        after = (await async_client.post("/functions/generation")).json()
+        assert after["instance"] == before["instance"]
+        assert after["generation"] > before["generation"]
+
+        listed = (await async_client.post("/functions/tools")).json()
+        assert listed["generation"] == after["generation"]
+    finally:
+        registered_functions.pop("multiply_numbers", None)
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_parallel_calls(async_client):
+    import time
+    from upsonic.tools_server.server.function_tools import tool, registered_functions
+
+    running = 0
+    peak = 0
+
+    @tool(max_concurrency=1)
+    def exclusive_sleep(seconds: float) -> str:
+        "Sleep while no other call of this tool runs"
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(seconds)
+        running -= 1
+        return "done"
+
+    try:
+        async with asyncio.timeout(5):
+            responses = await asyncio.gather(*[
+                async_client.post(
+                    "/functions/call_tool",
+                    json={"tool_name": "exclusive_sleep", "arguments": {"seconds": 0.05}},
+                )
+                for _ in range(4)
+            ])
+        assert [response.json() for response in responses] == [{"result": "done"}] * 4
+        assert peak == 1
+    finally:
+        registered_functions.pop("exclusive_sleep", None)
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_rejected_with_several_workers(async_client, monkeypatch):
+    import base64
+    import cloudpickle
+    from upsonic.storage.configuration import Configuration
+    from upsonic.tools_server.server import registry
+    from upsonic.tools_server.server.function_tools import tool
+
+    monkeypatch.setenv("UPSONIC_TOOLS_WORKERS", "2")
+
+    with pytest.raises(ValueError):
+        @tool(max_concurrency=1)
+        def limited() -> str:
+            "Run alone"
+            return "done"
+
+    def limited_remote() -> str:
+        "Run alone"
+        return "done"
+
+    key = f"tool_registry_{registry.registry_name}"
+    before = Configuration.length(key)
+    response = await async_client.post("/tools/add_tool", json={
+        "function": base64.b64encode(cloudpickle.dumps(limited_remote)).decode("utf-8"),
+        "max_concurrency": 1,
+    })
+    assert response.status_code == 400
+    # Nothing was recorded for the other workers to replay
+    assert Configuration.length(key) == before
+
+@pytest.mark.asyncio
+async def test_tool_timeout_cancels_call(async_client):
+    from upsonic.tools_server.server.function_tools import tool, registered_functions
+
+    cancelled = asyncio.Event()
+
+    @tool(timeout=0.1)
+    async def never_finishes() -> str:
+        "Wait until cancelled"
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    try:
+        async with asyncio.timeout(5):
+            response = await async_client.post(
+                "/functions/call_tool", json={"tool_name": "never_finishes", "arguments": {}}
+            )
+        assert response.status_code == 408
+        assert cancelled.is_set()
+
+        # The server keeps answering other requests
+        listed = await async_client.post("/functions/tools")
+        assert listed.status_code == 200
+    finally:
+        registered_functions.pop("never_finishes", None)
+
+
+@pytest.mark.asyncio
+async def test_process_timeout_terminates_only_the_stuck_call():
+    import time
+    from upsonic.exception import TimeoutException
+    from upsonic.tools_server.server.executor import ToolExecutor
+
+    def sleep_for(seconds: float) -> float:
+        import time
+        time.sleep(seconds)
+        return seconds
+
+    executor = ToolExecutor(max_processes=2)
+    try:
+        stuck = executor.run("sleep_for", sleep_for, {"seconds": 60}, timeout=1.0, executor="process")
+        finishing = executor.run("sleep_for", sleep_for, {"seconds": 2}, timeout=None, executor="process")
+        began = time.time()
+        results = await asyncio.gather(stuck, finishing, return_exceptions=True)
+
+        assert isinstance(results[0], TimeoutException)
+        assert results[1] == 2
+        assert time.time() - began < 30
+        assert not executor._processes
+    finally:
+        executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_registrations_of_other_workers_are_replayed(async_client):
+    import base64
+    import cloudpickle
+    from upsonic.storage.configuration import Configuration
+    from upsonic.tools_server.server import registry
+    from upsonic.tools_server.server.function_tools import registered_functions
+
+    def replayed_tool(x: int) -> int:
+        "Double a number"
+        return x * 2
+
+    # Another worker sharing the registry recorded this registration
+    Configuration.append(f"tool_registry_{registry.registry_name}", [{
+        "kind": "function",
+        "function": base64.b64encode(cloudpickle.dumps(replayed_tool)).decode("utf-8"),
+        "max_concurrency": None,
+        "timeout": 30.0,
+        "executor": "thread",
+    }])
+
+    try:
+        response = await async_client.post("/functions/call_tool", json={"tool_name": "replayed_tool", "arguments": {"x": 21}})
+        assert response.json() == {"result": 42}
+    finally:
+        registered_functions.pop("replayed_tool", None)
+        Configuration.delete(f"tool_registry_{registry.registry_name}")
+
+
+@pytest.mark.asyncio
+async def test_registrations_apply_in_log_order(async_client, monkeypatch):
+    import base64
+    import cloudpickle
+    from upsonic.storage.configuration import Configuration
+    from upsonic.tools_server.server import registry
+    from upsonic.tools_server.server.function_tools import registered_functions
+
+    def entry(answer):
+        def same_name_tool() -> int:
+            "Answer a number"
+            return answer
+        return {
+            "kind": "function",
+            "function": base64.b64encode(cloudpickle.dumps(same_name_tool)).decode("utf-8"),
+            "max_concurrency": None,
+            "timeout": 30.0,
+            "executor": "thread",
+        }
+
+    append = Configuration.append
+
+    def append_after_another_worker(key, values):
+        # Another worker records its registration of the same name just before this one
+        monkeypatch.setattr(Configuration, "append", append)
+        append(key, [entry("theirs")])
+        return append(key, values)
+
+    monkeypatch.setattr(Configuration, "append", append_after_another_worker)
+    try:
+        await registry.register(entry("ours"))
+        await registry.sync_registrations()
+        response = await async_client.post("/functions/call_tool", json={"tool_name": "same_name_tool", "arguments": {}})
+        assert response.json() == {"result": "ours"}
+    finally:
+        registered_functions.pop("same_name_tool", None)
+        Configuration.delete(f"tool_registry_{registry.registry_name}")
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_check_the_registry_at_most_every_interval(async_client, monkeypatch):
+    import time
+    from upsonic.storage.configuration import Configuration
+    from upsonic.tools_server.server import registry
+
+    checks = []
+    length = Configuration.length
+
+    def counted_length(key):
+        checks.append(key)
+        return length(key)
+
+    monkeypatch.setattr(Configuration, "length", counted_length)
+    monkeypatch.setattr(registry, "_last_sync", time.monotonic())
+    for _ in range(5):
+        response = await async_client.post("/functions/call_tool", json={"tool_name": "add_numbers", "arguments": {"a": 1, "b": 2}})
+        assert response.json() == {"result": 3}
+    assert checks == []
+
+    # A tool this worker doesn't know yet is looked up at once
+    response = await async_client.post("/functions/call_tool", json={"tool_name": "missing_tool", "arguments": {}})
+    assert response.status_code == 404
+    assert len(checks) == 1
+
+
+@pytest.mark.asyncio
+async def test_framed_registrations_are_recorded_as_raw_pickles(async_client):
+    import cloudpickle
+    from upsonic.framing import FRAMES_CONTENT_TYPE, dumps_frames, loads_frames
+    from upsonic.storage.configuration import Configuration
+    from upsonic.tools_server.server import registry
+    from upsonic.tools_server.server.function_tools import registered_functions
+
+    def framed_tool(x: int) -> int:
+        "Triple a number"
+        return x * 3
+
+    pickled = cloudpickle.dumps(framed_tool)
+    key = f"tool_registry_{registry.registry_name}"
+    try:
+        response = await async_client.post(
+            "/tools/add_tool/frames",
+            content=dumps_frames({"function": pickled, "timeout": 30.0, "executor": "thread"}),
+            headers={"Content-Type": FRAMES_CONTENT_TYPE},
+        )
+        assert response.status_code == 200
+        assert loads_frames(Configuration.get_range(key, -1, -1)[0])["function"] == pickled
+
+        response = await async_client.post("/functions/call_tool", json={"tool_name": "framed_tool", "arguments": {"x": 2}})
+        assert response.json() == {"result": 6}
+    finally:
+        registered_functions.pop("framed_tool", None)
+        Configuration.delete(key)